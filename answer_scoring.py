@@ -0,0 +1,343 @@
+"""Vectorized scoring of stored technical answers against question rubrics.
+
+Usage:
+    python answer_scoring.py --position "software developer" --top 10
+"""
+import argparse
+import math
+import threading
+from itertools import repeat
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from candidate_store import follow
+from question_bank import QuestionBank, get_question_bank, normalize_key
+
+# Tokens are runs of ASCII letters, digits, "+" and "#" (so "c++" and "c#"
+# survive); everything else separates them. A bytes translate and split keeps
+# tokenizing a batch of answers entirely in C.
+_TOKEN_BYTES = b"abcdefghijklmnopqrstuvwxyz0123456789+#"
+_SEPARATE = bytes(byte if byte in _TOKEN_BYTES else 32 for byte in range(256))
+# Joins the answers of a batch. NUL survives the translate as a token of its
+# own and is stripped from the answers first, so no answer text can forge it.
+_ANSWER_BREAK = "\x00"
+_ANSWER_SEPARATOR = f" {_ANSWER_BREAK} "
+_KEEP_BREAK = b"\x00" + _SEPARATE[1:]
+STOPWORDS = frozenset("""
+    a an and are as at be by can do does for from how i in is it of on or the this to what
+    when which why with you your would describe explain difference between example using
+    coding task optional write implement main
+""".split())
+
+
+def _tokenize_bytes(text: str) -> List[bytes]:
+    return text.lower().encode("utf-8").translate(_SEPARATE).split()
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.decode("ascii") for token in _tokenize_bytes(text)]
+
+
+def rubric_terms(keywords: List[str]) -> List[str]:
+    """Distinct non-stopword tokens of a rubric's keywords, in order"""
+    terms = []
+    for keyword in keywords:
+        for token in tokenize(keyword):
+            if token not in STOPWORDS and token not in terms:
+                terms.append(token)
+    return terms
+
+
+class AnswerBatch:
+    """Answers of a batch of records encoded as sparse (answer, term) pairs"""
+
+    __slots__ = ('record_count', 'owners', 'question_ids', 'skipped', 'rows', 'cols')
+
+    def __init__(self, record_count, owners, question_ids, skipped, rows, cols):
+        self.record_count = record_count
+        self.owners = owners              # record index per answer
+        self.question_ids = question_ids  # rubric row per answer
+        self.skipped = skipped            # bool per answer
+        self.rows = rows                  # answer index per token hit
+        self.cols = cols                  # term id per token hit
+
+
+class AnswerScorer:
+    """Scores answers by keyword coverage and TF-IDF similarity to rubrics.
+
+    Every question is a row of a dense rubric weight matrix over a vocabulary
+    of rubric terms; bank questions use their ``rubrics``, other questions
+    (generic or LLM-generated) fall back to the terms of the question itself.
+    Term IDF is fixed by the bank rubrics, so scores never change as records
+    are added, and a batch is scored with a handful of NumPy operations
+    regardless of its size. ``add_records`` keeps per-position candidate
+    scores for ``shortlist``; ``attach`` does so on every save.
+    """
+
+    def __init__(self, bank: Optional[QuestionBank] = None, coverage_weight: float = 0.7):
+        self.bank = bank or get_question_bank()
+        self.coverage_weight = coverage_weight
+        self._lock = threading.Lock()
+        self.term_ids: Dict[str, int] = {}
+        self.question_ids: Dict[str, int] = {}
+        self._question_terms: List[List[int]] = []
+        self._idf: List[float] = []
+        self._weights = np.zeros((0, 0))
+        self._rubric_totals = np.zeros(0)
+        self._rubric_norms = np.zeros(0)
+        self._weight_rows = 0
+        self._default_idf = 1.0
+        self._build_idf()
+
+        self._scores: List[float] = []
+        self._candidates: List[Dict[str, Any]] = []
+        self._by_position: Dict[str, List[int]] = {}
+
+    # -- rubric matrix -----------------------------------------------------
+
+    def _build_idf(self):
+        """Document frequency of terms across the bank's question rubrics"""
+        rubrics = list(self.bank.rubrics().values())
+        document_frequency: Dict[str, int] = {}
+        for keywords in rubrics:
+            for term in rubric_terms(keywords):
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        count = len(rubrics)
+        self._default_idf = math.log((1 + count) / 1) + 1
+        self._bank_idf = {term: math.log((1 + count) / (1 + df)) + 1
+                          for term, df in document_frequency.items()}
+
+    def _term_id(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.term_ids)
+            self.term_ids[term] = term_id
+            self._idf.append(self._bank_idf.get(term, self._default_idf))
+        return term_id
+
+    def question_id(self, question: str) -> int:
+        """Rubric row for a question, registering it on first sight"""
+        question_id = self.question_ids.get(question)
+        if question_id is None:
+            keywords = self.bank.rubric_for(question) or [question]
+            terms = [self._term_id(term) for term in rubric_terms(keywords)]
+            question_id = len(self._question_terms)
+            self._question_terms.append(terms)
+            self.question_ids[question] = question_id
+        return question_id
+
+    def _weight_matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Dense (questions x terms) IDF-weighted rubric matrix, its IDF vector
+        and each row's total weight and norm.
+
+        The matrix lives in a buffer that doubles when it runs out of rows or
+        columns, and only questions registered since the last call get their
+        row (and row total and norm) filled in. Existing rows never change: a
+        term's IDF is fixed and new terms only appear in new questions.
+        """
+        rows, cols = len(self._question_terms), len(self.term_ids)
+        idf = np.asarray(self._idf, dtype=np.float64)
+        capacity_rows, capacity_cols = self._weights.shape
+        if rows > capacity_rows or cols > capacity_cols:
+            grown = np.zeros((capacity_rows if rows <= capacity_rows else max(rows, 2 * capacity_rows),
+                              capacity_cols if cols <= capacity_cols else max(cols, 2 * capacity_cols)))
+            grown[:self._weight_rows, :capacity_cols] = self._weights[:self._weight_rows]
+            self._weights = grown
+            self._rubric_totals = np.resize(self._rubric_totals, grown.shape[0])
+            self._rubric_norms = np.resize(self._rubric_norms, grown.shape[0])
+        for question_id in range(self._weight_rows, rows):
+            terms = self._question_terms[question_id]
+            self._weights[question_id, terms] = idf[terms]
+        if rows > self._weight_rows:
+            added = self._weights[self._weight_rows:rows]
+            self._rubric_totals[self._weight_rows:rows] = added.sum(axis=1)
+            self._rubric_norms[self._weight_rows:rows] = np.sqrt((added * added).sum(axis=1))
+        self._weight_rows = rows
+        return self._weights[:rows, :cols], idf, self._rubric_totals[:rows], self._rubric_norms[:rows]
+
+    # -- scoring -----------------------------------------------------------
+
+    def encode(self, records: List[Dict[str, Any]]) -> AnswerBatch:
+        """Tokenize every answer of a batch into (answer, term) pairs.
+
+        The answers are joined around a NUL separator token and tokenized in
+        one pass; tokens are mapped to term ids with C-level ``map`` so no
+        Python code runs per token.
+        """
+        counts, questions, texts = [], [], []
+        for record in records:
+            count = 0
+            for answers in (record.get('technical_answers') or {}).values():
+                count += len(answers)
+                for qa in answers.values():
+                    questions.append(qa.get('question') or "")
+                    texts.append("" if qa.get('skipped') else qa.get('answer') or "")
+            counts.append(count)
+
+        with self._lock:
+            known = self.question_ids.get
+            question_ids = [known(question) for question in questions]
+            if None in question_ids:
+                question_ids = [self.question_id(question) for question in questions]
+            lookup = {term.encode("ascii"): term_id for term, term_id in self.term_ids.items()}
+        lookup[_ANSWER_BREAK.encode("ascii")] = -2
+
+        joined = _ANSWER_SEPARATOR.join(texts)
+        if joined.count(_ANSWER_BREAK) != max(0, len(texts) - 1):
+            # An answer carries a NUL of its own; drop it so it cannot pass for a boundary
+            joined = _ANSWER_SEPARATOR.join(text.replace(_ANSWER_BREAK, " ") for text in texts)
+        tokens = joined.lower().encode("utf-8").translate(_KEEP_BREAK).split()
+        ids = np.fromiter(map(lookup.get, tokens, repeat(-1)), dtype=np.int64, count=len(tokens))
+        rows = np.cumsum(ids == -2)
+        hits = ids >= 0
+        return AnswerBatch(
+            len(records),
+            np.repeat(np.arange(len(records), dtype=np.int64), counts),
+            np.asarray(question_ids, dtype=np.int64),
+            np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) == 0,
+            rows[hits], ids[hits])
+
+    def score_batch(self, batch: AnswerBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """(per-answer scores, per-record mean scores), all in [0, 1]"""
+        answer_count = len(batch.owners)
+        with self._lock:
+            weights, idf, totals, norms = self._weight_matrix()
+        if answer_count == 0:
+            return np.zeros(0), np.zeros(batch.record_count)
+
+        term_count = max(1, weights.shape[1])
+        # Collapse repeated tokens into term frequencies per answer
+        pair_keys, tf = np.unique(batch.rows * term_count + batch.cols, return_counts=True)
+        rows, cols = pair_keys // term_count, pair_keys % term_count
+
+        question_ids = batch.question_ids
+        rubric_weight = weights[question_ids[rows], cols]
+        rubric_total = totals[question_ids]
+        rubric_norm = norms[question_ids]
+
+        # Share of the rubric's IDF weight the answer mentions
+        covered = np.bincount(rows, weights=rubric_weight, minlength=answer_count)
+        coverage = np.divide(covered, rubric_total, out=np.zeros(answer_count), where=rubric_total > 0)
+
+        # Cosine between the answer's TF-IDF vector and the rubric vector
+        tfidf = (1.0 + np.log(tf)) * idf[cols]
+        dot = np.bincount(rows, weights=tfidf * rubric_weight, minlength=answer_count)
+        answer_norm = np.sqrt(np.bincount(rows, weights=tfidf * tfidf, minlength=answer_count))
+        denominator = answer_norm * rubric_norm
+        similarity = np.divide(dot, denominator, out=np.zeros(answer_count), where=denominator > 0)
+
+        answer_scores = self.coverage_weight * coverage + (1 - self.coverage_weight) * similarity
+        answer_scores[batch.skipped] = 0.0
+
+        totals = np.bincount(batch.owners, weights=answer_scores, minlength=batch.record_count)
+        counts = np.bincount(batch.owners, minlength=batch.record_count)
+        record_scores = np.divide(totals, counts, out=np.zeros(batch.record_count), where=counts > 0)
+        return answer_scores, record_scores
+
+    def score_records(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Mean answer score per record"""
+        return self.score_batch(self.encode(records))[1]
+
+    def score_answers(self, record: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """Per-question scores for one record, keyed like ``technical_answers``"""
+        answer_scores = iter(self.score_batch(self.encode([record]))[0])
+        return {tech: {question_key: round(float(next(answer_scores)), 4) for question_key in answers}
+                for tech, answers in (record.get('technical_answers') or {}).items()}
+
+    # -- shortlists --------------------------------------------------------
+
+    def add_records(self, records: List[Dict[str, Any]]):
+        """Score newly saved records and add them to the per-position rankings"""
+        scores = self.score_records(records)
+        with self._lock:
+            for record, score in zip(records, scores):
+                index = len(self._scores)
+                self._scores.append(float(score))
+                self._candidates.append({
+                    'full_name': record.get('full_name'),
+                    'email': record.get('email'),
+                    'desired_position': record.get('desired_position'),
+                    'years_experience': record.get('years_experience'),
+                    'tech_stack': record.get('tech_stack'),
+                    'timestamp': record.get('timestamp'),
+                })
+                position = normalize_key(record.get('desired_position') or "")
+                self._by_position.setdefault(position, []).append(index)
+
+    def attach(self, store):
+        """Keep scores current as records are saved to ``store``"""
+        store.add_listener(self.add_records)
+
+    def follow(self, store, batch_size: int = 10000) -> int:
+        """Score every record in ``store`` and then each one saved, missing none in between"""
+        return follow(store, self.add_records, self.add_records, batch_size)
+
+    def load_store(self, store, batch_size: int = 10000):
+        """Score every record already in ``store``"""
+        batch = []
+        for record in store.iter_records():
+            batch.append(record)
+            if len(batch) >= batch_size:
+                self.add_records(batch)
+                batch = []
+        if batch:
+            self.add_records(batch)
+
+    def positions(self) -> Dict[str, int]:
+        with self._lock:
+            return {position: len(indices) for position, indices in self._by_position.items()}
+
+    def shortlist(self, position: str, top: int = 10) -> List[Dict[str, Any]]:
+        """Highest-scoring candidates for a position, best first"""
+        with self._lock:
+            indices = np.asarray(self._by_position.get(normalize_key(position), []), dtype=np.int64)
+            if not len(indices):
+                return []
+            scores = np.asarray(self._scores)[indices]
+            if len(indices) > top:
+                best = np.argpartition(-scores, top - 1)[:top]
+            else:
+                best = np.arange(len(indices))
+            best = best[np.argsort(-scores[best], kind="stable")]
+            return [{**self._candidates[indices[i]], 'score': round(float(scores[i]), 4)} for i in best]
+
+
+_default_scorer = None
+_default_scorer_lock = threading.Lock()
+
+
+def get_default_scorer() -> AnswerScorer:
+    """Scorer over the default store, kept current as candidates are saved"""
+    global _default_scorer
+    with _default_scorer_lock:
+        if _default_scorer is None:
+            from candidate_store import get_default_store
+            store = get_default_store()
+            scorer = AnswerScorer()
+            scorer.follow(store)
+            _default_scorer = scorer
+        return _default_scorer
+
+
+def main(argv=None):
+    from candidate_store import get_default_store
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--position", help="position to rank (default: list positions)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    scorer = AnswerScorer()
+    scorer.load_store(get_default_store())
+    if not args.position:
+        for position, count in sorted(scorer.positions().items(), key=lambda item: -item[1]):
+            print(f"{count:>8}  {position or '(none)'}")
+        return
+    for rank, candidate in enumerate(scorer.shortlist(args.position, args.top), start=1):
+        print(f"{rank:>3}. {candidate['score']:.3f}  {candidate['full_name']}  "
+              f"({candidate['years_experience']} yrs, {', '.join(candidate['tech_stack'] or [])})")
+
+
+if __name__ == "__main__":
+    main()
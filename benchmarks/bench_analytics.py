@@ -0,0 +1,94 @@
+"""Dashboard read cost from maintained aggregates versus recomputing from every stored record.
+
+Each appended batch is folded in through ``add_records``, the store listener
+the app attaches, so the incremental cost per saved record is reported
+alongside, as is a restart: loading the persisted aggregates and catching up
+on the records saved since.
+
+Usage:
+    python benchmarks/bench_analytics.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_analytics import CandidateAggregates  # noqa: E402
+from candidate_store import JsonlCandidateStore, FSYNC_NEVER  # noqa: E402
+
+TECHNOLOGIES = ["python", "javascript", "react", "java", "sql", "aws", "docker", "go"]
+POSITIONS = ["sde", "backend engineer", "frontend developer", "data engineer"]
+LOCATIONS = ["Hyderabad", "Pune", "Bengaluru", "Chennai", "Remote"]
+
+
+def make_record(rng, start):
+    stack = rng.sample(TECHNOLOGIES, rng.randint(1, 3))
+    return {
+        "full_name": "candidate",
+        "years_experience": str(rng.randint(0, 20)),
+        "desired_position": rng.choice(POSITIONS),
+        "current_location": rng.choice(LOCATIONS),
+        "tech_stack": stack,
+        "technical_answers": {tech: {f"Q{n}": {"question": "q", "answer": "an answer" * rng.randint(0, 3)}
+                                     for n in range(1, rng.randint(2, 6))} for tech in stack},
+        "timestamp": (start + timedelta(minutes=rng.randint(0, 60 * 24 * 90))).isoformat(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--batch", type=int, default=1, help="records per store append")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    start = datetime(2025, 9, 1)
+    print(f"{'records':>9} {'update us/rec':>14} {'read ms':>9} {'resume ms':>10} {'full scan ms':>13}")
+    for size in args.sizes:
+        workdir = tempfile.mkdtemp(prefix="bench-analytics-")
+        try:
+            store = JsonlCandidateStore(os.path.join(workdir, "candidates.jsonl"), fsync=FSYNC_NEVER)
+            aggregates = CandidateAggregates(os.path.join(workdir, "aggregates.json"))
+            positions = []
+            store.add_listener(lambda batch, position: positions.append(position), with_position=True)
+            records = [make_record(rng, start) for _ in range(size)]
+            update = 0.0
+            for offset in range(0, size, args.batch):
+                batch = records[offset:offset + args.batch]
+                store.append_many(batch)
+                begin = time.perf_counter()
+                aggregates.add_records(batch, positions.pop())
+                update += time.perf_counter() - begin
+            store.flush()
+            aggregates.persist()
+
+            begin = time.perf_counter()
+            resumed = CandidateAggregates.load(aggregates.path)
+            resumed.sync(store)
+            resume = time.perf_counter() - begin
+            assert resumed.records == size
+
+            begin = time.perf_counter()
+            for _ in range(20):
+                aggregates.to_dict()
+            read = (time.perf_counter() - begin) / 20
+
+            begin = time.perf_counter()
+            scanned = CandidateAggregates()
+            scanned.sync(store)
+            scan = time.perf_counter() - begin
+            assert scanned.to_dict()['weeks'] == aggregates.to_dict()['weeks']
+            print(f"{size:>9,} {update / size * 1e6:>14.1f} {read * 1e3:>9.2f} {resume * 1e3:>10.2f} "
+                  f"{scan * 1e3:>13.1f}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
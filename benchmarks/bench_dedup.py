@@ -0,0 +1,154 @@
+"""Near-duplicate detection at scale: LSH lookup versus a linear signature scan.
+
+Synthetic masked records are generated in batches, with a share of them
+planted as edited copies (name typo, reordered stack, reworded answers) of
+earlier ones. Reports indexing throughput, save-time lookup latency against
+the full index, batch clustering time and recall/precision on the plants.
+
+Usage:
+    python benchmarks/bench_dedup.py --records 1000000 --duplicates 0.05
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_dedup import DuplicateIndex, record_shingles  # noqa: E402
+
+TECHS = ["python", "javascript", "java", "react", "sql", "postgresql", "aws", "go", "rust", "docker", "kubernetes"]
+POSITIONS = ["sde", "backend engineer", "data engineer", "frontend developer", "devops engineer"]
+CITIES = ["hyderabad", "bangalore", "pune", "chennai", "delhi", "mumbai", "london", "berlin"]
+WORDS = ("memory garbage collector reference counting mutable immutable hashable closure decorator "
+         "generator iterator thread process async await promise event loop index transaction "
+         "isolation lock vacuum partition replica cache latency throughput container cluster "
+         "schema migration virtual hooks state props render component lambda bucket policy").split()
+
+
+def person(rng):
+    name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+    surname = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+    user = name + str(rng.randint(1, 999))
+    return {
+        'full_name': f"{name} {surname}",
+        'email': f"{user[0]}{'*' * (len(user) - 2)}{user[-1]}@{rng.choice(['gmail.com', 'yahoo.com', 'outlook.com'])}",
+        'phone': "******" + "".join(rng.choices(string.digits, k=4)),
+        'years_experience': str(rng.randint(0, 20)),
+        'desired_position': rng.choice(POSITIONS),
+        'current_location': rng.choice(CITIES),
+        'tech_stack': rng.sample(TECHS, rng.randint(2, 4)),
+        'technical_answers': {
+            'general': {f"Q{i}": {'question': f"Question {i}", 'answer': " ".join(rng.sample(WORDS, 6))}
+                        for i in range(1, 4)}},
+    }
+
+
+def edited_copy(record, rng):
+    """The same applicant re-applying with small differences"""
+    copy = dict(record)
+    name = list(record['full_name'])
+    position = rng.randrange(len(name))
+    if name[position] != " ":
+        name[position] = rng.choice(string.ascii_lowercase)
+    copy['full_name'] = "".join(name).title()
+    copy['tech_stack'] = list(reversed(record['tech_stack']))
+    answers = dict(record['technical_answers']['general'])
+    answers['Q3'] = {'question': "Question 3", 'answer': " ".join(rng.sample(WORDS, 6))}
+    copy['technical_answers'] = {'general': answers}
+    return copy
+
+
+def generate(count, share, rng, recent):
+    """Records with ``share`` of them edited copies of recently generated ones"""
+    records, planted = [], []
+    for _ in range(count):
+        if recent and rng.random() < share:
+            original_id, original = rng.choice(recent)
+            records.append(edited_copy(original, rng))
+            planted.append(original_id)
+        else:
+            records.append(person(rng))
+            planted.append(None)
+    return records, planted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000000)
+    parser.add_argument("--duplicates", type=float, default=0.05, help="share of planted near-duplicates")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=1000, help="save-time lookups timed at full size")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    index = DuplicateIndex(threshold=args.threshold)
+    planted_pairs = []
+    recent = []
+    shingle_time = index_time = 0.0
+
+    while len(index) < args.records:
+        count = min(args.batch_size, args.records - len(index))
+        records, planted = generate(count, args.duplicates, rng, recent)
+        base = len(index)
+        start = time.perf_counter()
+        for record in records:
+            record_shingles(record)
+        shingle_time += time.perf_counter() - start
+        start = time.perf_counter()
+        index.add_records(records, check=False)
+        index_time += time.perf_counter() - start
+        for offset, original_id in enumerate(planted):
+            if original_id is not None:
+                planted_pairs.append((original_id, base + offset))
+        recent = [(base + offset, record) for offset, record in enumerate(records)][-1000:]
+
+    print(f"{len(index):,} records, {len(planted_pairs):,} planted near-duplicates")
+    print(f"fingerprint (shingles only)  {len(index) / shingle_time:>12,.0f} records/s")
+    print(f"index (shingles + minhash)   {len(index) / index_time:>12,.0f} records/s")
+
+    probes, _ = generate(args.lookups, 0.0, rng, [])
+    index.query(probes[0])  # folds the bulk-loaded keys into the sorted array
+    lsh_samples = []
+    for probe in probes:
+        start = time.perf_counter()
+        index.query(probe)
+        lsh_samples.append(time.perf_counter() - start)
+    signatures = index._signatures[:len(index)]
+    scan_samples = []
+    for probe in probes[:max(1, args.lookups // 20)]:
+        start = time.perf_counter()
+        signature = index.hasher.signatures([record_shingles(probe)])[0]
+        similarity = (signatures == signature).mean(axis=1)
+        np.flatnonzero(similarity >= args.threshold)
+        scan_samples.append(time.perf_counter() - start)
+    lsh_samples.sort()
+    print(f"save-time lookup, LSH        p50 {lsh_samples[len(lsh_samples) // 2] * 1e3:8.3f} ms   "
+          f"p99 {lsh_samples[int(len(lsh_samples) * 0.99)] * 1e3:8.3f} ms")
+    print(f"save-time lookup, full scan  mean {sum(scan_samples) / len(scan_samples) * 1e3:7.1f} ms")
+
+    start = time.perf_counter()
+    clusters = index.clusters()
+    cluster_time = time.perf_counter() - start
+    cluster_of = {}
+    for number, members in enumerate(clusters):
+        for member in members:
+            cluster_of[member] = number
+    found = sum(1 for original, copy in planted_pairs
+                if original in cluster_of and cluster_of[original] == cluster_of.get(copy))
+    planted_members = {member for pair in planted_pairs for member in pair}
+    clustered = sum(len(members) for members in clusters)
+    false_members = sum(1 for members in clusters for member in members if member not in planted_members)
+    print(f"batch clustering             {cluster_time:8.2f} s   {len(clusters):,} clusters")
+    print(f"recall {found / max(1, len(planted_pairs)):.3f}   "
+          f"precision {1 - false_members / max(1, clustered):.3f} (share of clustered records that were planted)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""In-process throughput of the headless conversation engine and memory per session.
+
+Usage:
+    python benchmarks/bench_engine.py --conversations 20000 --idle-sessions 10000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation_engine import ConversationEngine  # noqa: E402
+
+SCRIPT_PREFIX = [
+    "hi",
+    "Mahesh Kumar",
+    "mahesh.kumar@example.com",
+    "+91 98765 40880",
+    "9",
+    "software developer",
+    "Hyderabad",
+    "Python, JS, React",
+]
+ANSWER = "Lists are mutable while tuples are immutable, so tuples can be dictionary keys."
+
+
+def scripted_turns(engine):
+    """Full conversation: greeting, seven fields and every technical answer"""
+    session = engine.new_session()
+    turns = 0
+    for message in SCRIPT_PREFIX:
+        engine.process(session, message)
+        turns += 1
+    while engine.get_current_question(session) is not None:
+        engine.process(session, ANSWER)
+        turns += 1
+    return session, turns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=20000)
+    parser.add_argument("--idle-sessions", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    engine = ConversationEngine(on_complete=lambda session: None)
+    scripted_turns(engine)  # warm caches
+
+    start = time.perf_counter()
+    total_turns = 0
+    for _ in range(args.conversations):
+        total_turns += scripted_turns(engine)[1]
+    elapsed = time.perf_counter() - start
+    print(f"{total_turns} turns in {elapsed:.2f}s: {total_turns / elapsed:,.0f} turns/s "
+          f"({elapsed / total_turns * 1e6:.2f} us/turn)")
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    fresh = [engine.new_session() for _ in range(args.idle_sessions)]
+    after_fresh = tracemalloc.take_snapshot()
+    finished = [scripted_turns(engine)[0] for _ in range(args.idle_sessions)]
+    after_finished = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    def per_session(later, earlier):
+        return sum(stat.size_diff for stat in later.compare_to(earlier, "filename")) / args.idle_sessions
+
+    print(f"memory per new session:       {per_session(after_fresh, baseline):8.0f} bytes")
+    print(f"memory per completed session: {per_session(after_finished, after_fresh):8.0f} bytes")
+    del fresh, finished
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Cost of classifying candidate messages: substring exit scan versus the intent router.
+
+Usage:
+    python benchmarks/bench_intent.py --iterations 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_router import classify  # noqa: E402
+
+EXIT_KEYWORDS = ['exit', 'quit', 'bye', 'thank you', 'thanks', 'goodbye']
+
+PARAGRAPH = (
+    "A Python list is a mutable, dynamically sized array of references, while a tuple is an "
+    "immutable sequence. Because tuples cannot change they are hashable when their items are, "
+    "so they can be used as dictionary keys, and CPython can cache and reuse small tuples. "
+    "Lists over-allocate so that append is amortized O(1). In practice I use tuples for fixed "
+    "records and lists for collections that grow.\n\n"
+)
+
+MESSAGES = {
+    'short answer': "list is mutable but tuple is immutable",
+    'exit command': "exit",
+    '1 paragraph': PARAGRAPH,
+    '10 paragraphs': PARAGRAPH * 10,
+    '100 paragraphs': PARAGRAPH * 100,
+}
+
+
+def legacy_is_exit(message):
+    """The original per-turn check"""
+    user_input_lower = message.lower().strip()
+    return any(keyword in user_input_lower for keyword in EXIT_KEYWORDS)
+
+
+def time_per_call(func, message, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(message)
+    return (time.perf_counter() - start) / iterations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    router = lambda message: classify(message, "asking_questions")  # noqa: E731
+    print(f"{'message':<15} {'chars':>7} {'substring us':>13} {'router us':>10}  router intent")
+    for name, message in MESSAGES.items():
+        legacy = time_per_call(legacy_is_exit, message, args.iterations)
+        routed = time_per_call(router, message, args.iterations)
+        print(f"{name:<15} {len(message):>7} {legacy * 1e6:>13.3f} {routed * 1e6:>10.3f}  {router(message)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cost of the hot-path timers and accuracy of the histogram percentiles.
+
+Usage:
+    python benchmarks/bench_metrics.py --samples 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation_engine import ConversationEngine, TURN_STAGE_SECONDS  # noqa: E402
+from metrics import LatencyHistogram, MetricsRegistry  # noqa: E402
+
+SCRIPT = ["hi", "Asha Rao", "asha.rao@example.com", "+1 555 123 4567", "5",
+          "Backend Engineer", "Pune", "Python, SQL, AWS"] + ["An answer."] * 15
+
+
+def per_call_ns(function, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--conversations", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    histogram = LatencyHistogram()
+    timer = histogram.timed(lambda: None)
+
+    def context():
+        with histogram.time():
+            pass
+
+    baseline = per_call_ns(lambda: None, args.samples)
+    print(f"{'operation':<28} {'ns/call':>9}")
+    print(f"{'record_ns':<28} {per_call_ns(lambda: histogram.record_ns(12345), args.samples):>9.0f}")
+    print(f"{'context manager timer':<28} {per_call_ns(context, args.samples) - baseline:>9.0f}")
+    print(f"{'decorated call (overhead)':<28} {per_call_ns(timer, args.samples) - baseline:>9.0f}")
+
+    rng = random.Random(5)
+    samples = sorted(rng.lognormvariate(-8, 1.5) for _ in range(args.samples))
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(value)
+    print(f"\n{'percentile':<12} {'exact ms':>10} {'histogram ms':>13} {'error':>7}")
+    for pct in (50, 90, 99, 99.9):
+        exact = samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+        estimate = histogram.percentile(pct)
+        print(f"{pct:<12} {exact * 1e3:>10.4f} {estimate * 1e3:>13.4f} {abs(estimate - exact) / exact:>7.2%}")
+
+    registry = MetricsRegistry()
+    family = registry.histogram("bench_seconds", "Benchmark timers", ("stage",))
+    for stage in range(50):
+        child = family.labels(str(stage))
+        for value in samples[::100]:
+            child.record(value)
+    start = time.perf_counter()
+    text = registry.render()
+    print(f"\nrender 50 histograms: {(time.perf_counter() - start) * 1e3:.2f} ms, {len(text):,} bytes")
+
+    engine = ConversationEngine()
+    start = time.perf_counter()
+    for _ in range(args.conversations):
+        session = engine.new_session()
+        for message in SCRIPT:
+            engine.process(session, message)
+    elapsed = time.perf_counter() - start
+    turns = args.conversations * len(SCRIPT)
+    print(f"\ninstrumented engine: {turns / elapsed:,.0f} turns/s")
+    for stage in ("intent", "transition"):
+        snapshot = TURN_STAGE_SECONDS.labels(stage).snapshot()
+        print(f"  {stage:<11} p50 {snapshot['p50_ms'] * 1e3:.1f} us, p99 {snapshot['p99_ms'] * 1e3:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Per-call cost of question generation: inline templates versus the question bank.
+
+Usage:
+    python benchmarks/bench_question_bank.py --calls 20000
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionBank, get_question_bank  # noqa: E402
+
+STACKS = [
+    ["python", "react", "javascript"],
+    ["Python3", "JS ", "reactjs", "postgres"],
+    ["java", "aws", "sql"],
+    ["Rust", "Pyhton", "node.js"],
+]
+
+
+def legacy_generate_tech_questions(tech_stack):
+    """The original implementation, rebuilding the template dict on every call"""
+    questions = []
+    tech_question_templates = {
+        'python': [
+            "What are the key differences between lists and tuples in Python?",
+            "How does Python handle memory management?",
+            "Explain the concept of decorators in Python with an example.",
+            "What is the Global Interpreter Lock (GIL) and how does it affect multithreading?",
+            "CODING TASK (Optional): Write a function to reverse a string without using built-in reverse methods."
+        ],
+        'javascript': [
+            "What is the difference between let, const, and var?",
+            "Explain the concept of closures in JavaScript.",
+            "How does the event loop work in JavaScript?",
+            "What are promises and how do they differ from callbacks?",
+            "CODING TASK (Optional): Implement a debounce function from scratch."
+        ],
+        'java': [
+            "What is the difference between abstract classes and interfaces?",
+            "Explain the concept of polymorphism in Java.",
+            "How does garbage collection work in Java?",
+            "What are the main principles of OOP and how does Java implement them?",
+            "CODING TASK (Optional): Write a thread-safe singleton class implementation."
+        ],
+        'react': [
+            "What is the virtual DOM and how does it improve performance?",
+            "Explain the difference between state and props.",
+            "What are React hooks and when would you use them?",
+            "How does React handle component lifecycle?",
+            "CODING TASK (Optional): Create a custom hook for handling API calls."
+        ],
+        'sql': [
+            "What is the difference between INNER JOIN and LEFT JOIN?",
+            "Explain database normalization with examples.",
+            "What are indexes and how do they improve query performance?",
+            "How would you handle database transactions?",
+            "CODING TASK (Optional): Write a query to find the second highest salary from an employees table."
+        ],
+        'aws': [
+            "What is the difference between EC2 and Lambda?",
+            "Explain the shared responsibility model in AWS.",
+            "How would you design a highly available architecture?",
+            "What are the main security best practices in AWS?",
+            "CODING TASK (Optional): Write a CloudFormation template for a basic S3 bucket."
+        ]
+    }
+    for tech in tech_stack:
+        tech_lower = tech.strip().lower()
+        if tech_lower in tech_question_templates:
+            questions.append({'technology': tech, 'questions': tech_question_templates[tech_lower]})
+        else:
+            questions.append({
+                'technology': tech,
+                'questions': [
+                    f"What are the main features and advantages of {tech}?",
+                    f"Describe a challenging project you've worked on using {tech}.",
+                    f"What are the best practices for working with {tech}?",
+                    f"How does {tech} handle scalability and performance?",
+                    f"CODING TASK (Optional): Describe how you would implement a basic feature using {tech}."
+                ]
+            })
+    return questions
+
+
+def bank_generate_tech_questions(tech_stack, bank=get_question_bank()):
+    return [{'technology': tech, 'questions': bank.questions_for(tech)} for tech in tech_stack]
+
+
+def time_per_call(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(STACKS[i % len(STACKS)])
+    return (time.perf_counter() - start) / calls
+
+
+def scaling(bank_size, calls):
+    """Per-call cost when the bank holds ``bank_size`` technologies"""
+    templates = [f"Question {i} about {{tech}}?" for i in range(5)]
+    stack = ["tech0", f"tech{bank_size // 2}", f"tech{bank_size - 1}"]
+
+    names = [f"tech{i}" for i in range(bank_size)]
+    constants = [tuple(t.format(tech=i) for t in templates) for i in range(bank_size)]
+
+    def legacy(tech_stack):
+        # Equivalent of an inline dict literal with bank_size entries: each
+        # list is rebuilt from its constant strings on every call
+        tech_question_templates = {name: list(qs) for name, qs in zip(names, constants)}
+        return [{'technology': tech, 'questions': tech_question_templates[tech]} for tech in tech_stack]
+
+    directory = tempfile.mkdtemp(prefix="talentscout-bank-")
+    try:
+        for i in range(bank_size):
+            with open(os.path.join(directory, f"tech{i}.json"), "w") as f:
+                json.dump({'technology': f"tech{i}", 'aliases': [f"t{i}"],
+                           'questions': [t.format(tech=i) for t in templates]}, f)
+        load_start = time.perf_counter()
+        bank = QuestionBank(directory)
+        load_time = time.perf_counter() - load_start
+
+        def indexed(tech_stack):
+            return [{'technology': tech, 'questions': bank.questions_for(tech)} for tech in tech_stack]
+
+        legacy_calls = max(1, calls // bank_size)
+        start = time.perf_counter()
+        for _ in range(legacy_calls):
+            legacy(stack)
+        legacy_time = (time.perf_counter() - start) / legacy_calls
+        start = time.perf_counter()
+        for _ in range(calls):
+            indexed(stack)
+        indexed_time = (time.perf_counter() - start) / calls
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return load_time, legacy_time, indexed_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--bank-sizes", type=int, nargs="+", default=[6, 100, 1000, 5000])
+    args = parser.parse_args(argv)
+
+    bank = get_question_bank()
+    print("alias resolution:")
+    for stack in STACKS:
+        print("  " + ", ".join(f"{tech!r}->{bank.canonical(tech)}" for tech in stack))
+
+    legacy = time_per_call(legacy_generate_tech_questions, args.calls)
+    indexed = time_per_call(bank_generate_tech_questions, args.calls)
+    print(f"legacy inline templates: {legacy * 1e6:8.2f} us/call")
+    print(f"question bank index:     {indexed * 1e6:8.2f} us/call")
+
+    print(f"\n{'techs':>6} {'load ms':>9} {'inline us/call':>15} {'bank us/call':>13}")
+    for bank_size in args.bank_sizes:
+        load_time, legacy_time, indexed_time = scaling(bank_size, args.calls)
+        print(f"{bank_size:>6} {load_time * 1e3:>9.1f} {legacy_time * 1e6:>15.2f} {indexed_time * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Per-rerun render time against conversation length, full versus windowed history.
+
+Runs each renderer as a real Streamlit script through streamlit.testing's
+AppTest, with a synthetic screening session of the given length.
+
+Usage:
+    python benchmarks/bench_render.py --lengths 10 60 200 500 --reruns 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+
+def full_history_script():
+    """The original main() rendering: every message and question, every rerun"""
+    import streamlit as st
+    for message in st.session_state.chat_history:
+        st.chat_message(message['role']).markdown(message['content'])
+    with st.expander("📋 Generated Technical Questions", expanded=True):
+        for tech_qa in st.session_state.tech_questions:
+            st.subheader(f"**{tech_qa['technology']}**")
+            for j, question in enumerate(tech_qa['questions'], 1):
+                answered = f"Q{j}" in st.session_state.candidate_answers.get(tech_qa['technology'], {})
+                st.write(f"{'✅' if answered else '⏳'} {j}. {question}")
+            st.divider()
+    with st.expander("📝 Candidate Answers", expanded=True):
+        for tech, answers in st.session_state.candidate_answers.items():
+            st.subheader(f"**{tech}**")
+            for q_key, qa in answers.items():
+                st.write(f"**{q_key}: {qa['question']}**")
+                st.write(f"*Answer:* {qa['answer']}")
+                st.divider()
+
+
+def windowed_history_script():
+    import sys
+    import streamlit as st
+    sys.path.insert(0, st.session_state.repo_root)
+    from chat_render import render_chat_history, render_question_panel, render_answer_panel
+    render_chat_history(st.session_state.chat_history)
+    render_question_panel(st.session_state.tech_questions, st.session_state.candidate_answers)
+    render_answer_panel(st.session_state.candidate_answers)
+
+
+def synthetic_session(length):
+    """Chat history of ``length`` messages plus matching questions and answers"""
+    history, answers, tech_questions = [], {}, []
+    for i in range(length // 2):
+        tech = f"Tech{i // 5}"
+        if i % 5 == 0:
+            tech_questions.append({'technology': tech,
+                                   'questions': [f"Question {q} about {tech}?" for q in range(1, 6)]})
+        question = f"**{tech} - Question {i % 5 + 1}/5:**\nQuestion {i % 5 + 1} about {tech}?"
+        history.append({'role': 'assistant', 'content': question})
+        history.append({'role': 'user', 'content': f"Answer {i}: " + "some detail " * 20})
+        answers.setdefault(tech, {})[f"Q{i % 5 + 1}"] = {'question': question, 'answer': f"Answer {i}"}
+    return history, tech_questions, answers
+
+
+def time_reruns(script, length, reruns):
+    history, tech_questions, answers = synthetic_session(length)
+    at = AppTest.from_function(script, default_timeout=60)
+    at.session_state['repo_root'] = REPO_ROOT
+    at.session_state['chat_history'] = history
+    at.session_state['tech_questions'] = tech_questions
+    at.session_state['candidate_answers'] = answers
+    at.run()  # first run fills caches, like the rerun before it would have
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 60, 200, 500])
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'messages':>8} {'full ms':>9} {'windowed ms':>12}")
+    for length in args.lengths:
+        full = time_reruns(full_history_script, length, args.reruns)
+        windowed = time_reruns(windowed_history_script, length, args.reruns)
+        print(f"{length:>8} {full * 1e3:>9.1f} {windowed * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Throughput of vectorized answer scoring versus a per-answer Python loop.
+
+Synthetic candidates answer every question of six technologies with a mix of
+rubric keywords and filler; records are generated and scored in batches the
+way AnswerScorer.load_store reads a store.
+
+Usage:
+    python benchmarks/bench_scoring.py --candidates 100000 --answers 30
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answer_scoring import AnswerScorer, rubric_terms, tokenize  # noqa: E402
+from question_bank import get_question_bank  # noqa: E402
+
+FILLER = ("i think it depends on the use case and we usually handle that in production "
+          "by following best practices and reviewing the code carefully").split()
+POSITIONS = ["sde", "backend engineer", "data engineer", "frontend developer"]
+
+
+def build_questions(answers_per_candidate):
+    bank = get_question_bank()
+    questions = []
+    for tech in bank.technologies():
+        for question in bank.questions_for(tech):
+            questions.append((tech, question, bank.rubric_for(question) or [question]))
+    return [questions[i % len(questions)] for i in range(answers_per_candidate)]
+
+
+def make_records(count, questions, rng, offset):
+    records = []
+    for index in range(count):
+        answers = {}
+        for number, (tech, question, rubric) in enumerate(questions, start=1):
+            if rng.random() < 0.05:
+                qa = {'question': question, 'answer': "", 'skipped': True}
+            else:
+                words = rng.sample(rubric, rng.randint(0, len(rubric))) + rng.sample(FILLER, 8)
+                rng.shuffle(words)
+                qa = {'question': question, 'answer': " ".join(words)}
+            answers.setdefault(tech, {})[f"Q{number}"] = qa
+        records.append({
+            'full_name': f"candidate {offset + index}",
+            'desired_position': POSITIONS[(offset + index) % len(POSITIONS)],
+            'years_experience': str(rng.randint(0, 20)),
+            'tech_stack': sorted(answers),
+            'technical_answers': answers,
+        })
+    return records
+
+
+def loop_score(records, rubric_cache):
+    """Per-answer keyword coverage without vectorization, for comparison"""
+    scores = []
+    for record in records:
+        total = count = 0
+        for answers in record['technical_answers'].values():
+            for qa in answers.values():
+                count += 1
+                if qa.get('skipped'):
+                    continue
+                terms = rubric_cache.get(qa['question'])
+                if terms is None:
+                    terms = rubric_cache[qa['question']] = set(rubric_terms(
+                        get_question_bank().rubric_for(qa['question']) or [qa['question']]))
+                tokens = set(tokenize(qa['answer']))
+                total += len(terms & tokens) / len(terms) if terms else 0.0
+        scores.append(total / count if count else 0.0)
+    return scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--answers", type=int, default=30, help="answers per candidate")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    questions = build_questions(args.answers)
+    scorer = AnswerScorer()
+    rubric_cache = {}
+    encode_time = vector_time = loop_time = rank_time = 0.0
+
+    done = 0
+    while done < args.candidates:
+        records = make_records(min(args.batch_size, args.candidates - done), questions, rng, done)
+
+        start = time.perf_counter()
+        batch = scorer.encode(records)
+        encode_time += time.perf_counter() - start
+        start = time.perf_counter()
+        scorer.score_batch(batch)
+        vector_time += time.perf_counter() - start
+        start = time.perf_counter()
+        scorer.add_records(records)
+        rank_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        loop_score(records, rubric_cache)
+        loop_time += time.perf_counter() - start
+        done += len(records)
+
+    start = time.perf_counter()
+    for position in POSITIONS:
+        scorer.shortlist(position, 20)
+    shortlist_time = (time.perf_counter() - start) / len(POSITIONS)
+
+    answers = args.candidates * args.answers
+    print(f"{args.candidates:,} candidates x {args.answers} answers = {answers:,} answers")
+    print(f"{'stage':<28} {'seconds':>9} {'answers/s':>12}")
+    for name, seconds in (("python loop (coverage only)", loop_time),
+                          ("encode (tokenize)", encode_time),
+                          ("vectorized scoring", vector_time),
+                          ("encode + score", encode_time + vector_time),
+                          ("add_records (incremental)", rank_time)):
+        print(f"{name:<28} {seconds:>9.3f} {answers / seconds:>12,.0f}")
+    print(f"shortlist top 20 per position: {shortlist_time * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Memory per idle session, in memory versus evicted to disk, and resume latency from checkpoints.
+
+Sessions are driven through ConversationEngine to the middle of a
+three-technology screening, checkpointed after every turn like the app does.
+
+Usage:
+    python benchmarks/bench_sessions.py --sessions 5000 --resumes 2000
+"""
+import argparse
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation_engine import ConversationEngine  # noqa: E402
+from session_checkpoint import SessionCheckpointer, SessionManager, session_size  # noqa: E402
+
+SCRIPT = ["hi", "Asha Rao", "asha.rao@example.com", "+1 555 123 4567", "5",
+          "Backend Engineer", "Pune", "Python, SQL, AWS"]
+ANSWER = "I would use a context manager so the connection is always released, and test it under load."
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def drive(engine, manager, answers):
+    """Create a session, checkpointing every turn; returns (token, checkpoint times)"""
+    token, session = manager.create()
+    times = []
+    for message in SCRIPT + [ANSWER] * answers:
+        engine.process(session, message)
+        start = time.perf_counter()
+        manager.checkpoint(token, session)
+        times.append(time.perf_counter() - start)
+    return token, times
+
+
+def directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--answers", type=int, default=7, help="questions answered before going idle")
+    parser.add_argument("--resumes", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    engine = ConversationEngine()
+    workdir = tempfile.mkdtemp(prefix="bench-sessions-")
+    try:
+        manager = SessionManager(SessionCheckpointer(os.path.join(workdir, "sessions")),
+                                 memory_budget=1 << 40)
+        drive(engine, manager, args.answers)  # warm caches before measuring
+
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tokens, checkpoint_times = [], []
+        for _ in range(args.sessions):
+            token, times = drive(engine, manager, args.answers)
+            tokens.append(token)
+            checkpoint_times.extend(times)
+        gc.collect()
+        live = tracemalloc.get_traced_memory()[0] - baseline
+        estimated = sum(session_size(manager.get(token)) for token in tokens) / len(tokens)
+
+        start = time.perf_counter()
+        manager.evict_idle(len(tokens) + 1)
+        evict_time = time.perf_counter() - start
+        gc.collect()
+        evicted = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        disk = directory_bytes(manager.checkpointer.directory)
+
+        print(f"{args.sessions:,} idle sessions, {args.answers} of 15 questions answered")
+        print(f"{'':<34} {'bytes/session':>14}")
+        print(f"{'in memory (tracemalloc)':<34} {live / args.sessions:>14,.0f}")
+        print(f"{'in memory (session_size estimate)':<34} {estimated:>14,.0f}")
+        print(f"{'after eviction (tracemalloc)':<34} {evicted / args.sessions:>14,.0f}")
+        print(f"{'on disk':<34} {disk / args.sessions:>14,.0f}")
+        print(f"checkpoint per turn: p50 {percentile(checkpoint_times, 50) * 1e6:.0f} us, "
+              f"p99 {percentile(checkpoint_times, 99) * 1e6:.0f} us; "
+              f"eviction {evict_time / args.sessions * 1e6:.0f} us/session")
+
+        rng = random.Random(3)
+        samples = []
+        for token in rng.sample(tokens, min(args.resumes, len(tokens))):
+            start = time.perf_counter()
+            session = manager.get(token)
+            samples.append(time.perf_counter() - start)
+            assert session.current_question_index == args.answers % 5
+        print(f"\n{'resume from':<34} {'p50 us':>8} {'p99 us':>8}")
+        print(f"{'compacted snapshot':<34} {percentile(samples, 50) * 1e6:>8.0f} {percentile(samples, 99) * 1e6:>8.0f}")
+
+        # Resuming straight from the delta log, before any compaction
+        for deltas in (1, 8, 15):
+            checkpointer = SessionCheckpointer(os.path.join(workdir, f"log-{deltas}"), compact_every=1 << 30)
+            log_manager = SessionManager(checkpointer, memory_budget=1 << 40)
+            log_tokens = [drive(engine, log_manager, deltas)[0] for _ in range(200)]
+            samples = []
+            for token in log_tokens:
+                checkpointer.forget(token)
+                start = time.perf_counter()
+                checkpointer.load(token)
+                samples.append(time.perf_counter() - start)
+            label = f"snapshot + {len(SCRIPT) - 1 + deltas} logged turns"
+            print(f"{label:<34} {percentile(samples, 50) * 1e6:>8.0f} {percentile(samples, 99) * 1e6:>8.0f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Save latency of the JSONL candidate store versus the legacy JSON rewrite.
+
+Usage:
+    python benchmarks/bench_store.py --sizes 10 1000 100000 1000000
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_store import JsonlCandidateStore, FSYNC_NEVER  # noqa: E402
+
+SAMPLE_RECORD = {
+    "full_name": "mahesh",
+    "email": "m****5@gmail.com",
+    "phone": "******0880",
+    "years_experience": "9",
+    "desired_position": "sde",
+    "current_location": "Hyderabad",
+    "tech_stack": ["python", "js", "react"],
+    "technical_answers": {
+        "python": {
+            "Q1": {
+                "question": "What are the key differences between lists and tuples in Python?",
+                "answer": "list is mutable but tuple is immutable"
+            }
+        }
+    },
+    "timestamp": "2025-11-22T08:36:47.290103"
+}
+
+
+def legacy_save(path, record):
+    """The original read-modify-write of the whole JSON array"""
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            existing = json.load(f)
+    else:
+        existing = []
+    existing.append(record)
+    with open(path, "w") as f:
+        json.dump(existing, f, indent=2)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def bench_jsonl(workdir, size, saves, fsync):
+    path = os.path.join(workdir, "candidates.jsonl")
+    prefill = JsonlCandidateStore(path, fsync=FSYNC_NEVER)
+    chunk = [SAMPLE_RECORD] * 10000
+    remaining = size
+    while remaining > 0:
+        prefill.append_many(chunk[:min(remaining, len(chunk))])
+        remaining -= len(chunk)
+    prefill.close()
+
+    store = JsonlCandidateStore(path, fsync=fsync)
+    samples = []
+    for _ in range(saves):
+        start = time.perf_counter()
+        store.append(SAMPLE_RECORD)
+        samples.append(time.perf_counter() - start)
+    store.close()
+    return samples
+
+
+def bench_legacy(workdir, size, saves):
+    path = os.path.join(workdir, "candidates.json")
+    with open(path, "w") as f:
+        json.dump([SAMPLE_RECORD] * size, f, indent=2)
+    samples = []
+    for _ in range(saves):
+        start = time.perf_counter()
+        legacy_save(path, SAMPLE_RECORD)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000, 1000000])
+    parser.add_argument("--saves", type=int, default=200, help="timed saves per size")
+    parser.add_argument("--fsync", default="group", choices=["always", "group", "never"])
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="largest store size to time the legacy rewrite at")
+    args = parser.parse_args(argv)
+
+    print(f"{'backend':<8} {'stored':>9} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for size in args.sizes:
+        runs = [("jsonl", lambda d: bench_jsonl(d, size, args.saves, args.fsync))]
+        if size <= args.legacy_max:
+            runs.append(("legacy", lambda d: bench_legacy(d, size, min(args.saves, 20))))
+        for name, run in runs:
+            workdir = tempfile.mkdtemp(prefix="talentscout-bench-")
+            try:
+                samples = run(workdir)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+            print(f"{name:<8} {size:>9} {percentile(samples, 50) * 1e3:>9.3f} "
+                  f"{percentile(samples, 99) * 1e3:>9.3f} {statistics.mean(samples) * 1e3:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
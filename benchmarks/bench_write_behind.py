@@ -0,0 +1,162 @@
+"""Save latency seen by a conversation turn: synchronous store writes versus the write-behind queue.
+
+With --kill-rounds, also checks durability: a child process submits numbered
+records and reports each acknowledged group commit, the parent SIGKILLs it
+at a random moment, and the store is reopened to check that every
+acknowledged record survived, nothing is duplicated and every line parses.
+
+Usage:
+    python benchmarks/bench_write_behind.py --saves 2000
+    python benchmarks/bench_write_behind.py --saves 0 --kill-rounds 20
+"""
+import argparse
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_store import STORE_BACKENDS, FSYNC_ALWAYS, FSYNC_GROUP, JsonlCandidateStore  # noqa: E402
+from write_behind import WriteBehindWriter  # noqa: E402
+
+RECORD = {
+    "full_name": "mahesh",
+    "email": "m****5@gmail.com",
+    "phone": "******0880",
+    "years_experience": "9",
+    "desired_position": "sde",
+    "current_location": "Hyderabad",
+    "tech_stack": ["python", "js", "react"],
+    "technical_answers": {"python": {"Q1": {
+        "question": "What are the key differences between lists and tuples in Python?",
+        "answer": "list is mutable but tuple is immutable"}}},
+    "timestamp": "2025-11-22T08:36:47.290103",
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def open_store(backend, path, fsync):
+    if backend == "jsonl":
+        return JsonlCandidateStore(path, fsync=fsync)
+    return STORE_BACKENDS[backend][0](path)
+
+
+def bench(backend, fsync, saves, think):
+    workdir = tempfile.mkdtemp(prefix="bench-write-behind-")
+    try:
+        results = {}
+        for mode in ("sync", "write-behind"):
+            store = open_store(backend, os.path.join(workdir, f"{mode}.{backend}"), fsync)
+            writer = WriteBehindWriter(store, dead_letter_dir=workdir) if mode == "write-behind" else None
+            samples = []
+            for number in range(saves):
+                record = dict(RECORD, seq=number)
+                start = time.perf_counter()
+                if writer is not None:
+                    writer.submit(record)
+                else:
+                    store.append(record)
+                samples.append(time.perf_counter() - start)
+                if think:
+                    time.sleep(think)
+            drain_start = time.perf_counter()
+            if writer is not None:
+                writer.close()
+                results['stats'] = writer.stats()
+            store.flush()
+            results[mode] = (samples, time.perf_counter() - drain_start)
+            store.close()
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def child(path, records):
+    """Submit numbered records as fast as possible, printing acknowledged commits"""
+    store = JsonlCandidateStore(path, fsync=FSYNC_GROUP)
+
+    def acknowledge(batch):
+        sys.stdout.write("".join(f"{record['seq']}\n" for record in batch))
+        sys.stdout.flush()
+
+    writer = WriteBehindWriter(store, max_queue=256, batch_size=64, on_commit=acknowledge,
+                               dead_letter_dir=os.path.dirname(path))
+    for number in range(records):
+        writer.submit(dict(RECORD, seq=number))
+    writer.close()
+
+
+def kill_round(workdir, rng, records):
+    path = os.path.join(workdir, "candidates.jsonl")
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--child", path,
+                                "--records", str(records)], stdout=subprocess.PIPE, text=True)
+    output = ""
+    try:
+        # Keep reading acknowledgements so the child never blocks on a full pipe
+        output, _ = process.communicate(timeout=rng.uniform(0.3, 1.5))
+    except subprocess.TimeoutExpired:
+        process.send_signal(signal.SIGKILL)
+        output, _ = process.communicate()
+    acknowledged = {int(line) for line in output.split()}
+
+    stored = [record['seq'] for record in JsonlCandidateStore(path).iter_records()]
+    with open(path, "rb") as f:
+        torn = len(f.read().splitlines()) - len(stored)
+    missing = acknowledged - set(stored)
+    duplicates = len(stored) - len(set(stored))
+    os.remove(path)
+    return len(acknowledged), len(stored), len(missing), duplicates, torn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saves", type=int, default=2000)
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between saves")
+    parser.add_argument("--kill-rounds", type=int, default=0)
+    parser.add_argument("--records", type=int, default=1000000, help="records a killed child tries to save")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child, args.records)
+        return
+
+    if args.saves:
+        print(f"{'store':<14} {'mode':<13} {'p50 us':>9} {'p99 us':>10} {'max us':>10} {'drain ms':>9}")
+        for backend, fsync in (("jsonl", FSYNC_ALWAYS), ("jsonl", FSYNC_GROUP), ("sqlite", None)):
+            results = bench(backend, fsync, args.saves, args.think_ms / 1000)
+            label = f"{backend}/{fsync}" if fsync else backend
+            for mode in ("sync", "write-behind"):
+                samples, drain = results[mode]
+                print(f"{label:<14} {mode:<13} {percentile(samples, 50) * 1e6:>9.1f} "
+                      f"{percentile(samples, 99) * 1e6:>10.1f} {max(samples) * 1e6:>10.1f} {drain * 1e3:>9.1f}")
+            stats = results['stats']
+            print(f"{'':<14} batches {stats['batches']}, mean batch {stats['mean_batch_size']:.1f}, "
+                  f"max depth {stats['max_queue_depth']}, commit p99 {stats['commit_latency'].get('p99_ms', 0):.2f} ms")
+
+    if args.kill_rounds:
+        rng = random.Random(5)
+        workdir = tempfile.mkdtemp(prefix="bench-write-behind-kill-")
+        failures = 0
+        try:
+            print(f"{'round':>5} {'acked':>8} {'stored':>8} {'lost':>5} {'dupes':>6} {'torn':>5}")
+            for number in range(1, args.kill_rounds + 1):
+                acked, stored, missing, duplicates, torn = kill_round(workdir, rng, args.records)
+                failures += bool(missing or duplicates)
+                print(f"{number:>5} {acked:>8} {stored:>8} {missing:>5} {duplicates:>6} {torn:>5}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        print("durability: " + ("OK" if not failures else f"{failures} rounds lost or duplicated records"))
+
+
+if __name__ == "__main__":
+    main()
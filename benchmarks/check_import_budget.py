@@ -0,0 +1,93 @@
+"""Check that the screening core imports without Streamlit or other heavy modules, within a time budget.
+
+Each module is imported in a fresh interpreter with ``-X importtime``; the
+reported time is its cumulative import time (the best of ``--repeat`` runs),
+so interpreter startup is not counted. Exits with status 1 if a core module
+goes over budget or pulls in a forbidden module.
+
+Usage:
+    python benchmarks/check_import_budget.py
+    python benchmarks/check_import_budget.py --budget-ms 50 --repeat 7
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything a CLI tool or worker needs to validate, mask, ask questions and save
+CORE_MODULES = (
+    "validators", "intent_router", "question_bank", "question_providers", "conversation_engine",
+    "candidate_store", "write_behind", "session_checkpoint", "candidate_analytics", "metrics", "bulk_io",
+)
+# Only the UI, opt-in features or LLM calls may load these
+FORBIDDEN_MODULES = ("streamlit", "numpy", "pandas", "pyarrow", "yaml", "http.client", "ssl")
+UI_MODULE = "TalentScout_app"
+DEFAULT_BUDGET_MS = 100.0
+
+_PROBE = "import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+
+
+def measure_import(module, repeat=5):
+    """(best cumulative import time in ms, modules loaded) for ``module`` in a fresh interpreter"""
+    best, loaded = None, []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+                                cwd=REPO_ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{result.stderr.strip()}")
+        cumulative = None
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                cumulative = int(parts[1]) / 1000
+        if cumulative is None:
+            raise RuntimeError(f"no import time reported for {module}")
+        best = cumulative if best is None else min(best, cumulative)
+        loaded = json.loads(result.stdout)
+    return best, loaded
+
+
+def check(modules=CORE_MODULES, budget_ms=DEFAULT_BUDGET_MS, repeat=5):
+    """Rows of (module, ms, forbidden modules loaded, ok)"""
+    rows = []
+    for module in modules:
+        elapsed, loaded = measure_import(module, repeat)
+        forbidden = [name for name in FORBIDDEN_MODULES if name in loaded]
+        rows.append((module, elapsed, forbidden, elapsed <= budget_ms and not forbidden))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("TALENTSCOUT_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+                        help="cumulative import time allowed per core module")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=list(CORE_MODULES))
+    parser.add_argument("--skip-ui", action="store_true", help="do not report the Streamlit entry point")
+    args = parser.parse_args(argv)
+
+    rows = check(args.modules, args.budget_ms, args.repeat)
+    print(f"{'module':<22} {'import ms':>10}  result")
+    for module, elapsed, forbidden, ok in rows:
+        verdict = "ok" if ok else "OVER BUDGET" if not forbidden else "loads " + ", ".join(forbidden)
+        print(f"{module:<22} {elapsed:>10.1f}  {verdict}")
+    if not args.skip_ui:
+        elapsed, _ = measure_import(UI_MODULE, 1)
+        print(f"{UI_MODULE:<22} {elapsed:>10.1f}  (UI entry point, not budgeted)")
+
+    failed = [row[0] for row in rows if not row[3]]
+    if failed:
+        print(f"\n{len(failed)} module(s) over the {args.budget_ms:g} ms budget or loading forbidden modules: "
+              f"{', '.join(failed)}")
+        return 1
+    print(f"\nall {len(rows)} core modules within {args.budget_ms:g} ms and free of {', '.join(FORBIDDEN_MODULES)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Reproducible benchmark suite for the screening core, recorded as JSON for comparison across commits.
+
+Covers validate_email, validate_phone, mask_sensitive_data,
+generate_tech_questions, full scripted conversations through
+ConversationEngine, save latency against JSONL stores of 1k to 1M records
+and core import times. Inputs are fixed and seeded, micro-benchmarks run
+with the garbage collector off, and each case reports the median and best
+of several repeats.
+
+Usage:
+    python benchmarks/run_suite.py                                   # writes benchmarks/results/<commit>.json
+    python benchmarks/run_suite.py --quick --output /tmp/new.json
+    python benchmarks/run_suite.py --compare benchmarks/results/abc1234.json --tolerance 0.1
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from candidate_store import JsonlCandidateStore, FSYNC_ALWAYS, FSYNC_GROUP, FSYNC_NEVER  # noqa: E402
+from check_import_budget import CORE_MODULES, measure_import  # noqa: E402
+from conversation_engine import ConversationEngine, build_candidate_record, generate_tech_questions  # noqa: E402
+from validators import mask_sensitive_data, validate_email, validate_phone  # noqa: E402
+
+RESULTS_VERSION = 1
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+FSYNC_POLICIES = {"always": FSYNC_ALWAYS, "group": FSYNC_GROUP, "never": FSYNC_NEVER}
+
+EMAILS = ["asha.rao@example.com", "m.kumar+jobs@mail.co.in", "not-an-email", "first.last@sub.domain.org",
+          "missing@tld", "UPPER.Case@Example.COM", "a@b.io", "spaces in@example.com"]
+PHONES = ["+1 555 123 4567", "(040) 2345-6789", "98765 43210", "12345", "+44 20 7946 0958",
+          "phone", "+91-98480-22338", "555-0100"]
+CANDIDATE = {
+    "full_name": "Asha Rao", "email": "asha.rao@example.com", "phone": "+1 555 123 4567",
+    "years_experience": "5", "desired_position": "Backend Engineer", "current_location": "Pune",
+    "tech_stack": ["Python", "SQL", "AWS"],
+}
+STACKS = [["Python", "Django", "PostgreSQL"], ["JavaScript", "React", "Node.js"], ["Java", "Spring", "AWS"],
+          ["Go", "Docker", "Kubernetes"], ["C++"], ["Rust", "SQL"], ["Ruby", "Rails", "Redis"],
+          ["TypeScript", "Angular", "GraphQL", "MongoDB"]]
+CONVERSATION = ["hi", "Asha Rao", "asha.rao@example", "asha.rao@example.com", "+1 555 123 4567", "5",
+                "Backend Engineer", "Pune", "Python, SQL, AWS", "repeat"] + \
+               ["I would profile first, then fix the hottest path and measure again."] * 10 + ["skip"] * 5
+
+
+def git_revision():
+    """(short commit, whether the working tree has uncommitted changes), or (None, None) outside git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def micro(function, inputs, min_time, repeat):
+    """Per-call time over a fixed input cycle.
+
+    The call count is calibrated so each repeat runs for at least
+    ``min_time`` seconds; timeit turns the garbage collector off while timing.
+    """
+    def run():
+        for value in calls:
+            function(value)
+
+    calls = inputs * 10
+    run()  # warm caches
+    number = len(calls) * max(1, int(min_time / max(timeit.Timer(run).timeit(number=1), 1e-9)) + 1)
+    calls = [inputs[i % len(inputs)] for i in range(number)]
+    per_call = [total / number for total in timeit.Timer(run).repeat(repeat=repeat, number=1)]
+    return {'unit': "us/call", 'median': statistics.median(per_call) * 1e6, 'best': min(per_call) * 1e6,
+            'ops_per_sec': 1 / statistics.median(per_call), 'calls': number, 'repeat': repeat, 'compare_on': "best"}
+
+
+def bench_conversations(count, repeat):
+    engine = ConversationEngine()
+    records = []
+    engine.on_complete = lambda session: records.append(build_candidate_record(session))
+
+    def run():
+        for _ in range(count):
+            session = engine.new_session()
+            for message in CONVERSATION:
+                engine.process(session, message)
+
+    run()
+    gc.collect()
+    totals = timeit.Timer(run).repeat(repeat=repeat, number=1)
+    assert len(records) == count * (repeat + 1), "every scripted conversation should complete"
+    per_conversation = [total / count for total in totals]
+    return {'unit': "us/conversation", 'median': statistics.median(per_conversation) * 1e6,
+            'best': min(per_conversation) * 1e6, 'turns_per_sec': count * len(CONVERSATION) / statistics.median(totals),
+            'turns': len(CONVERSATION), 'conversations': count, 'repeat': repeat, 'compare_on': "best"}
+
+
+def saved_record(rng):
+    record = dict(CANDIDATE, tech_stack=rng.choice(STACKS))
+    record['technical_answers'] = {tech: {f"Q{n}": {'question': f"{tech} question {n}", 'answer': "An answer."}
+                                          for n in range(1, 6)} for tech in record['tech_stack']}
+    record['timestamp'] = "2025-11-22T08:36:47.290103"
+    return mask_sensitive_data(record)
+
+
+def bench_saves(size, saves, fsync, rng):
+    """Latency of single saves to a JSONL store already holding ``size`` records"""
+    workdir = tempfile.mkdtemp(prefix="talentscout-suite-")
+    try:
+        path = os.path.join(workdir, "candidates.jsonl")
+        prefill = JsonlCandidateStore(path, fsync=FSYNC_NEVER)
+        chunk = [saved_record(rng) for _ in range(1000)]
+        for offset in range(0, size, len(chunk)):
+            prefill.append_many(chunk[:min(len(chunk), size - offset)])
+        prefill.close()
+
+        store = JsonlCandidateStore(path, fsync=FSYNC_POLICIES[fsync])
+        records = [saved_record(rng) for _ in range(saves)]
+        samples = []
+        for record in records:
+            start = time.perf_counter()
+            store.append(record)
+            samples.append(time.perf_counter() - start)
+        store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    ordered = sorted(samples)
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]  # noqa: E731
+    return {'unit': "us/save", 'median': pick(50) * 1e6, 'p99': pick(99) * 1e6, 'best': ordered[0] * 1e6,
+            'mean': statistics.mean(samples) * 1e6, 'stored': size, 'saves': saves, 'fsync': fsync,
+            'compare_on': "median"}
+
+
+def run_suite(args):
+    rng = random.Random(args.seed)
+    scale = 0.1 if args.quick else 1.0
+    min_time = 0.25 * scale
+    results = {}
+
+    def record(name, result):
+        results[name] = result
+        print(f"{name:<28} {result['median']:>12.2f} {result['unit']}", flush=True)
+
+    record("validate_email", micro(validate_email, EMAILS, min_time, args.repeat))
+    record("validate_phone", micro(validate_phone, PHONES, min_time, args.repeat))
+    record("mask_sensitive_data", micro(mask_sensitive_data, [CANDIDATE], min_time, args.repeat))
+    record("generate_tech_questions", micro(generate_tech_questions, STACKS, min_time, args.repeat))
+    record("conversation", bench_conversations(max(20, int(1500 * scale)), args.repeat))
+    for size in args.save_sizes:
+        record(f"save@{size}", bench_saves(size, args.saves, args.fsync, rng))
+    if not args.skip_imports:
+        for module in CORE_MODULES:
+            elapsed, _ = measure_import(module, args.repeat)
+            record(f"import:{module}", {'unit': "ms", 'median': elapsed, 'best': elapsed, 'compare_on': "best"})
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Print ratios against a previous run; returns the names that regressed beyond ``tolerance``.
+
+    Micro-benchmarks are compared on their best repeat, which is the least
+    disturbed by other load on the machine; saves on their median.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\ncompared with {baseline.get('commit') or baseline_path} ({baseline.get('created_at')})")
+    print(f"{'case':<28} {'before':>12} {'after':>12} {'change':>8}")
+    regressions = []
+    for name, result in results.items():
+        key = result.get('compare_on', "median")
+        before = baseline.get('results', {}).get(name, {}).get(key)
+        if not before:
+            continue
+        change = result[key] / before - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28} {before:>12.2f} {result[key]:>12.2f} {change:>+8.1%}{flag}  ({key})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer iterations and only the 1k and 10k stores")
+    parser.add_argument("--save-sizes", type=int, nargs="+", help="store sizes to time saves at")
+    parser.add_argument("--saves", type=int, default=200, help="timed saves per store size")
+    parser.add_argument("--fsync", default="group", choices=sorted(FSYNC_POLICIES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-imports", action="store_true")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="median slowdown counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+    if args.save_sizes is None:
+        args.save_sizes = [1000, 10000] if args.quick else [1000, 10000, 100000, 1000000]
+
+    commit, dirty = git_revision()
+    print(f"{'case':<28} {'median':>12}")
+    results = run_suite(args)
+    report = {
+        'version': RESULTS_VERSION,
+        'commit': commit, 'dirty': dirty,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'python': platform.python_version(), 'implementation': platform.python_implementation(),
+        'platform': platform.platform(), 'machine': platform.machine(), 'cpus': os.cpu_count(),
+        'parameters': {key: value for key, value in vars(args).items()
+                       if key not in ("output", "compare", "fail_on_regression")},
+        'results': results,
+    }
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{commit or 'unversioned'}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions and args.fail_on_regression:
+            print(f"\n{len(regressions)} case(s) slower than {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""Streaming bulk import and export of candidate records.
+
+Rows are read lazily, validated and masked in chunks (optionally across a
+process pool) and written to the candidate store in batches, so memory use
+stays flat however large the file is.
+
+Usage:
+    python bulk_io.py import ats_export.csv --rejects rejects.jsonl --workers 4
+    python bulk_io.py export screened.csv --tech Python --min-experience 5
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+from candidate_store import STORE_BACKENDS, SqliteCandidateStore, get_default_store
+from conversation_engine import REQUIRED_FIELDS
+from validators import validate_email, validate_phone, validate_years_experience, mask_sensitive_data
+
+CSV_FIELDS = list(REQUIRED_FIELDS) + ['technical_answers', 'timestamp']
+
+
+def detect_format(path: str, explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(stream: io.TextIOBase, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, raw record) pairs; undecodable JSON lines yield the error"""
+    if fmt == "csv":
+        for line_number, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_number, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce a CSV row or JSON object into the stored record shape"""
+    record = {key: value.strip() if isinstance(value, str) else value
+              for key, value in row.items() if key and value not in (None, "")}
+    tech_stack = record.get('tech_stack')
+    if isinstance(tech_stack, str):
+        separator = ";" if ";" in tech_stack else ","
+        record['tech_stack'] = [tech.strip() for tech in tech_stack.split(separator) if tech.strip()]
+    if 'tech_stack' in record and not (isinstance(record['tech_stack'], list) and
+                                       all(isinstance(tech, str) for tech in record['tech_stack'])):
+        raise ValueError("tech_stack must be a list of strings")
+    answers = record.get('technical_answers')
+    if isinstance(answers, str):
+        record['technical_answers'] = answers = json.loads(answers)
+    if answers is not None and not _valid_answers(answers):
+        raise ValueError("technical_answers must map technologies to {question key: {question, answer}}")
+    # JSON exports often carry numeric phones or experience; validators expect strings
+    for field in ('email', 'phone', 'years_experience'):
+        if field in record and not isinstance(record[field], str):
+            record[field] = str(record[field])
+    return record
+
+
+def _valid_answers(answers: Any) -> bool:
+    if not isinstance(answers, dict):
+        return False
+    for tech, tech_answers in answers.items():
+        if not isinstance(tech, str) or not isinstance(tech_answers, dict):
+            return False
+        for qa in tech_answers.values():
+            if not isinstance(qa, dict):
+                return False
+            if any(not isinstance(qa.get(key), str) for key in ('question', 'answer') if qa.get(key) is not None):
+                return False
+    return True
+
+
+def process_chunk(chunk: List[Tuple[int, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Validate and mask one chunk; returns (masked records, rejected rows with reasons)"""
+    accepted, rejected = [], []
+    append_accepted, append_rejected = accepted.append, rejected.append
+    for line_number, raw in chunk:
+        if isinstance(raw, Exception):
+            append_rejected({'line': line_number, 'reasons': [f"invalid JSON: {raw}"]})
+            continue
+        try:
+            record = normalize_row(raw)
+        except (ValueError, AttributeError) as e:
+            append_rejected({'line': line_number, 'reasons': [f"malformed row: {e}"], 'row': raw})
+            continue
+
+        reasons = [f"missing {field}" for field in REQUIRED_FIELDS if not record.get(field)]
+        if 'email' in record and not validate_email(record['email']):
+            reasons.append("invalid email")
+        if 'phone' in record and not validate_phone(record['phone']):
+            reasons.append("invalid phone")
+        if 'years_experience' in record and not validate_years_experience(record['years_experience']):
+            reasons.append("years_experience must be 0-50")
+        if reasons:
+            append_rejected({'line': line_number, 'reasons': reasons, 'row': raw})
+            continue
+
+        record.setdefault('technical_answers', {})
+        record.setdefault('timestamp', datetime.now().isoformat())
+        append_accepted(mask_sensitive_data(record))
+    return accepted, rejected
+
+
+def process_stream(chunks: Iterable[List], workers: int) -> Iterator[Tuple[List, List]]:
+    """Process chunks in order, keeping at most 2 * workers chunks in flight"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield process_chunk(chunk)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # multiprocessing is only needed with workers
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def open_store(backend: str = None, path: str = None):
+    if backend is None:
+        return get_default_store()
+    store_class, default_path = STORE_BACKENDS[backend]
+    return store_class(path or default_path)
+
+
+class Progress:
+    def __init__(self, label: str, interval: float = 2.0):
+        self.label = label
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.rows = 0
+
+    def add(self, rows: int):
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            print(f"{self.label}: {self.rows:,} rows ({self.rate():,.0f} rows/s)", file=sys.stderr)
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.start
+        return self.rows / elapsed if elapsed else 0.0
+
+
+def run_import(args) -> int:
+    fmt = detect_format(args.input, args.format)
+    store = open_store(args.store, args.store_path)
+    progress = Progress("import")
+    accepted_total = rejected_total = 0
+    rejects = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+    try:
+        with open(args.input, "r", encoding="utf-8", newline="") as stream:
+            chunks = chunked(read_records(stream, fmt), args.chunk_size)
+            for accepted, rejected in process_stream(chunks, args.workers):
+                if accepted:
+                    store.append_many(accepted)
+                if rejects is not None:
+                    for reject in rejected:
+                        rejects.write(json.dumps(reject, ensure_ascii=False, default=str) + "\n")
+                accepted_total += len(accepted)
+                rejected_total += len(rejected)
+                progress.add(len(accepted) + len(rejected))
+        store.flush()
+    finally:
+        if rejects is not None:
+            rejects.close()
+    print(f"imported {accepted_total:,} records, rejected {rejected_total:,} "
+          f"in {time.perf_counter() - progress.start:.2f}s ({progress.rate():,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+def run_export(args) -> int:
+    fmt = detect_format(args.output, args.format)
+    store = open_store(args.store, args.store_path)
+    filters = {key: value for key, value in (
+        ('technologies', args.tech), ('position', args.position), ('location', args.location),
+        ('min_experience', args.min_experience), ('max_experience', args.max_experience),
+        ('since', args.since), ('until', args.until)) if value is not None}
+    if filters and not isinstance(store, SqliteCandidateStore):
+        print("filters require the sqlite store", file=sys.stderr)
+        return 2
+    records = store.query(**filters) if filters else store.iter_records()
+
+    progress = Progress("export")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(output, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for record in records:
+                row = dict(record)
+                row['tech_stack'] = ", ".join(record.get('tech_stack') or [])
+                row['technical_answers'] = json.dumps(record.get('technical_answers') or {}, ensure_ascii=False)
+                writer.writerow(row)
+                progress.add(1)
+        else:
+            for record in records:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                progress.add(1)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"exported {progress.rows:,} records ({progress.rate():,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", choices=sorted(STORE_BACKENDS),
+                        help="store backend (default: TALENTSCOUT_STORE)")
+    parser.add_argument("--store-path", help="store location (default: the backend's default file)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="validate, mask and store candidate rows")
+    import_parser.add_argument("input", help="CSV or JSONL file")
+    import_parser.add_argument("--format", choices=["csv", "jsonl"])
+    import_parser.add_argument("--rejects", help="write rejected rows and reasons to this JSONL file")
+    import_parser.add_argument("--chunk-size", type=int, default=5000)
+    import_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                               help="processes validating and masking chunks (1 disables the pool)")
+
+    export_parser = commands.add_parser("export", help="stream stored candidates to a file")
+    export_parser.add_argument("output", help="CSV or JSONL file, or - for stdout")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"])
+    export_parser.add_argument("--tech", action="append", help="required technology (repeatable)")
+    export_parser.add_argument("--position")
+    export_parser.add_argument("--location")
+    export_parser.add_argument("--min-experience", type=int)
+    export_parser.add_argument("--max-experience", type=int)
+    export_parser.add_argument("--since", help="ISO timestamp lower bound")
+    export_parser.add_argument("--until", help="ISO timestamp upper bound")
+
+    args = parser.parse_args(argv)
+    return run_import(args) if args.command == "import" else run_export(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
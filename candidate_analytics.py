@@ -0,0 +1,317 @@
+"""Materialized candidate aggregates, maintained as records are saved.
+
+Usage:
+    python candidate_analytics.py            # catch up with the store and print a summary
+    python candidate_analytics.py --rebuild  # recompute from every stored record
+"""
+import argparse
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from candidate_store import normalize_technology
+from question_bank import get_question_bank, normalize_key
+
+# (label, lowest years) in ascending order
+EXPERIENCE_BANDS = (("0-1", 0), ("2-4", 2), ("5-9", 5), ("10-14", 10), ("15+", 15))
+DIMENSIONS = ('technology', 'position', 'location', 'experience')
+ALL_TIME = "all"
+AGGREGATES_VERSION = 3
+
+
+def experience_band(value: Any) -> str:
+    try:
+        years = int(str(value).strip())
+    except (TypeError, ValueError):
+        return "unknown"
+    band = EXPERIENCE_BANDS[0][0]
+    for label, lowest in EXPERIENCE_BANDS:
+        if years >= lowest:
+            band = label
+    return band
+
+
+def week_of(timestamp: Optional[str]) -> str:
+    """ISO week such as ``2025-W47``, or "unknown" for missing timestamps"""
+    try:
+        year, week, _ = datetime.fromisoformat(timestamp).isocalendar()
+    except (TypeError, ValueError):
+        return "unknown"
+    return f"{year}-W{week:02d}"
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {'candidates': 0, **{dimension: {} for dimension in DIMENSIONS}}
+
+
+def _increment(counts: Dict[str, int], key: str, amount: int = 1):
+    counts[key] = counts.get(key, 0) + amount
+
+
+class CandidateAggregates:
+    """Counters over saved candidates that only ever need the new records.
+
+    Per ISO week and all time: candidates by technology, position, location
+    and experience band. All time: per technology, how many candidates listed
+    it and how many answered every question they were given; per technology
+    question number, how often it was answered or skipped and the total
+    answer length. ``position`` is the store position of the last record
+    folded in, so ``sync`` only reads what was saved after the last persist.
+    """
+
+    def __init__(self, path: Optional[str] = None, persist_interval: float = 1.0):
+        self.path = path
+        self.persist_interval = persist_interval
+        self._lock = threading.Lock()
+        self._persist_lock = threading.Lock()
+        self._dirty = False
+        self._last_persist = 0.0
+        self._pending: Optional[list] = None
+        self.reset()
+
+    def reset(self):
+        self.records = 0
+        self.position: Any = None
+        self.weeks: Dict[str, Dict[str, Any]] = {ALL_TIME: _empty_bucket()}
+        self.completion: Dict[str, Dict[str, int]] = {}
+        self.questions: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.updated_at: Optional[str] = None
+
+    # -- updating ----------------------------------------------------------
+
+    def _add(self, record: Dict[str, Any], bank):
+        stack = []
+        for tech in record.get('tech_stack') or ():
+            canonical = normalize_technology(tech)
+            if canonical not in stack:
+                stack.append(canonical)
+        values = {
+            'position': normalize_key(str(record.get('desired_position') or "")) or "unknown",
+            'location': normalize_key(str(record.get('current_location') or "")) or "unknown",
+            'experience': experience_band(record.get('years_experience')),
+        }
+        for week in (ALL_TIME, week_of(record.get('timestamp'))):
+            bucket = self.weeks.get(week)
+            if bucket is None:
+                bucket = self.weeks[week] = _empty_bucket()
+            bucket['candidates'] += 1
+            for tech in stack:
+                _increment(bucket['technology'], tech)
+            for dimension, value in values.items():
+                _increment(bucket[dimension], value)
+
+        answered = {normalize_technology(tech): len(answers)
+                    for tech, answers in (record.get('technical_answers') or {}).items()}
+        # Older records do not say how many questions they were given; assume the templates
+        totals = {normalize_technology(tech): count
+                  for tech, count in (record.get('technical_questions') or {}).items()}
+        for tech in stack:
+            completion = self.completion.setdefault(tech, {'asked': 0, 'completed': 0})
+            completion['asked'] += 1
+            total = totals.get(tech)
+            if total is None:
+                total = len(bank.questions_for(tech))
+            if answered.get(tech, 0) >= total:
+                completion['completed'] += 1
+
+        for tech, answers in (record.get('technical_answers') or {}).items():
+            canonical = normalize_technology(tech)
+            questions = self.questions.setdefault(canonical, {})
+            for question_key, qa in answers.items():
+                stats = questions.setdefault(question_key, {'answered': 0, 'skipped': 0, 'answer_chars': 0})
+                if qa.get('skipped') or not qa.get('answer'):
+                    stats['skipped'] += 1
+                else:
+                    stats['answered'] += 1
+                    stats['answer_chars'] += len(qa['answer'])
+        self.records += 1
+
+    def add_records(self, records: List[Dict[str, Any]], position: Any = None):
+        """Fold newly saved records in (the store listener).
+
+        ``position`` is the store position just past the batch. Batches that
+        arrive while ``sync`` is reading are held back until it finishes, then
+        folded in unless the sync already covered them.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((records, position))
+                return
+            self._fold(records, position)
+            due = time.monotonic() - self._last_persist >= self.persist_interval
+        if due:
+            self.persist()
+
+    def _fold(self, records: List[Dict[str, Any]], position: Any):
+        bank = get_question_bank()
+        for record in records:
+            self._add(record, bank)
+        if position is not None:
+            self.position = position
+        self.updated_at = datetime.now().isoformat(timespec="seconds")
+        self._dirty = True
+
+    def sync(self, store, batch_size: int = 10000) -> int:
+        """Fold in records stored after ``position``; returns how many.
+
+        Raises ValueError if the store no longer has that position, in which
+        case only ``rebuild`` can recover.
+        """
+        return self._sync(store, batch_size)
+
+    def _sync(self, store, batch_size: int, reset: bool = False) -> int:
+        with self._lock:
+            if reset:
+                self.reset()
+            self._pending = []
+        added = 0
+        batch = []
+        try:
+            for record, position in store.iter_after(self.position):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    with self._lock:
+                        self._fold(batch, position)
+                    added += len(batch)
+                    batch = []
+            if batch:
+                with self._lock:
+                    self._fold(batch, position)
+                added += len(batch)
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, None
+                for records, position in pending:
+                    if self.position is None or position > self.position:
+                        self._fold(records, position)
+                        added += len(records)
+        return added
+
+    def rebuild(self, store) -> int:
+        """Recompute everything from the store"""
+        count = self._sync(store, 10000, reset=True)
+        self.persist()
+        return count
+
+    def attach(self, store):
+        store.add_listener(self.add_records, with_position=True)
+        atexit.register(self.persist)
+
+    # -- persistence -------------------------------------------------------
+
+    def _serialize(self) -> str:
+        return json.dumps({
+            'version': AGGREGATES_VERSION, 'records': self.records, 'position': self.position,
+            'updated_at': self.updated_at,
+            'weeks': self.weeks, 'completion': self.completion, 'questions': self.questions,
+        }, ensure_ascii=False, separators=(",", ":"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Consistent copy of the aggregates; its size does not depend on the candidate count"""
+        with self._lock:
+            return json.loads(self._serialize())
+
+    def persist(self):
+        """Write the aggregates next to the store (temp file plus rename)"""
+        if self.path is None:
+            return
+        with self._persist_lock:
+            with self._lock:
+                if not self._dirty and os.path.exists(self.path):
+                    return
+                payload = self._serialize()
+                self._dirty = False
+                self._last_persist = time.monotonic()
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-aggregates-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+
+    @classmethod
+    def load(cls, path: str, persist_interval: float = 1.0) -> "CandidateAggregates":
+        """Aggregates persisted at ``path``, or empty ones if it is missing or stale"""
+        aggregates = cls(path, persist_interval)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return aggregates
+        if data.get('version') != AGGREGATES_VERSION:
+            return aggregates
+        aggregates.records = data['records']
+        aggregates.position = data['position']
+        aggregates.updated_at = data.get('updated_at')
+        aggregates.weeks = data['weeks']
+        aggregates.completion = data['completion']
+        aggregates.questions = data['questions']
+        return aggregates
+
+
+def aggregates_path(store) -> str:
+    return os.path.abspath(store.path) + ".aggregates.json"
+
+
+_default_aggregates = None
+_default_aggregates_lock = threading.Lock()
+
+
+def get_default_aggregates() -> CandidateAggregates:
+    """Aggregates over the default store, updated on every save"""
+    global _default_aggregates
+    with _default_aggregates_lock:
+        if _default_aggregates is None:
+            from candidate_store import get_default_store
+            store = get_default_store()
+            aggregates = CandidateAggregates.load(aggregates_path(store))
+            # Attach first so no save lands between the catch-up and the listener
+            aggregates.attach(store)
+            try:
+                aggregates.sync(store)
+            except ValueError:
+                aggregates.rebuild(store)  # the store was replaced, truncated or compacted
+            _default_aggregates = aggregates
+        return _default_aggregates
+
+
+def main(argv=None):
+    from candidate_store import get_default_store
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="recompute from every stored record")
+    args = parser.parse_args(argv)
+
+    store = get_default_store()
+    aggregates = CandidateAggregates.load(aggregates_path(store))
+    start = time.perf_counter()
+    folded = None
+    if not args.rebuild:
+        try:
+            folded = aggregates.sync(store)
+            aggregates.persist()
+        except ValueError:
+            pass  # the store was replaced, truncated or compacted
+    if folded is None:
+        folded = aggregates.rebuild(store)
+    print(f"folded in {folded:,} records in {time.perf_counter() - start:.2f}s; "
+          f"{aggregates.records:,} total -> {aggregates.path}")
+    overall = aggregates.weeks[ALL_TIME]
+    for dimension in DIMENSIONS:
+        top = sorted(overall[dimension].items(), key=lambda item: -item[1])[:5]
+        print(f"  {dimension:<11} " + ", ".join(f"{value} ({count})" for value, count in top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""Near-duplicate candidate detection with MinHash signatures and an LSH index.
+
+Emails and phones are masked before storage, so records are compared by a
+fingerprint of name, masked email/phone shape, position, location, tech
+stack and answer text instead of exact identifiers.
+
+Usage:
+    python candidate_dedup.py                  # cluster the whole store
+    python candidate_dedup.py --threshold 0.7 --json
+"""
+import argparse
+import json
+import logging
+import threading
+import zlib
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from candidate_store import follow, normalize_technology
+from question_bank import normalize_key
+from validators import mask_sensitive_data
+
+logger = logging.getLogger(__name__)
+
+MAX_ANSWER_WORDS = 32
+MIN_ANSWER_WORD_LENGTH = 4
+SMALL_BATCH_FEATURES = 4096
+
+_BAND_PRIME = np.uint64(0x100000001B3)
+
+
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8"))
+
+
+def record_shingles(record: Dict[str, Any]) -> List[int]:
+    """Hashed features of a record; duplicates share most of them.
+
+    The name contributes character trigrams so typos only cost a few
+    features; answers contribute their first distinct longer words.
+    """
+    features = set()
+    name = " ".join(normalize_key(record.get('full_name') or "").split())
+    if name:
+        padded = f"  {name} "
+        features.update("n:" + padded[i:i + 3] for i in range(len(padded) - 2))
+
+    # Masking is idempotent, so already-masked stored records are unchanged
+    masked = mask_sensitive_data({key: str(record[key]) for key in ('email', 'phone') if record.get(key)})
+    email = masked.get('email', "").lower()
+    if "@" in email:
+        user, domain = email.rsplit("@", 1)
+        features.add(f"e:{user[:1]}{user[-1:]}{len(user)}@{domain}")
+        features.add(f"d:{domain}")
+    phone = masked.get('phone', "")
+    if phone:
+        features.add(f"p:{phone[-4:]}:{len(phone)}")
+
+    for key, prefix in (('desired_position', "r:"), ('current_location', "l:"), ('years_experience', "y:")):
+        value = normalize_key(str(record.get(key) or ""))
+        if value:
+            features.add(prefix + value)
+    features.update("t:" + normalize_technology(tech) for tech in record.get('tech_stack') or ())
+
+    features.update("a:" + word for word in answer_words(record))
+    return [_hash(feature) for feature in features]
+
+
+def answer_words(record: Dict[str, Any]) -> List[str]:
+    """First ``MAX_ANSWER_WORDS`` distinct answer words, across all answers"""
+    words = []
+    for answers in (record.get('technical_answers') or {}).values():
+        for qa in answers.values():
+            for word in (qa.get('answer') or "").lower().split():
+                word = word.strip(".,;:!?()\"'")
+                if len(word) >= MIN_ANSWER_WORD_LENGTH and word not in words:
+                    words.append(word)
+                    if len(words) >= MAX_ANSWER_WORDS:
+                        return words
+    return words
+
+
+class MinHasher:
+    """MinHash over 32-bit feature hashes using multiply-shift hash functions"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets: List[List[int]]) -> np.ndarray:
+        """(records x num_perm) uint32 signatures; empty sets get all-max rows"""
+        signatures = np.full((len(shingle_sets), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        lengths = np.fromiter(map(len, shingle_sets), dtype=np.int64, count=len(shingle_sets))
+        nonempty = np.flatnonzero(lengths)
+        if not len(nonempty):
+            return signatures
+        values = np.fromiter((value for shingles in shingle_sets for value in shingles),
+                             dtype=np.uint64, count=int(lengths.sum()))
+        starts = np.concatenate(([0], np.cumsum(lengths[nonempty])[:-1]))
+        shift = np.uint64(32)
+        if len(values) <= SMALL_BATCH_FEATURES:
+            # (a * x + b) mod 2**64, high 32 bits: one hash per (feature, permutation)
+            hashed = (values[:, None] * self._a + self._b) >> shift
+            signatures[nonempty] = np.minimum.reduceat(hashed, starts, axis=0)
+            return signatures
+        # Large batches go one permutation at a time, which keeps the working
+        # set small and the per-record minimum a 1-D reduceat
+        for permutation, (a, b) in enumerate(zip(self._a, self._b)):
+            hashed = (values * a + b) >> shift
+            signatures[nonempty, permutation] = np.minimum.reduceat(hashed, starts)
+        return signatures
+
+
+class DuplicateIndex:
+    """LSH index of candidate MinHash signatures.
+
+    Signatures are split into ``bands`` bands; records sharing any band key
+    are candidates, and candidates whose estimated Jaccard similarity
+    (share of equal signature slots) reaches ``threshold`` are duplicates.
+    Band keys live in one sorted array searched with ``np.searchsorted``
+    plus a small dict of recent inserts that is merged in once it grows past
+    ``merge_fraction`` of the array, so a lookup costs O(bands * log n)
+    whatever the store size.
+
+    ``add_records`` looks each record up before indexing it and remembers
+    its matches; ``attach`` does so for every record saved to a store.
+    ``clusters`` groups everything indexed in one vectorized pass.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.6,
+                 merge_fraction: float = 0.1, min_merge: int = 4096, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.merge_fraction = merge_fraction
+        self.min_merge = min_merge
+        self._lock = threading.Lock()
+        self._size = 0
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._band_keys = np.zeros((0, bands), dtype=np.uint64)
+        self._sorted_keys = np.zeros(0, dtype=np.uint64)
+        self._sorted_ids = np.zeros(0, dtype=np.int64)
+        self._recent: Dict[int, List[int]] = {}
+        self._recent_count = 0
+        self._unmerged = False  # bulk inserts not yet in the sorted array
+        self.labels: List[str] = []
+        self.matches: Dict[int, List[Tuple[int, float]]] = {}
+
+    def __len__(self):
+        return self._size
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """(records x bands) uint64 keys, salted per band so bands never collide"""
+        banded = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        keys = np.broadcast_to(np.arange(1, self.bands + 1, dtype=np.uint64), banded.shape[:2]).copy()
+        with np.errstate(over="ignore"):
+            for row in range(self.rows):
+                keys = (keys ^ banded[:, :, row]) * _BAND_PRIME
+        return keys
+
+    # -- lookup ------------------------------------------------------------
+
+    def _candidates(self, keys: np.ndarray) -> np.ndarray:
+        if self._unmerged:
+            self._merge_recent()
+        lo = np.searchsorted(self._sorted_keys, keys, side="left")
+        hi = np.searchsorted(self._sorted_keys, keys, side="right")
+        found = [self._sorted_ids[start:end] for start, end in zip(lo, hi) if end > start]
+        for key in keys.tolist():
+            recent = self._recent.get(key)
+            if recent:
+                found.append(np.asarray(recent, dtype=np.int64))
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def _similar(self, signature: np.ndarray, keys: np.ndarray, exclude: int = -1) -> List[Tuple[int, float]]:
+        candidates = self._candidates(keys)
+        candidates = candidates[candidates != exclude]
+        if not len(candidates):
+            return []
+        similarity = (self._signatures[candidates] == signature).mean(axis=1)
+        keep = similarity >= self.threshold
+        order = np.argsort(-similarity[keep], kind="stable")
+        return [(int(candidate), round(float(score), 3))
+                for candidate, score in zip(candidates[keep][order], similarity[keep][order])]
+
+    def query(self, record: Dict[str, Any]) -> List[Tuple[int, float]]:
+        """(index id, estimated similarity) of indexed near-duplicates, best first"""
+        signature = self.hasher.signatures([record_shingles(record)])
+        keys = self.band_keys(signature)[0]
+        with self._lock:
+            return self._similar(signature[0], keys)
+
+    # -- indexing ----------------------------------------------------------
+
+    def _grow(self, extra: int):
+        needed = self._size + extra
+        if needed <= len(self._signatures):
+            return
+        capacity = max(needed, 2 * len(self._signatures), 1024)
+        for name in ('_signatures', '_band_keys'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, old.shape[1]), dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _merge_recent(self):
+        """Fold recent inserts into the sorted key array"""
+        keys = self._band_keys[:self._size].ravel()
+        order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[order]
+        self._sorted_ids = order // self.bands
+        self._recent = {}
+        self._recent_count = 0
+        self._unmerged = False
+
+    def add_records(self, records: List[Dict[str, Any]], check: bool = True) -> List[List[Tuple[int, float]]]:
+        """Index records (looking each up first when ``check``); returns their matches"""
+        if not records:
+            return []
+        signatures = self.hasher.signatures([record_shingles(record) for record in records])
+        keys = self.band_keys(signatures)
+        labels = [f"{record.get('full_name') or ''} {record.get('timestamp') or ''}".strip() for record in records]
+        results = []
+        with self._lock:
+            self._grow(len(records))
+            if not check and len(records) >= self.min_merge:
+                # Bulk load: the sorted array is rebuilt once, at the next lookup
+                self._signatures[self._size:self._size + len(records)] = signatures
+                self._band_keys[self._size:self._size + len(records)] = keys
+                self._size += len(records)
+                self.labels.extend(labels)
+                self._unmerged = True
+                return []
+            for offset in range(len(records)):
+                record_id = self._size
+                self._signatures[record_id] = signatures[offset]
+                self._band_keys[record_id] = keys[offset]
+                self._size += 1
+                self.labels.append(labels[offset])
+                if check:
+                    found = self._similar(signatures[offset], keys[offset], exclude=record_id)
+                    if found:
+                        self.matches[record_id] = found
+                        logger.info("Candidate #%d (%s) looks like %s", record_id, self.labels[record_id],
+                                    ", ".join(f"#{match} ({score:.2f})" for match, score in found))
+                    results.append(found)
+                for key in keys[offset].tolist():
+                    self._recent.setdefault(key, []).append(record_id)
+                self._recent_count += 1
+            if self._recent_count >= max(self.min_merge, self.merge_fraction * len(self._sorted_ids) / self.bands):
+                self._merge_recent()
+        return results
+
+    def attach(self, store):
+        """Look up and index every record saved to ``store`` from now on"""
+        store.add_listener(self.add_records)
+
+    def load_store(self, store, batch_size: int = 10000):
+        """Index every record already in ``store`` without per-record lookups"""
+        batch = []
+        for record in store.iter_records():
+            batch.append(record)
+            if len(batch) >= batch_size:
+                self.add_records(batch, check=False)
+                batch = []
+        if batch:
+            self.add_records(batch, check=False)
+
+    def follow(self, store, batch_size: int = 10000) -> int:
+        """Index every record in ``store``, then look up each one saved, missing none in between"""
+        return follow(store, lambda batch: self.add_records(batch, check=False), self.add_records, batch_size)
+
+    # -- batch clustering --------------------------------------------------
+
+    def clusters(self, chunk_size: int = 1 << 20) -> List[List[int]]:
+        """Groups of two or more near-duplicate records across the whole index.
+
+        Each band bucket is linked to its first member whenever their
+        estimated similarity reaches the threshold; connected components of
+        those links are the clusters.
+        """
+        with self._lock:
+            count = self._size
+            keys = self._band_keys[:count].ravel()
+            signatures = self._signatures[:count]
+        if count < 2:
+            return []
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        ids = order // self.bands
+        bucket_start = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+        leaders = ids[np.maximum.accumulate(np.where(bucket_start, np.arange(len(ids)), 0))]
+        linked = leaders != ids
+
+        left, right = leaders[linked], ids[linked]
+        pairs = np.unique(np.stack((np.minimum(left, right), np.maximum(left, right)), axis=1), axis=0)
+        verified = []
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            similarity = (signatures[chunk[:, 0]] == signatures[chunk[:, 1]]).mean(axis=1)
+            verified.append(chunk[similarity >= self.threshold])
+        pairs = np.concatenate(verified) if verified else np.zeros((0, 2), dtype=np.int64)
+
+        parent = list(range(count))
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for first, second in pairs.tolist():
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second:
+                parent[max(root_first, root_second)] = min(root_first, root_second)
+
+        groups: Dict[int, List[int]] = {}
+        for node in np.unique(pairs).tolist():
+            groups.setdefault(find(node), []).append(node)
+        return sorted((sorted(members) for members in groups.values()), key=lambda members: members[0])
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_index(threshold: Optional[float] = None) -> DuplicateIndex:
+    """Index over the default store, checking each candidate as it is saved"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            from candidate_store import get_default_store
+            store = get_default_store()
+            index = DuplicateIndex() if threshold is None else DuplicateIndex(threshold=threshold)
+            index.follow(store)
+            _default_index = index
+        return _default_index
+
+
+def main(argv=None):
+    from candidate_store import get_default_store
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threshold", type=float, default=0.6, help="minimum estimated Jaccard similarity")
+    parser.add_argument("--json", action="store_true", help="print clusters as JSON")
+    args = parser.parse_args(argv)
+
+    index = DuplicateIndex(threshold=args.threshold)
+    index.load_store(get_default_store())
+    clusters = index.clusters()
+    if args.json:
+        print(json.dumps([[{'id': member, 'label': index.labels[member]} for member in cluster]
+                          for cluster in clusters], indent=2))
+        return
+    print(f"{len(clusters)} duplicate clusters among {len(index):,} records")
+    for cluster in clusters:
+        print("  " + " | ".join(f"#{member} {index.labels[member]}" for member in cluster))
+
+
+if __name__ == "__main__":
+    main()
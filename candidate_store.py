@@ -0,0 +1,765 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from question_bank import get_question_bank, normalize_key
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FSYNC_ALWAYS = "always"
+FSYNC_GROUP = "group"
+FSYNC_NEVER = "never"
+
+
+class CandidateStore:
+    """Listener plumbing shared by the store backends.
+
+    Listeners are called with each batch of records after it is stored, so
+    derived data (scores, aggregates) can be maintained incrementally. With
+    ``with_position`` they also get the store position just past the batch,
+    the value ``iter_after`` accepts to resume reading after it.
+    """
+
+    def add_listener(self, callback: Callable[..., None], with_position: bool = False):
+        self._listeners.append((callback, with_position))
+
+    def remove_listener(self, callback: Callable[..., None]):
+        self._listeners = [listener for listener in self._listeners if listener[0] != callback]
+
+    def _notify(self, records: List[Dict[str, Any]], position: Any):
+        for callback, with_position in list(self._listeners):
+            try:
+                if with_position:
+                    callback(records, position)
+                else:
+                    callback(records)
+            except Exception:
+                # The records are already stored; a listener must not fail the save
+                logger.exception("Candidate store listener %r failed", callback)
+
+
+class JsonlCandidateStore(CandidateStore):
+    """Append-only, line-delimited candidate log split into segments.
+
+    The active file (``path``) only ever receives whole-line appends. When it
+    grows past ``max_segment_bytes`` it is atomically renamed to a sealed
+    segment ``<path>.<first>-<last>``. ``compact()`` merges sealed segments
+    into one, and a torn trailing line left by a crash is skipped on read.
+    Appends hold an flock on the active file; whenever it changed since this
+    handle's last write, a torn last line is trimmed before appending.
+    A position is ``[first, last, byte offset]`` in the segment covering
+    ``first``-``last``; the active file counts as the segment it will be
+    sealed as.
+    """
+
+    def __init__(self, path: str = "simulated_candidates.jsonl",
+                 fsync: str = FSYNC_GROUP,
+                 group_commit_size: int = 32,
+                 group_commit_interval: float = 0.05,
+                 max_segment_bytes: int = 64 * 1024 * 1024):
+        if fsync not in (FSYNC_ALWAYS, FSYNC_GROUP, FSYNC_NEVER):
+            raise ValueError(f"Unknown fsync mode: {fsync}")
+        self.path = os.path.abspath(path)
+        self.fsync = fsync
+        self.group_commit_size = group_commit_size
+        self.group_commit_interval = group_commit_interval
+        self.max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._listeners: List[Callable] = []
+        self._fd: Optional[int] = None
+        self._written: Optional[Tuple[int, int]] = None
+        self._active_segment = 1
+        self._pending_syncs = 0
+        self._last_sync = time.monotonic()
+        self._segment_re = re.compile(re.escape(os.path.basename(self.path)) + r"\.(\d{6})-(\d{6})$")
+
+    # -- writing -----------------------------------------------------------
+
+    def _open(self) -> int:
+        if self._fd is not None:
+            # Another process may have sealed the file we hold open
+            try:
+                if os.fstat(self._fd).st_ino == os.stat(self.path).st_ino:
+                    return self._fd
+            except FileNotFoundError:
+                pass
+            os.close(self._fd)
+            self._fd = None
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._directory_lock():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._written = None
+            segments = self._sealed_segments()
+            self._active_segment = segments[-1][1] + 1 if segments else 1
+        return self._fd
+
+    @staticmethod
+    def _truncate_torn_tail(fd: int) -> int:
+        """Drop a partial last line left by a crash so new appends stay parseable; returns the size"""
+        size = os.fstat(fd).st_size
+        end = size
+        while end > 0:
+            start = max(0, end - 4096)
+            chunk = os.pread(fd, end - start, start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            os.ftruncate(fd, end)
+        return end
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def append(self, record: Dict[str, Any]):
+        """Append one candidate record"""
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]]):
+        """Append several records with a single write (one group commit)"""
+        records = list(records)
+        if not records:
+            return
+        payload = b"".join(self._encode(record) for record in records)
+        with self._lock:
+            fd = self._open()
+            with _FileLock(fd=fd):
+                stat = os.fstat(fd)
+                start = stat.st_size
+                if (stat.st_ino, start) != self._written:
+                    # Another writer (or a crash) touched the file since our last append
+                    start = self._truncate_torn_tail(fd)
+                try:
+                    self._write_all(fd, payload)
+                    self._pending_syncs += 1
+                    self._maybe_sync(fd)
+                except OSError:
+                    # ENOSPC/EIO part way through: drop the partial batch so a retry cannot duplicate records
+                    os.ftruncate(fd, start)
+                    raise
+                size = os.fstat(fd).st_size
+                self._written = (stat.st_ino, size)
+            position = [self._active_segment, self._active_segment, size]
+            if size >= self.max_segment_bytes:
+                self._rotate()
+        self._notify(records, position)
+
+    @staticmethod
+    def _write_all(fd: int, payload: bytes):
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+    def _maybe_sync(self, fd: int):
+        if self.fsync == FSYNC_ALWAYS:
+            self._sync(fd)
+        elif self.fsync == FSYNC_GROUP:
+            if (self._pending_syncs >= self.group_commit_size or
+                    time.monotonic() - self._last_sync >= self.group_commit_interval):
+                self._sync(fd)
+
+    def _sync(self, fd: int):
+        os.fsync(fd)
+        self._pending_syncs = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self):
+        """Force pending appends to disk"""
+        with self._lock:
+            if self._fd is not None and self._pending_syncs:
+                self._sync(self._fd)
+
+    def close(self):
+        """Flush and close the active segment"""
+        with self._lock:
+            if self._fd is not None:
+                if self._pending_syncs and self.fsync != FSYNC_NEVER:
+                    self._sync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+
+    # -- segments ----------------------------------------------------------
+
+    def _directory_lock(self):
+        """Cross-process lock guarding rotation and compaction"""
+        return _FileLock(self.path + ".lock")
+
+    def _rotate(self):
+        """Seal the active file as the next numbered segment (lock held)"""
+        if self._fd is not None:
+            if self.fsync != FSYNC_NEVER:
+                self._sync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        with self._directory_lock():
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                return
+            segments = self._sealed_segments()
+            number = segments[-1][1] + 1 if segments else 1
+            os.replace(self.path, self._segment_path(number, number))
+            _fsync_dir(os.path.dirname(self.path))
+
+    def rotate(self):
+        """Seal the active file regardless of its size"""
+        with self._lock:
+            self._rotate()
+
+    def _segment_path(self, first: int, last: int) -> str:
+        return f"{self.path}.{first:06d}-{last:06d}"
+
+    def _sealed_segments(self) -> List[Tuple[int, int, str]]:
+        """Sealed segments in order, discarding ones a compaction already covers"""
+        directory = os.path.dirname(self.path)
+        found = []
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                match = self._segment_re.match(name)
+                if match:
+                    found.append((int(match.group(1)), int(match.group(2)), os.path.join(directory, name)))
+        found.sort(key=lambda seg: (seg[0], -seg[1]))
+
+        segments = []
+        for first, last, path in found:
+            if segments and last <= segments[-1][1]:
+                # Left behind by a compaction that crashed before cleanup
+                _remove_quietly(path)
+                continue
+            segments.append((first, last, path))
+        return segments
+
+    def segment_paths(self) -> List[str]:
+        """Sealed segment files followed by the active file"""
+        paths = [path for _, _, path in self._sealed_segments()]
+        if os.path.exists(self.path):
+            paths.append(self.path)
+        return paths
+
+    def compact(self) -> int:
+        """Merge all sealed segments into one, dropping torn lines.
+
+        The merged file is written to a temp file, fsynced and renamed to a
+        segment whose range covers the inputs before the inputs are removed,
+        so a crash at any point leaves each record readable exactly once.
+        Returns the number of records in the compacted segment.
+        """
+        with self._lock, self._directory_lock():
+            segments = self._sealed_segments()
+            if len(segments) < 2:
+                return sum(1 for _ in self._iter_files([s[2] for s in segments]))
+
+            first, last = segments[0][0], segments[-1][1]
+            target = self._segment_path(first, last)
+            tmp_path = target + ".tmp"
+            count = 0
+            with open(tmp_path, "wb") as out:
+                for record in self._iter_files([s[2] for s in segments]):
+                    out.write(self._encode(record))
+                    count += 1
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp_path, target)
+            _fsync_dir(os.path.dirname(self.path))
+
+            for _, _, path in segments:
+                _remove_quietly(path)
+            return count
+
+    # -- reading -----------------------------------------------------------
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_records()
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Stream every stored record, oldest first"""
+        return self._iter_files(self.segment_paths())
+
+    def iter_after(self, position: Optional[List[int]] = None) -> Iterator[Tuple[Dict[str, Any], List[int]]]:
+        """Stream (record, position) pairs for the records stored after ``position``.
+
+        Only the files at or past the position are read. Raises ValueError if
+        the position is not in this store any more (the store was replaced or
+        truncated, or ``compact()`` merged the segment it points into).
+        """
+        first_wanted, last_wanted, offset = position if position is not None else (0, 0, 0)
+        files = []
+        try:
+            with self._directory_lock():
+                # Open everything before reading, so a concurrent rotation or
+                # compaction cannot renumber the segments under us
+                segments = self._sealed_segments()
+                active = segments[-1][1] + 1 if segments else 1
+                if first_wanted > active:
+                    raise ValueError(f"position {position} is past the end of {self.path}")
+                for first, last, path in segments + [(active, active, self.path)]:
+                    if last < first_wanted:
+                        continue
+                    start = offset if (first, last) == (first_wanted, last_wanted) else 0
+                    if first < first_wanted or (first == first_wanted and offset and not start):
+                        raise ValueError(f"position {position} was compacted into {path}")
+                    try:
+                        f = open(path, "rb")
+                    except FileNotFoundError:
+                        f = None
+                    if f is not None:
+                        files.append((first, last, f, start))
+                    if start > (os.fstat(f.fileno()).st_size if f is not None else 0):
+                        raise ValueError(f"position {position} is past the end of {path}")
+        except BaseException:
+            for _, _, f, _ in files:
+                f.close()
+            raise
+        return self._iter_after_files(files)
+
+    @staticmethod
+    def _iter_after_files(files) -> Iterator[Tuple[Dict[str, Any], List[int]]]:
+        try:
+            for first, last, f, offset in files:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write from a crash
+                    offset += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    yield record, [first, last, offset]
+        finally:
+            for _, _, f, _ in files:
+                f.close()
+
+    @staticmethod
+    def _iter_files(paths: List[str]) -> Iterator[Dict[str, Any]]:
+        for path in paths:
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write from a crash
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def count(self) -> int:
+        """Number of readable records"""
+        return sum(1 for _ in self.iter_records())
+
+
+class SqliteCandidateStore(CandidateStore):
+    """SQLite (WAL mode) candidate store with indexed lookups.
+
+    Each record is kept verbatim as JSON, with its searchable fields, tech
+    stack entries and technical answers normalized into indexed tables.
+    Connections are opened per thread, so Streamlit sessions can save and
+    query concurrently.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS candidates (
+            id INTEGER PRIMARY KEY,
+            full_name TEXT,
+            email TEXT,
+            phone TEXT,
+            years_experience INTEGER,
+            desired_position TEXT COLLATE NOCASE,
+            current_location TEXT COLLATE NOCASE,
+            timestamp TEXT,
+            record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tech_stack (
+            candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            technology TEXT NOT NULL,
+            PRIMARY KEY (candidate_id, position)
+        );
+        CREATE TABLE IF NOT EXISTS technical_answers (
+            candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+            technology TEXT NOT NULL,
+            question_key TEXT NOT NULL,
+            question TEXT,
+            answer TEXT,
+            PRIMARY KEY (candidate_id, technology, question_key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_tech_stack_technology ON tech_stack(technology, candidate_id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_position ON candidates(desired_position);
+        CREATE INDEX IF NOT EXISTS idx_candidates_location ON candidates(current_location);
+        CREATE INDEX IF NOT EXISTS idx_candidates_experience ON candidates(years_experience);
+        CREATE INDEX IF NOT EXISTS idx_candidates_timestamp ON candidates(timestamp);
+    """
+
+    def __init__(self, path: str = "simulated_candidates.db", timeout: float = 30.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._listeners: List[Callable] = []
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    # -- writing -----------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]):
+        """Insert one candidate record"""
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]]):
+        """Insert several records in one transaction.
+
+        Ids are assigned up front under the write lock, so each table gets a
+        single ``executemany`` however many records are in the batch.
+        """
+        records = list(records)
+        if not records:
+            return
+        candidates, tech_rows, answer_rows = [], [], []
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM candidates").fetchone()[0]
+            for candidate_id, record in enumerate(records, start=next_id):
+                self._rows(candidate_id, record, candidates, tech_rows, answer_rows)
+            conn.executemany(
+                "INSERT INTO candidates (id, full_name, email, phone, years_experience, desired_position,"
+                " current_location, timestamp, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", candidates)
+            conn.executemany(
+                "INSERT INTO tech_stack (candidate_id, position, technology) VALUES (?, ?, ?)", tech_rows)
+            conn.executemany(
+                "INSERT OR REPLACE INTO technical_answers (candidate_id, technology, question_key,"
+                " question, answer) VALUES (?, ?, ?, ?, ?)", answer_rows)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        self._notify(records, next_id + len(records) - 1)
+
+    @staticmethod
+    def _rows(candidate_id: int, record: Dict[str, Any], candidates: list, tech_rows: list, answer_rows: list):
+        candidates.append(
+            (candidate_id, record.get('full_name'), record.get('email'), record.get('phone'),
+             _parse_years(record.get('years_experience')), record.get('desired_position'),
+             record.get('current_location'), record.get('timestamp'),
+             json.dumps(record, ensure_ascii=False, separators=(",", ":"))))
+        for i, tech in enumerate(record.get('tech_stack') or []):
+            tech_rows.append((candidate_id, i, normalize_technology(tech)))
+        for tech, tech_answers in (record.get('technical_answers') or {}).items():
+            for question_key, qa in tech_answers.items():
+                answer_rows.append((candidate_id, normalize_technology(tech), question_key,
+                                    qa.get('question'), qa.get('answer')))
+
+    def flush(self):
+        """Commits are durable on return; kept for interface parity"""
+
+    def close(self):
+        """Close every connection opened by this store"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    # -- reading -----------------------------------------------------------
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_records()
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Stream every stored record, oldest first"""
+        return self.query()
+
+    def count(self) -> int:
+        """Number of stored records"""
+        return self._connection().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def iter_after(self, position: Optional[int] = None,
+                   page_size: int = 1000) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Stream (record, position) pairs for the records stored after ``position``.
+
+        The position is the record id. Raises ValueError if no record has
+        that id any more (the store was replaced or truncated).
+        """
+        conn = self._connection()
+        last_id = position or 0
+        if last_id and conn.execute("SELECT 1 FROM candidates WHERE id = ?", (last_id,)).fetchone() is None:
+            raise ValueError(f"position {position} is past the end of {self.path}")
+        return self._iter_after(conn, last_id, page_size)
+
+    @staticmethod
+    def _iter_after(conn: sqlite3.Connection, last_id: int, page_size: int) -> Iterator[Tuple[Dict[str, Any], int]]:
+        while True:
+            rows = conn.execute("SELECT id, record FROM candidates WHERE id > ? ORDER BY id LIMIT ?",
+                                (last_id, page_size)).fetchall()
+            for row in rows:
+                yield json.loads(row['record']), row['id']
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]['id']
+
+    def iter_pages(self, technologies: Optional[List[str]] = None,
+                   position: Optional[str] = None,
+                   location: Optional[str] = None,
+                   min_experience: Optional[int] = None,
+                   max_experience: Optional[int] = None,
+                   since: Optional[str] = None,
+                   until: Optional[str] = None,
+                   page_size: int = 50) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of matching records, oldest first.
+
+        ``technologies`` must all be present in the candidate's stack;
+        ``position`` and ``location`` match case-insensitively; experience
+        bounds are inclusive; ``since``/``until`` compare ISO timestamps.
+        Pages are fetched with keyset pagination, so deep pages stay cheap.
+        """
+        clauses, params = [], []
+        if technologies:
+            # One indexed point lookup per technology; an IN/GROUP BY
+            # subquery would be re-materialized for every page
+            for tech in sorted({normalize_technology(t) for t in technologies}):
+                clauses.append("EXISTS (SELECT 1 FROM tech_stack WHERE candidate_id = candidates.id"
+                               " AND technology = ?)")
+                params.append(tech)
+        if position is not None:
+            clauses.append("desired_position = ?")
+            params.append(position.strip())
+        if location is not None:
+            clauses.append("current_location = ?")
+            params.append(location.strip())
+        if min_experience is not None:
+            clauses.append("years_experience >= ?")
+            params.append(min_experience)
+        if max_experience is not None:
+            clauses.append("years_experience <= ?")
+            params.append(max_experience)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+
+        sql = "SELECT id, record FROM candidates WHERE id > ?"
+        if clauses:
+            sql += " AND " + " AND ".join(clauses)
+        sql += " ORDER BY id LIMIT ?"
+
+        last_id = 0
+        conn = self._connection()
+        while True:
+            rows = conn.execute(sql, [last_id, *params, page_size]).fetchall()
+            if not rows:
+                return
+            yield [json.loads(row['record']) for row in rows]
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]['id']
+
+    def query(self, **filters) -> Iterator[Dict[str, Any]]:
+        """Matching records one at a time; accepts the ``iter_pages`` filters"""
+        for page in self.iter_pages(**filters):
+            yield from page
+
+
+def normalize_technology(tech: str) -> str:
+    """Canonical form used for indexing tech stack entries (aliases resolved)"""
+    return get_question_bank().canonical(tech) or normalize_key(tech)
+
+
+def _parse_years(value: Any) -> Optional[int]:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class _FileLock:
+    """Exclusive flock on ``path``, or on an already open ``fd``"""
+
+    def __init__(self, path: Optional[str] = None, fd: Optional[int] = None):
+        self.path = path
+        self._fd = fd
+        self._owned = fd is None
+
+    def __enter__(self):
+        if self._owned:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        if self._owned:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _fsync_dir(directory: str):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def follow(store, load: Callable[[List[Dict[str, Any]]], None],
+           live: Callable[[List[Dict[str, Any]]], None], batch_size: int = 10000) -> int:
+    """Pass the records ``store`` holds to ``load`` in batches, then every new save to ``live``.
+
+    The listener is attached before the existing records are read. Batches
+    saved meanwhile are held back and handed to ``live`` afterwards unless
+    the read already covered them, so each record is seen exactly once.
+    Returns how many existing records were loaded.
+    """
+    lock = threading.Lock()
+    pending: Optional[list] = []
+
+    def listener(records: List[Dict[str, Any]], position: Any):
+        with lock:
+            if pending is not None:
+                pending.append((records, position))
+                return
+        live(records)
+
+    store.add_listener(listener, with_position=True)
+    loaded, last, batch = 0, None, []
+    try:
+        for record, last in store.iter_after(None):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                load(batch)
+                loaded += len(batch)
+                batch = []
+        if batch:
+            load(batch)
+            loaded += len(batch)
+    finally:
+        with lock:
+            # Drained under the lock, so later saves wait and stay in order
+            for records, position in pending:
+                if last is None or position > last:
+                    live(records)
+            pending = None
+    return loaded
+
+
+def migrate_json_array(source: str, store, batch_size: int = 1000) -> int:
+    """One-time import of a legacy JSON array file into ``store``.
+
+    The source is renamed to ``<source>.migrated`` afterwards so the
+    migration never runs twice. The whole import holds ``<source>.lock``,
+    and ``<source>.progress`` records how many records are already stored,
+    so a run interrupted part way resumes instead of importing them again.
+    A source that is not valid JSON raises ValueError and is left in place.
+    Returns the number of records imported.
+    """
+    with _FileLock(source + ".lock"):
+        if not os.path.exists(source):
+            return 0  # missing, or migrated by another process meanwhile
+        with open(source, "r") as f:
+            try:
+                records = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"{source} is not valid JSON, not migrating it: {e}") from e
+        if not isinstance(records, list):
+            raise ValueError(f"{source} does not contain a JSON array")
+
+        progress = source + ".progress"
+        done = _read_progress(progress)
+        for start in range(done, len(records), batch_size):
+            store.append_many(records[start:start + batch_size])
+            store.flush()
+            _write_progress(progress, min(start + batch_size, len(records)))
+        # The progress file now marks the import complete, so a crash before
+        # the rename only repeats the rename
+        _write_progress(progress, len(records))
+        os.replace(source, source + ".migrated")
+        _fsync_dir(os.path.dirname(os.path.abspath(source)))
+        _remove_quietly(progress)
+    return len(records) - done
+
+
+def _read_progress(path: str) -> int:
+    try:
+        with open(path, "r") as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def _write_progress(path: str, count: int):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        f.write(str(count))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+LEGACY_JSON_PATH = "simulated_candidates.json"
+STORE_BACKENDS = {
+    "sqlite": (SqliteCandidateStore, "simulated_candidates.db"),
+    "jsonl": (JsonlCandidateStore, "simulated_candidates.jsonl"),
+}
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """Process-wide store shared across Streamlit reruns and sessions.
+
+    The backend is chosen with ``TALENTSCOUT_STORE`` (``sqlite`` by default,
+    or ``jsonl``). The legacy JSON array file is migrated into it on first use.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            backend = os.environ.get("TALENTSCOUT_STORE", "sqlite")
+            if backend not in STORE_BACKENDS:
+                raise ValueError(f"Unknown TALENTSCOUT_STORE backend: {backend}")
+            store_class, path = STORE_BACKENDS[backend]
+            store = store_class(path)
+            migrate_json_array(LEGACY_JSON_PATH, store)
+            _default_store = store
+        return _default_store
@@ -0,0 +1,113 @@
+import streamlit as st
+from typing import List, Dict, Any, Tuple
+
+DEFAULT_LIVE_WINDOW = 12
+DEFAULT_PAGE_SIZE = 20
+
+
+def format_message(message: Dict[str, str]) -> str:
+    """Markdown for one message inside the collapsed transcript"""
+    speaker = "🤖 **TalentScout**" if message['role'] == 'assistant' else "🧑 **You**"
+    return f"{speaker}\n\n{message['content']}"
+
+
+class RenderCache:
+    """Rendered markdown for the parts of a conversation that no longer change.
+
+    Chat messages are immutable once appended, so each is formatted once and
+    transcript pages are memoized by their message range. Question and answer
+    panels are memoized per technology by how many answers it has.
+    """
+
+    __slots__ = ('messages', 'pages', 'questions', 'answers')
+
+    def __init__(self):
+        self.messages: List[str] = []
+        self.pages: Dict[Tuple[int, int], str] = {}
+        self.questions: Dict[Tuple[int, str, int], Tuple[list, dict, str]] = {}
+        self.answers: Dict[Tuple[str, int], Tuple[dict, str]] = {}
+
+    def transcript_page(self, history: List[Dict[str, str]], start: int, end: int) -> str:
+        key = (start, end)
+        page = self.pages.get(key)
+        if page is None:
+            for message in history[len(self.messages):end]:
+                self.messages.append(format_message(message))
+            page = "\n\n---\n\n".join(self.messages[start:end])
+            self.pages[key] = page
+        return page
+
+    def question_list(self, index: int, tech_qa: Dict[str, Any], answers: Dict[str, Any]) -> str:
+        # Entries remember the objects they were built from, so a restarted
+        # screening with the same stack never reuses stale text
+        key = (index, tech_qa['technology'], len(answers))
+        entry = self.questions.get(key)
+        if entry is None or entry[0] is not tech_qa['questions'] or entry[1] is not answers:
+            lines = []
+            for j, question in enumerate(tech_qa['questions'], 1):
+                status = "✅" if f"Q{j}" in answers else "⏳"
+                lines.append(f"{status} {j}. {question}")
+            entry = (tech_qa['questions'], answers, "\n\n".join(lines))
+            self.questions[key] = entry
+        return entry[2]
+
+    def answer_list(self, tech: str, answers: Dict[str, Any]) -> str:
+        key = (tech, len(answers))
+        entry = self.answers.get(key)
+        if entry is None or entry[0] is not answers:
+            text = "\n\n---\n\n".join(
+                f"**{q_key}: {qa['question']}**\n\n"
+                + ("*Skipped*" if qa.get('skipped') else f"*Answer:* {qa['answer']}")
+                for q_key, qa in answers.items())
+            entry = (answers, text)
+            self.answers[key] = entry
+        return entry[1]
+
+
+def get_render_cache() -> RenderCache:
+    if 'render_cache' not in st.session_state:
+        st.session_state.render_cache = RenderCache()
+    return st.session_state.render_cache
+
+
+def render_chat_history(history: List[Dict[str, str]],
+                        live_window: int = DEFAULT_LIVE_WINDOW,
+                        page_size: int = DEFAULT_PAGE_SIZE):
+    """Render the latest messages live and older ones as one paginated block"""
+    cache = get_render_cache()
+    older_count = max(0, len(history) - live_window)
+
+    if older_count:
+        with st.expander(f"🕘 Earlier messages ({older_count})", expanded=False):
+            page_count = (older_count + page_size - 1) // page_size
+            page = page_count
+            if page_count > 1:
+                page = st.number_input("Page", min_value=1, max_value=page_count,
+                                       value=page_count, key="history_page")
+            start = (page - 1) * page_size
+            end = min(start + page_size, older_count)
+            st.caption(f"Messages {start + 1}-{end} of {older_count}")
+            st.markdown(cache.transcript_page(history, start, end))
+
+    for message in history[older_count:]:
+        st.chat_message(message['role']).markdown(message['content'])
+
+
+def render_question_panel(tech_questions: List[Dict[str, Any]], candidate_answers: Dict[str, Any]):
+    """One markdown block per technology instead of one element per question"""
+    cache = get_render_cache()
+    with st.expander("📋 Generated Technical Questions", expanded=True):
+        for i, tech_qa in enumerate(tech_questions):
+            st.subheader(f"**{tech_qa['technology']}**")
+            answers = candidate_answers.get(tech_qa['technology'], {})
+            st.markdown(cache.question_list(i, tech_qa, answers))
+            st.divider()
+
+
+def render_answer_panel(candidate_answers: Dict[str, Any]):
+    cache = get_render_cache()
+    with st.expander("📝 Candidate Answers", expanded=True):
+        for tech, answers in candidate_answers.items():
+            st.subheader(f"**{tech}**")
+            st.markdown(cache.answer_list(tech, answers))
+            st.divider()
@@ -0,0 +1,339 @@
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional
+
+from intent_router import (
+    classify, INTENTS, INTENT_ANSWER, INTENT_EXIT, INTENT_RESTART, INTENT_SKIP, INTENT_REPEAT
+)
+from metrics import get_default_registry
+from question_providers import QuestionProvider, TemplateQuestionProvider, seniority_for
+from validators import validate_email, validate_phone, validate_years_experience, mask_sensitive_data
+
+STATE_GREETING = "greeting"
+STATE_COLLECTING = "collecting_info"
+STATE_ASKING = "asking_questions"
+STATE_COMPLETED = "completed"
+
+REQUIRED_FIELDS = (
+    'full_name', 'email', 'phone', 'years_experience',
+    'desired_position', 'current_location', 'tech_stack'
+)
+FIELD_BITS = {field: 1 << i for i, field in enumerate(REQUIRED_FIELDS)}
+ALL_FIELDS = (1 << len(REQUIRED_FIELDS)) - 1
+
+EXIT_MESSAGE = "Thank you for your time! Your information and answers have been saved. We'll be in touch soon. Goodbye! 👋"
+RESTART_MESSAGE = "No problem, let's start over. What's your full name?"
+HELP_MESSAGES = {
+    STATE_GREETING: "Just say hi to get started, or type 'exit' to leave at any time.",
+    STATE_COLLECTING: "Answer each question to continue. You can type 'repeat' to see the question again, 'start over' to restart, or 'exit' to leave.",
+    STATE_ASKING: "Type your answer to the question. You can also type 'skip' to move on, 'repeat' to see the question again, 'start over' to restart, or 'exit' to finish.",
+    STATE_COMPLETED: "You're all done! Type 'exit' to end the conversation or 'start over' to begin a new screening.",
+}
+
+# Prompt for each field once the previous one is collected, and the
+# re-prompt shown when validation fails
+FIELD_PROMPTS = {
+    'full_name': "Great! Let's start with your full name:",
+    'email': "Thanks! What's your email address?",
+    'phone': "Perfect! What's your phone number?",
+    'years_experience': "Great! How many years of professional experience do you have?",
+    'desired_position': "What position(s) are you interested in?",
+    'current_location': "What's your current location?",
+    'tech_stack': "Almost done! Please list your tech stack (comma-separated, e.g., Python, JavaScript, React):",
+}
+FIELD_ERRORS = {
+    'email': "That doesn't look like a valid email format. Please enter a valid email address:",
+    'phone': "Please enter a valid phone number (at least 10 digits):",
+    'years_experience': "Please enter a valid number of years (0-50):",
+    'tech_stack': "Please provide at least one technology in your tech stack (comma-separated):",
+}
+FIELD_VALIDATORS = {
+    'email': validate_email,
+    'phone': validate_phone,
+    'years_experience': validate_years_experience,
+}
+
+_metrics = get_default_registry()
+TURNS = _metrics.counter("talentscout_turns_total", "Conversation turns by classified intent", ("intent",))
+TURN_STAGE_SECONDS = _metrics.histogram(
+    "talentscout_turn_stage_seconds", "Time spent in each stage of a conversation turn", ("stage",))
+VALIDATION_FAILURES = _metrics.counter(
+    "talentscout_validation_failures_total", "Candidate inputs rejected by field validation", ("field",))
+QUESTION_GENERATION_SECONDS = _metrics.histogram(
+    "talentscout_question_generation_seconds", "Time to build the technical questions for a tech stack")
+SAVE_SECONDS = _metrics.histogram(
+    "talentscout_save_seconds", "Time a completed screening waits on save_candidate_data")
+SAVES = _metrics.counter("talentscout_saves_total", "Candidate saves by outcome", ("result",))
+# Resolved once so the per-turn cost is a clock read and a bucket increment
+_INTENT_TIME = TURN_STAGE_SECONDS.labels("intent")
+_TRANSITION_TIME = TURN_STAGE_SECONDS.labels("transition")
+_QUESTION_GENERATION_TIME = QUESTION_GENERATION_SECONDS.labels()
+_TURN_COUNTS = {intent: TURNS.labels(intent) for intent in INTENTS}
+_SAVE_TIME = SAVE_SECONDS.labels()
+
+
+class SessionState:
+    """Compact per-candidate screening state.
+
+    ``collected_fields`` is a bitmask over ``REQUIRED_FIELDS``; ``saved`` is
+    set once the screening has been handed to ``on_complete``.
+    """
+
+    __slots__ = (
+        'current_state', 'collected_fields', 'current_tech_index',
+        'current_question_index', 'candidate_data', 'tech_questions',
+        'candidate_answers', 'saved'
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.current_state = STATE_GREETING
+        self.collected_fields = 0
+        self.current_tech_index = 0
+        self.current_question_index = 0
+        self.candidate_data: Dict[str, Any] = {}
+        self.tech_questions: List[Dict[str, Any]] = []
+        self.candidate_answers: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self.saved = False
+
+    def has_field(self, field: str) -> bool:
+        return bool(self.collected_fields & FIELD_BITS[field])
+
+    def collected_count(self) -> int:
+        """Number of required fields collected so far"""
+        return bin(self.collected_fields).count("1")
+
+    def next_missing_field(self) -> Optional[str]:
+        for field in REQUIRED_FIELDS:
+            if not self.collected_fields & FIELD_BITS[field]:
+                return field
+        return None
+
+    def total_questions(self) -> int:
+        return sum(len(tech['questions']) for tech in self.tech_questions)
+
+    def answered_questions(self) -> int:
+        return sum(len(answers) for answers in self.candidate_answers.values())
+
+
+class ConversationEngine:
+    """Screening state machine: greeting → collecting_info → asking_questions → completed.
+
+    The engine is stateless apart from its collaborators; every call takes
+    the ``SessionState`` to act on, so one engine serves any number of
+    sessions. ``question_provider`` supplies the technical questions (bank
+    templates by default). ``on_complete`` is called with the session when
+    the candidate exits with data collected or finishes the last question.
+    """
+
+    def __init__(self,
+                 question_provider: Optional[QuestionProvider] = None,
+                 on_complete: Optional[Callable[[SessionState], None]] = None):
+        self.question_provider = question_provider or TemplateQuestionProvider()
+        self.on_complete = on_complete
+
+    def new_session(self) -> SessionState:
+        return SessionState()
+
+    def _complete(self, session: SessionState):
+        # At most once per screening: 'exit' after finishing must not save again
+        if session.saved:
+            return
+        if self.on_complete is not None:
+            self.on_complete(session)
+        session.saved = True
+
+    def get_current_question(self, session: SessionState) -> Optional[Dict[str, Any]]:
+        """Get the current question being asked"""
+        tech_questions = session.tech_questions
+        if tech_questions and session.current_tech_index < len(tech_questions):
+            tech_qa = tech_questions[session.current_tech_index]
+            questions = tech_qa['questions']
+            if session.current_question_index < len(questions):
+                return {
+                    'technology': tech_qa['technology'],
+                    'question': questions[session.current_question_index],
+                    'question_number': session.current_question_index + 1,
+                    'total_questions': len(questions)
+                }
+        return None
+
+    def process(self, session: SessionState, user_input: str) -> str:
+        """Process user input and return the assistant's response"""
+        current_state = session.current_state
+        start = time.perf_counter_ns()
+        intent = classify(user_input, current_state)
+        classified = time.perf_counter_ns()
+        _INTENT_TIME.record_ns(classified - start)
+        _TURN_COUNTS[intent].inc()
+        try:
+            return self._transition(session, current_state, intent, user_input)
+        finally:
+            _TRANSITION_TIME.record_ns(time.perf_counter_ns() - classified)
+
+    def _transition(self, session: SessionState, current_state: str, intent: str, user_input: str) -> str:
+        if intent != INTENT_ANSWER:
+            return self._handle_command(session, intent)
+
+        if current_state == STATE_GREETING:
+            session.current_state = STATE_COLLECTING
+            return FIELD_PROMPTS['full_name']
+        elif current_state == STATE_COLLECTING:
+            return self._collect_field(session, user_input)
+        elif current_state == STATE_ASKING:
+            return self._record_answer(session, user_input)
+
+        # Fallback for any other input
+        return "I didn't understand that. Can you clarify?"
+
+    def _handle_command(self, session: SessionState, intent: str) -> str:
+        if intent == INTENT_EXIT:
+            if session.candidate_data:
+                self._complete(session)
+            return EXIT_MESSAGE
+        if intent == INTENT_RESTART:
+            session.reset()
+            session.current_state = STATE_COLLECTING
+            return RESTART_MESSAGE
+        if intent == INTENT_SKIP:
+            return self._record_answer(session, "", skipped=True)
+        if intent == INTENT_REPEAT:
+            prompt = self.current_prompt(session)
+            if prompt is not None:
+                return prompt
+        return HELP_MESSAGES.get(session.current_state, HELP_MESSAGES[STATE_COMPLETED])
+
+    def current_prompt(self, session: SessionState) -> Optional[str]:
+        """The question the candidate is expected to answer next, if any"""
+        if session.current_state == STATE_ASKING:
+            current_question = self.get_current_question(session)
+            if current_question:
+                return format_question(current_question)
+        if session.current_state == STATE_COLLECTING:
+            field = session.next_missing_field()
+            if field is not None:
+                return FIELD_PROMPTS[field]
+        return None
+
+    def _collect_field(self, session: SessionState, user_input: str) -> str:
+        field = session.next_missing_field()
+        if field is None:
+            return "I didn't understand that. Can you clarify?"
+
+        if field == 'tech_stack':
+            return self._collect_tech_stack(session, user_input)
+
+        validator = FIELD_VALIDATORS.get(field)
+        if validator is not None and not validator(user_input):
+            VALIDATION_FAILURES.labels(field).inc()
+            return FIELD_ERRORS[field]
+
+        session.candidate_data[field] = user_input
+        session.collected_fields |= FIELD_BITS[field]
+        return FIELD_PROMPTS[REQUIRED_FIELDS[REQUIRED_FIELDS.index(field) + 1]]
+
+    def _collect_tech_stack(self, session: SessionState, user_input: str) -> str:
+        tech_list = [tech.strip() for tech in user_input.split(',') if tech.strip()]
+        if not tech_list:
+            VALIDATION_FAILURES.labels('tech_stack').inc()
+            return FIELD_ERRORS['tech_stack']
+
+        session.candidate_data['tech_stack'] = tech_list
+        session.collected_fields |= FIELD_BITS['tech_stack']
+
+        # Generate technical questions
+        seniority = seniority_for(session.candidate_data.get('years_experience'))
+        with _QUESTION_GENERATION_TIME.time():
+            session.tech_questions = self.question_provider.questions_for_stack(tech_list, seniority)
+        session.current_state = STATE_ASKING
+        session.current_tech_index = 0
+        session.current_question_index = 0
+
+        # Start asking questions
+        current_question = self.get_current_question(session)
+        if current_question:
+            return "Excellent! Now let's go through some technical questions.\n\n" + format_question(current_question)
+        session.current_state = STATE_COMPLETED
+        return "No questions generated. Type 'exit' to end the conversation."
+
+    def _record_answer(self, session: SessionState, user_input: str, skipped: bool = False) -> str:
+        current_question = self.get_current_question(session)
+        if not current_question:
+            session.current_state = STATE_COMPLETED
+            return "No more questions available. Type 'exit' to end the conversation."
+
+        # Store the answer
+        tech_answers = session.candidate_answers.setdefault(current_question['technology'], {})
+        answer = {'question': current_question['question'], 'answer': user_input}
+        if skipped:
+            answer['skipped'] = True
+        tech_answers[f"Q{current_question['question_number']}"] = answer
+
+        # Move to next question, then to the next technology
+        session.current_question_index += 1
+        if session.current_question_index >= current_question['total_questions']:
+            session.current_tech_index += 1
+            session.current_question_index = 0
+            # Let the provider swap in questions that arrived in the background
+            self.question_provider.refresh(
+                session.tech_questions, session.current_tech_index,
+                seniority_for(session.candidate_data.get('years_experience')))
+
+        next_question = self.get_current_question(session)
+        if next_question:
+            lead = "No problem, let's move on." if skipped else "Thank you for your answer!"
+            return lead + " \n\n" + format_question(next_question)
+
+        # All questions completed
+        session.current_state = STATE_COMPLETED
+        self._complete(session)
+        return "🎉 Fantastic! You've completed all technical questions. Your answers have been saved. Type 'exit' to end the conversation or ask any other questions."
+
+
+def format_question(question: Dict[str, Any]) -> str:
+    return (f"**{question['technology']} - Question {question['question_number']}/{question['total_questions']}:**\n"
+            f"{question['question']}\n\nPlease provide your answer:")
+
+
+@_QUESTION_GENERATION_TIME.timed
+def generate_tech_questions(tech_stack: List[str]) -> List[Dict[str, Any]]:
+    """Generate technical questions for each technology in the stack"""
+    # Templates live in questions/ and are compiled once into an alias index
+    return TemplateQuestionProvider().questions_for_stack(tech_stack, "mid")
+
+
+def build_candidate_record(session: SessionState) -> Dict[str, Any]:
+    """Unmasked record for a session, as saved to the candidate store"""
+    return {
+        **session.candidate_data,
+        'technical_answers': session.candidate_answers,
+        'technical_questions': {tech_qa['technology']: len(tech_qa['questions'])
+                                for tech_qa in session.tech_questions},
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+@_SAVE_TIME.timed
+def save_candidate_data(session: SessionState, store, writer=None):
+    """Mask a completed screening and save it.
+
+    With a write-behind ``writer`` the record is queued for a background
+    group commit, so the candidate's turn never waits on disk; otherwise it
+    is appended to ``store`` directly. Errors are counted and re-raised.
+    """
+    if not session.candidate_data:
+        return
+    # Combine all data including answers
+    masked_data = mask_sensitive_data(build_candidate_record(session))
+    try:
+        if writer is not None:
+            writer.submit(masked_data)
+            SAVES.labels("queued").inc()
+        else:
+            store.append(masked_data)
+            SAVES.labels("stored").inc()
+    except Exception:
+        SAVES.labels("failed").inc()
+        raise
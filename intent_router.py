@@ -0,0 +1,66 @@
+import re
+
+INTENT_ANSWER = "answer"
+INTENT_EXIT = "exit"
+INTENT_RESTART = "restart"
+INTENT_SKIP = "skip"
+INTENT_REPEAT = "repeat"
+INTENT_HELP = "help"
+INTENTS = (INTENT_ANSWER, INTENT_EXIT, INTENT_RESTART, INTENT_SKIP, INTENT_REPEAT, INTENT_HELP)
+
+# Commands only count when they are the whole message (give or take
+# politeness and punctuation), so an answer such as "the process exits
+# when..." is never mistaken for one.
+_COMMANDS = {
+    INTENT_EXIT: r"exit|quit|bye|good\s*bye|thanks|thank\s+you|that'?s\s+all|end(?:\s+(?:the\s+)?(?:chat|conversation|interview))?",
+    INTENT_RESTART: r"restart|start\s+over|start\s+again|reset",
+    INTENT_SKIP: r"skip(?:\s+(?:this|it|the))?(?:\s+question)?|next(?:\s+question)?|pass",
+    INTENT_REPEAT: r"repeat(?:\s+(?:that|it|the\s+question|question))?|say\s+(?:that|it)\s+again|what\s+was\s+the\s+question|come\s+again",
+    INTENT_HELP: r"help|\?+|what\s+can\s+i\s+(?:say|do|type)|commands",
+}
+_FILLER = r"(?:please|pls|now|ok(?:ay)?|i\s+want\s+to|i'?d\s+like\s+to|can\s+(?:we|you|i)|let'?s|just|thanks?|thank\s+you)"
+COMMAND_PATTERN = re.compile(
+    r"^[\W_]*(?:" + _FILLER + r"[\s,]+)*(?:"
+    + "|".join(f"(?P<{intent}>{pattern})" for intent, pattern in _COMMANDS.items())
+    + r")(?:[\s,]+" + _FILLER + r")*[\W_]*$",
+    re.IGNORECASE,
+)
+
+# Where no answer is expected (before collecting details and after the last
+# question), a short message that merely contains an exit keyword as a whole
+# word ("ok bye then") still ends the conversation. Field values such as
+# "Exit Strategy Consultant" must not, so collecting_info is excluded.
+KEYWORD_EXIT_STATES = {"greeting", "completed"}
+EXIT_KEYWORD_PATTERN = re.compile(r"\b(?:exit|quit|bye|goodbye|thanks|thank\s+you)\b", re.IGNORECASE)
+
+MAX_COMMAND_LENGTH = 64
+MAX_KEYWORD_EXIT_WORDS = 6
+
+# Which commands each conversation state understands
+STATE_INTENTS = {
+    "greeting": {INTENT_EXIT, INTENT_HELP},
+    "collecting_info": {INTENT_EXIT, INTENT_RESTART, INTENT_REPEAT, INTENT_HELP},
+    "asking_questions": {INTENT_EXIT, INTENT_RESTART, INTENT_SKIP, INTENT_REPEAT, INTENT_HELP},
+    "completed": {INTENT_EXIT, INTENT_RESTART, INTENT_HELP},
+}
+
+
+def classify(message: str, state: str) -> str:
+    """Classify a candidate message into one of the INTENT_* constants.
+
+    Long messages are answers without running any pattern, so the cost of
+    classifying a multi-paragraph answer does not depend on its length.
+    """
+    allowed = STATE_INTENTS.get(state, ())
+    if len(message) <= MAX_COMMAND_LENGTH:
+        match = COMMAND_PATTERN.match(message)
+        if match is not None:
+            intent = match.lastgroup
+            if intent in allowed:
+                return intent
+            return INTENT_ANSWER
+        if (state in KEYWORD_EXIT_STATES and INTENT_EXIT in allowed
+                and len(message.split()) <= MAX_KEYWORD_EXIT_WORDS
+                and EXIT_KEYWORD_PATTERN.search(message) is not None):
+            return INTENT_EXIT
+    return INTENT_ANSWER
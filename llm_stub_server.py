@@ -0,0 +1,88 @@
+"""Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Answers every request with synthetic questions for the technologies named
+in the prompt, after an optional delay, so the LLM question provider can be
+exercised without network access:
+
+    python llm_stub_server.py --port 8765 --delay 0.5
+    TALENTSCOUT_LLM_ENDPOINT=http://127.0.0.1:8765/v1 streamlit run TalentScout_app.py
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_TECHNOLOGIES = re.compile(r"each of these technologies: (.*?)\. Make the last")
+_SENIORITY = re.compile(r"for an? (\w+) candidate")
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    requests_served = 0
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = body['messages'][-1]['content']
+        techs_match = _TECHNOLOGIES.search(prompt)
+        seniority_match = _SENIORITY.search(prompt)
+        techs = techs_match.group(1).split(", ") if techs_match else []
+        seniority = seniority_match.group(1) if seniority_match else "mid"
+
+        if self.delay:
+            time.sleep(self.delay)
+        type(self).requests_served += 1
+
+        questions = {
+            tech: [f"[stub {seniority}] Question {i} about {tech}?" for i in range(1, 5)]
+            + [f"CODING TASK (Optional): [stub {seniority}] Build something small with {tech}."]
+            for tech in techs
+        }
+        payload = json.dumps({
+            'id': f"stub-{self.requests_served}",
+            'object': "chat.completion",
+            'model': body.get('model'),
+            'choices': [{'index': 0, 'finish_reason': "stop",
+                         'message': {'role': "assistant", 'content': json.dumps(questions)}}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except BrokenPipeError:
+            pass  # the client gave up waiting
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """Serve in a daemon thread; ``server.server_address`` has the bound port"""
+    handler = type("ConfiguredStubLLMHandler", (StubLLMHandler,), {'delay': delay})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering")
+    args = parser.parse_args(argv)
+    handler = type("ConfiguredStubLLMHandler", (StubLLMHandler,), {'delay': args.delay})
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+    print(f"Stub LLM endpoint at http://127.0.0.1:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Asyncio load test: replay scripted candidate conversations concurrently.
+
+Seed personas come from the stored candidate records; every conversation
+runs through ConversationEngine, checkpoints its session after each turn
+and is saved with the app's own save_candidate_data: masked and submitted to
+the write-behind queue in front of a real candidate store.
+
+Usage:
+    python load_test.py --conversations 2000 --concurrency 500 --store sqlite
+    python load_test.py --no-write-behind   # append to the store directly
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import List, Dict, Any, Optional
+
+from candidate_store import JsonlCandidateStore, SqliteCandidateStore, LEGACY_JSON_PATH
+from conversation_engine import ConversationEngine, SessionState, save_candidate_data
+from session_checkpoint import SessionCheckpointer, SessionManager
+from write_behind import WriteBehindWriter
+
+DEFAULT_ANSWER = "I have used this in production and would explain it with a concrete example."
+
+
+def load_personas(path: str) -> List[Dict[str, Any]]:
+    """Stored candidate records from a JSON array or JSONL file"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def build_script(persona: Dict[str, Any], number: int) -> List[str]:
+    """Candidate messages for one conversation based on a stored persona.
+
+    Stored emails and phones are masked, so valid ones are synthesized.
+    """
+    stack = persona.get('tech_stack') or ["Python"]
+    return [
+        "hi",
+        persona.get('full_name') or f"Candidate {number}",
+        f"candidate{number}@example.com",
+        f"98{number:08d}"[-10:],
+        str(persona.get('years_experience') or 3),
+        persona.get('desired_position') or "software developer",
+        persona.get('current_location') or "Remote",
+        ", ".join(stack),
+    ]
+
+
+def persona_answer(persona: Dict[str, Any], technology: str, question_number: int) -> str:
+    answers = (persona.get('technical_answers') or {}).get(technology) or {}
+    stored = answers.get(f"Q{question_number}")
+    return stored['answer'] if stored else DEFAULT_ANSWER
+
+
+class AppSaver:
+    """Saves through the app's save_candidate_data (write-behind queue, or the
+    store when there is no writer), recording how long each completed
+    conversation waits on it."""
+
+    def __init__(self, store, writer: Optional[WriteBehindWriter] = None):
+        self.store = store
+        self.writer = writer
+        self.save_times: List[float] = []
+
+    def save(self, session: SessionState):
+        start = time.perf_counter()
+        save_candidate_data(session, self.store, self.writer)
+        self.save_times.append(time.perf_counter() - start)
+
+
+class LoadTest:
+    def __init__(self, personas: List[Dict[str, Any]], saver: AppSaver, sessions: SessionManager,
+                 concurrency: int, think_time: float = 0.0):
+        self.personas = personas
+        self.saver = saver
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.think_time = think_time
+        self.turn_latencies: List[float] = []
+        self.turns = 0
+        self.completed = 0
+
+    async def run_conversation(self, number: int, semaphore: asyncio.Semaphore):
+        persona = self.personas[number % len(self.personas)]
+        async with semaphore:
+            # Completed sessions are queued and saved off the event loop
+            pending: List[SessionState] = []
+            engine = ConversationEngine(on_complete=pending.append)
+            token, session = self.sessions.create()
+            messages = iter(build_script(persona, number))
+            while True:
+                message = next(messages, None)
+                if message is None:
+                    question = engine.get_current_question(session)
+                    if question is None:
+                        break
+                    message = persona_answer(persona, question['technology'], question['question_number'])
+
+                if self.think_time:
+                    await asyncio.sleep(random.uniform(0, 2 * self.think_time))
+                start = time.perf_counter()
+                engine.process(session, message)
+                while pending:
+                    # A full queue makes the submitting session commit itself, as in the app
+                    await asyncio.to_thread(self.saver.save, pending.pop())
+                # As in the app, every turn ends with the session's checkpoint
+                self.sessions.checkpoint(token, session)
+                self.turn_latencies.append(time.perf_counter() - start)
+                self.turns += 1
+            self.completed += 1
+
+    async def run(self, conversations: int) -> float:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(*(self.run_conversation(n, semaphore) for n in range(conversations)))
+        return time.perf_counter() - start
+
+
+def percentiles(samples: List[float], points=(50, 95, 99)) -> Dict[str, float]:
+    if not samples:
+        return {f"p{p}": 0.0 for p in points}
+    ordered = sorted(samples)
+    return {f"p{p}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in points}
+
+
+def summarize(test: LoadTest, elapsed: float, drain: float = 0.0) -> Dict[str, Any]:
+    """Throughput and latencies; queue contention comes from the writer's own stats"""
+    ms = lambda values: {k: round(v * 1e3, 3) for k, v in values.items()}  # noqa: E731
+    report = {
+        'conversations': test.completed,
+        'turns': test.turns,
+        'elapsed_s': round(elapsed, 3),
+        'turns_per_s': round(test.turns / elapsed, 1) if elapsed else 0.0,
+        'conversations_per_s': round(test.completed / elapsed, 1) if elapsed else 0.0,
+        'turn_latency_ms': ms(percentiles(test.turn_latencies)),
+        'saves': len(test.saver.save_times),
+        'save_latency_ms': {**ms(percentiles(test.saver.save_times)),
+                            'max': round(max(test.saver.save_times, default=0.0) * 1e3, 3)},
+        'sessions': test.sessions.stats(),
+    }
+    writer = test.saver.writer
+    if writer is not None:
+        stats = writer.stats()
+        report['write_behind'] = {
+            'drain_s': round(drain, 3),
+            'committed': stats['committed'], 'batches': stats['batches'],
+            'mean_batch_size': round(stats['mean_batch_size'], 1),
+            'max_queue_depth': stats['max_queue_depth'], 'overflow_commits': stats['overflow_commits'],
+            'retries': stats['retries'], 'dead_lettered': stats['dead_lettered'],
+            'queue_wait_ms': {k[:-3]: round(v, 3) for k, v in stats['queue_wait'].items()},
+            'commit_latency_ms': {k[:-3]: round(v, 3) for k, v in stats['commit_latency'].items()},
+        }
+    return report
+
+
+def open_store(kind: str, path: Optional[str]):
+    """Store under test; a throwaway one in a temp directory unless ``path`` is given"""
+    if not path:
+        filename = "candidates.db" if kind == "sqlite" else "candidates.jsonl"
+        path = os.path.join(tempfile.mkdtemp(prefix="talentscout-load-"), filename)
+    return SqliteCandidateStore(path) if kind == "sqlite" else JsonlCandidateStore(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="mean simulated typing delay between candidate turns")
+    parser.add_argument("--personas", default=LEGACY_JSON_PATH,
+                        help="JSON array or JSONL file of stored candidate records")
+    parser.add_argument("--store", choices=["sqlite", "jsonl"], default="sqlite")
+    parser.add_argument("--store-path", help="store location (default: a temporary directory)")
+    parser.add_argument("--no-write-behind", action="store_true",
+                        help="append each record to the store from the saving session instead of queueing it")
+    parser.add_argument("--queue-size", type=int, default=1024, help="write-behind queue capacity")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.personas):
+        personas = load_personas(args.personas)
+    elif os.path.exists(args.personas + ".migrated"):
+        personas = load_personas(args.personas + ".migrated")
+    else:
+        personas = []
+    personas = personas or [{}]
+
+    store = open_store(args.store, args.store_path)
+    session_dir = tempfile.mkdtemp(prefix="talentscout-sessions-")
+    sessions = SessionManager(SessionCheckpointer(session_dir))
+    writer = None
+    if not args.no_write_behind:
+        writer = WriteBehindWriter(store, max_queue=args.queue_size,
+                                   dead_letter_dir=os.path.join(os.path.dirname(store.path), "failed_saves"))
+    drain = 0.0
+    try:
+        test = LoadTest(personas, AppSaver(store, writer), sessions, args.concurrency, args.think_ms / 1e3)
+        elapsed = asyncio.run(test.run(args.conversations))
+        if writer is not None:
+            start = time.perf_counter()
+            writer.close()
+            drain = time.perf_counter() - start
+    finally:
+        if writer is not None:
+            writer.close()
+        store.close()
+        shutil.rmtree(session_dir, ignore_errors=True)
+        if not args.store_path:
+            shutil.rmtree(os.path.dirname(store.path), ignore_errors=True)
+
+    report = summarize(test, elapsed, drain)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['conversations']} conversations, {report['turns']} turns in {report['elapsed_s']}s "
+          f"(concurrency {args.concurrency}, {args.store}{', direct saves' if writer is None else ''})")
+    print(f"throughput: {report['turns_per_s']} turns/s, {report['conversations_per_s']} conversations/s")
+    for label, key in (("turn latency", 'turn_latency_ms'), ("save latency", 'save_latency_ms')):
+        print(f"{label:<15} " + "  ".join(f"{k}={v}ms" for k, v in report[key].items()))
+    print(f"{'sessions':<15} {report['sessions']['in_memory']} in memory "
+          f"({report['sessions']['memory_bytes']:,} bytes), {report['sessions']['evictions']} evicted to disk")
+    queue = report.get('write_behind')
+    if queue:
+        for label, key in (("queue wait", 'queue_wait_ms'), ("commit latency", 'commit_latency_ms')):
+            print(f"{label:<15} " + "  ".join(f"{k}={v}ms" for k, v in queue[key].items()))
+        print(f"write-behind    {queue['committed']} records in {queue['batches']} commits "
+              f"(mean batch {queue['mean_batch_size']}), max queue depth {queue['max_queue_depth']}, "
+              f"{queue['overflow_commits']} overflow commits, {queue['retries']} retries, "
+              f"{queue['dead_lettered']} dead-lettered, drained in {queue['drain_s']}s")
+
+
+if __name__ == "__main__":
+    main()
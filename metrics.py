@@ -0,0 +1,440 @@
+import atexit
+import functools
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Values below 2**SUB_BUCKET_BITS nanoseconds get a bucket each; above that
+# every power of two is split into 2**(SUB_BUCKET_BITS - 1) buckets, so a
+# recorded latency is off by at most 1/64 (1.6%) of its value.
+SUB_BUCKET_BITS = 7
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+_LINEAR = 1 << SUB_BUCKET_BITS
+# Longer latencies (about 18 minutes) share the last bucket
+MAX_TRACKABLE_NS = (1 << 40) - 1
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _bucket_index(nanoseconds: int) -> int:
+    if nanoseconds < _LINEAR:
+        return nanoseconds
+    shift = nanoseconds.bit_length() - SUB_BUCKET_BITS
+    return shift * _HALF + (nanoseconds >> shift)
+
+
+BUCKET_COUNT = _bucket_index(MAX_TRACKABLE_NS) + 1
+
+
+def _bucket_high(index: int) -> int:
+    """Highest value, in nanoseconds, that lands in bucket ``index``"""
+    if index < _LINEAR:
+        return index
+    shift = index // _HALF - 1
+    top = index - shift * _HALF
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Latency histogram with HdrHistogram-style log-linear buckets.
+
+    Recording is an index computation and two increments, with a fixed
+    relative error and no stored samples, so it can stay on every turn.
+    Values are kept in whole nanoseconds. Recording takes no lock: two
+    threads recording into the same bucket at the same instant can lose
+    a sample, which a latency distribution tolerates and a lock on every
+    turn would cost more than the timing itself.
+    """
+
+    __slots__ = ('_counts', '_total')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._counts: List[int] = [0] * BUCKET_COUNT
+        self._total = [0]
+
+    def record_ns(self, nanoseconds: int):
+        if nanoseconds < _LINEAR:
+            index = nanoseconds if nanoseconds > 0 else 0
+        elif nanoseconds <= MAX_TRACKABLE_NS:
+            shift = nanoseconds.bit_length() - SUB_BUCKET_BITS
+            index = shift * _HALF + (nanoseconds >> shift)
+        else:
+            index = BUCKET_COUNT - 1
+        self._counts[index] += 1
+        self._total[0] += nanoseconds
+
+    def record(self, seconds: float):
+        self.record_ns(int(seconds * 1e9))
+
+    def time(self) -> "_Timer":
+        """Context manager recording the time spent in its block"""
+        return _Timer(self)
+
+    def timed(self, function: Callable) -> Callable:
+        """Decorator recording every call's duration, including ones that raise"""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record_ns(time.perf_counter_ns() - start)
+        return wrapper
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def max(self) -> float:
+        """Largest recorded latency in seconds, to the histogram's precision"""
+        counts = self._counts
+        for index in range(len(counts) - 1, -1, -1):
+            if counts[index]:
+                return _bucket_high(index) / 1e9
+        return 0.0
+
+    def _quantiles(self, quantiles) -> Tuple[int, float, List[float]]:
+        counts = list(self._counts)
+        total = self._total[0]
+        count = sum(counts)
+        if not count:
+            return 0, 0.0, [0.0] * len(quantiles)
+        # One pass over the buckets for every quantile, in ascending order
+        targets = sorted((max(1, int(quantile * count + 0.5)), position)
+                         for position, quantile in enumerate(quantiles))
+        values = [0.0] * len(quantiles)
+        pending = 0
+        seen = 0
+        for index, bucket in enumerate(counts):
+            if not bucket:
+                continue
+            seen += bucket
+            while pending < len(targets) and seen >= targets[pending][0]:
+                values[targets[pending][1]] = _bucket_high(index) / 1e9
+                pending += 1
+            if pending == len(targets):
+                break
+        return count, total / 1e9, values
+
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds at percentile ``pct`` (0-100)"""
+        return self._quantiles((pct / 100,))[2][0]
+
+    def snapshot(self) -> Dict[str, float]:
+        count, total, (p50, p90, p99, p999) = self._quantiles(SUMMARY_QUANTILES)
+        return {'count': count, 'mean_ms': total / count * 1e3 if count else 0.0,
+                'p50_ms': p50 * 1e3, 'p90_ms': p90 * 1e3, 'p99_ms': p99 * 1e3,
+                'p999_ms': p999 * 1e3, 'max_ms': self.max * 1e3}
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record_ns(time.perf_counter_ns() - self.start)
+        return False
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _format_value(value: float) -> str:
+    """Sample value at full precision; ``:g`` would turn 1234567 into 1.23457e+06"""
+    value = float(value)
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _label_text(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Family:
+    """A named metric with one child per combination of label values"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **labels: str):
+        """The child for these label values; resolve it once for a hot path"""
+        key = tuple(str(value) for value in values) or tuple(str(labels[name]) for name in self.labelnames)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {key}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _CounterValue:
+    """Counter child. Like LatencyHistogram it takes no lock: the add runs
+    without a call or jump for the GIL to switch threads on, and a lock
+    would cost several times the increment on every turn."""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        self.labels(**labels).inc(amount)
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(child.value)}"
+                                for key, child in self.children()]
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        return {key: child.value for key, child in self.children()}
+
+
+class Histogram(_Family):
+    """Latency histograms, exported as Prometheus summaries (in seconds)"""
+
+    kind = "summary"
+
+    def _new_child(self):
+        return LatencyHistogram()
+
+    def time(self, **labels: str) -> _Timer:
+        return self.labels(**labels).time()
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in self.children():
+            count, total, values = child._quantiles(SUMMARY_QUANTILES)
+            for quantile, value in zip(SUMMARY_QUANTILES, values):
+                quantile_label = 'quantile="%g"' % quantile
+                lines.append(f"{self.name}{_label_text(self.labelnames, key, quantile_label)} {_format_value(value)}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        return {key: child.snapshot() for key, child in self.children()}
+
+
+class Gauge(_Family):
+    """Values read from a callback at export time, keyed by label values"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Dict[Tuple[str, ...], float]],
+                 labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        try:
+            return dict(sorted(self.callback().items()))
+        except Exception:
+            logger.exception("Reading gauge %s failed", self.name)
+            return {}
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+                                for key, value in self.snapshot().items()]
+
+
+class MetricsRegistry:
+    """Counters, latency histograms and gauges for one process.
+
+    Families are created once (normally at import) and looked up by name, so
+    registering the same name twice returns the existing family. ``render``
+    produces the Prometheus text exposition format; ``write_file`` and
+    ``serve`` export it to a textfile-collector file or a local endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families: Dict[str, _Family] = {}
+        self._server = None
+        self._writer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = cls(name, *args, **kwargs)
+            elif not isinstance(family, cls):
+                raise ValueError(f"metric {name} is already registered as a {family.kind}")
+            return family
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], Dict[Tuple[str, ...], float]],
+              labelnames: Tuple[str, ...] = ()) -> Gauge:
+        gauge = self._register(Gauge, name, documentation, callback, labelnames)
+        gauge.callback = callback
+        return gauge
+
+    def families(self) -> List[_Family]:
+        with self._lock:
+            return [self._families[name] for name in sorted(self._families)]
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values by metric name, for in-app display"""
+        return {family.name: family.snapshot() for family in self.families()}
+
+    # -- export ------------------------------------------------------------
+
+    def write_file(self, path: str):
+        """Write the exposition text to ``path`` via a temp file and rename"""
+        payload = self.render()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def write_periodically(self, path: str, interval: float = 10.0):
+        """Rewrite ``path`` every ``interval`` seconds and once more at exit"""
+        with self._lock:
+            if self._writer is not None:
+                return
+
+            def run():
+                while not self._stop.wait(interval):
+                    try:
+                        self.write_file(path)
+                    except OSError:
+                        logger.exception("Writing metrics to %s failed", path)
+
+            self._writer = threading.Thread(target=run, name="metrics-writer", daemon=True)
+            self._writer.start()
+        atexit.register(self.write_file, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve ``GET /metrics`` from a background thread"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        with self._lock:
+            if self._server is not None:
+                return self._server
+            registry = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = registry.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((host, port), Handler)
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+            return self._server
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_registry() -> MetricsRegistry:
+    """Registry the app's hot paths record into"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+        return _default_registry
+
+
+_exporters_started = False
+
+
+def start_exporters(registry: Optional[MetricsRegistry] = None):
+    """Export as configured by TALENTSCOUT_METRICS_FILE / TALENTSCOUT_METRICS_PORT; safe to call repeatedly"""
+    global _exporters_started
+    with _default_registry_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    registry = registry or get_default_registry()
+    path = os.environ.get("TALENTSCOUT_METRICS_FILE")
+    if path:
+        registry.write_periodically(path, float(os.environ.get("TALENTSCOUT_METRICS_INTERVAL", "10")))
+    port = os.environ.get("TALENTSCOUT_METRICS_PORT")
+    if port:
+        try:
+            registry.serve(int(port), os.environ.get("TALENTSCOUT_METRICS_HOST", "127.0.0.1"))
+        except OSError as e:
+            # Another app process already owns the port
+            logger.warning("Metrics endpoint on port %s unavailable: %s", port, e)
@@ -0,0 +1,66 @@
+import streamlit as st
+
+from candidate_analytics import ALL_TIME, DIMENSIONS, EXPERIENCE_BANDS, get_default_aggregates
+
+TOP_VALUES = 15
+
+
+def top_counts(counts, limit=TOP_VALUES):
+    return dict(sorted(counts.items(), key=lambda item: -item[1])[:limit])
+
+
+def main():
+    st.set_page_config(page_title="TalentScout Dashboard", page_icon="📊", layout="wide")
+    st.title("📊 Recruiter Dashboard")
+
+    # Only the precomputed aggregates are read, never the candidate records
+    aggregates = get_default_aggregates().to_dict()
+    weeks = sorted((week for week in aggregates['weeks'] if week not in (ALL_TIME, "unknown")), reverse=True)
+    periods = {"All time": ALL_TIME, **{f"Week {week}": week for week in weeks}}
+    bucket = aggregates['weeks'][periods[st.selectbox("Period", list(periods))]]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Candidates", bucket['candidates'])
+    col2.metric("Technologies", len(bucket['technology']))
+    col3.metric("Locations", len(bucket['location']))
+    st.caption(f"Aggregates updated {aggregates['updated_at'] or 'never'}")
+
+    if not bucket['candidates']:
+        st.info("No candidates in this period yet.")
+        return
+
+    labels = {'technology': "Tech stack", 'position': "Position",
+              'location': "Location", 'experience': "Experience (years)"}
+    left, right = st.columns(2)
+    for number, dimension in enumerate(DIMENSIONS):
+        counts = bucket[dimension]
+        if dimension == 'experience':
+            counts = {label: counts[label] for label, _ in EXPERIENCE_BANDS + (("unknown", None),) if label in counts}
+        else:
+            counts = top_counts(counts)
+        with (left if number % 2 == 0 else right):
+            st.subheader(labels[dimension])
+            st.bar_chart({'candidates': counts})
+
+    st.subheader("Completion rate per technology (all time)")
+    st.dataframe([
+        {'technology': tech, 'candidates asked': stats['asked'], 'reached last question': stats['completed'],
+         'completion rate': f"{stats['completed'] / stats['asked']:.0%}" if stats['asked'] else "-"}
+        for tech, stats in sorted(aggregates['completion'].items(), key=lambda item: -item[1]['asked'])
+    ])
+
+    st.subheader("Answers per question (all time)")
+    rows = []
+    for tech, questions in sorted(aggregates['questions'].items()):
+        for question_key, stats in sorted(questions.items(), key=lambda item: int(item[0].lstrip("Q") or 0)):
+            responses = stats['answered'] + stats['skipped']
+            rows.append({
+                'technology': tech, 'question': question_key, 'answered': stats['answered'],
+                'skipped': stats['skipped'],
+                'answer rate': f"{stats['answered'] / responses:.0%}" if responses else "-",
+                'avg answer length': round(stats['answer_chars'] / stats['answered']) if stats['answered'] else 0,
+            })
+    st.dataframe(rows)
+
+
+main()
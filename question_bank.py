@@ -0,0 +1,208 @@
+import difflib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _load_yaml(f) -> Any:
+    """Parsed YAML; PyYAML is imported only when a bank has YAML files"""
+    import yaml
+    return yaml.safe_load(f)
+
+
+DEFAULT_QUESTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions")
+GENERIC_KEY = "*"
+
+_VERSION_SUFFIX = re.compile(r"[\s\-_]*v?\d+(?:\.\d+)*$")
+_NON_ALNUM = re.compile(r"[^a-z0-9+#]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_key(tech: str) -> str:
+    """Lowercase, trim and collapse whitespace"""
+    return _WHITESPACE.sub(" ", tech.strip().lower())
+
+
+def _key_variants(key: str) -> List[str]:
+    """Progressively looser spellings of a normalized key"""
+    variants = [key]
+    unversioned = _VERSION_SUFFIX.sub("", key)
+    if unversioned and unversioned != key:
+        variants.append(unversioned)
+    for variant in list(variants):
+        compact = _NON_ALNUM.sub("", variant)
+        if compact and compact not in variants:
+            variants.append(compact)
+    return variants
+
+
+class _CompiledBank:
+    """Immutable lookup tables built from one load of the bank directory"""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.questions: Dict[str, List[str]] = {}
+        self.aliases: Dict[str, str] = {}
+        self.rubrics: Dict[str, List[str]] = {}
+        self.generic: List[str] = []
+        # Questions by raw spelling, generic ones included, for this load only
+        self.by_spelling: Dict[str, List[str]] = {}
+        for entry in entries:
+            canonical = normalize_key(entry['technology'])
+            questions = list(entry['questions'])
+            if canonical == GENERIC_KEY:
+                self.generic = questions
+                continue
+            self.questions[canonical] = questions
+            for question, rubric in zip(questions, entry.get('rubrics', [])):
+                self.rubrics[question] = list(rubric)
+            for alias in [canonical, *entry.get('aliases', [])]:
+                for variant in _key_variants(normalize_key(alias)):
+                    self.aliases.setdefault(variant, canonical)
+        self.alias_keys = sorted(self.aliases)
+
+
+class QuestionBank:
+    """Question templates loaded from a directory of JSON (or YAML) files.
+
+    Each file holds ``technology``, optional ``aliases``, ``questions`` and
+    ``rubrics`` (expected keywords per question, used for scoring);
+    ``_generic`` holds fallback templates with a ``{tech}`` placeholder.
+    Lookups go through a precomputed alias index, then a fuzzy match for
+    misspellings; resolved spellings are memoized. Files are re-scanned at
+    most every ``reload_interval`` seconds and the bank is rebuilt when any
+    of them changed. YAML files are skipped, with a warning, without PyYAML.
+    """
+
+    def __init__(self, directory: str = DEFAULT_QUESTIONS_DIR,
+                 reload_interval: float = 2.0,
+                 fuzzy_cutoff: float = 0.8):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._reload_lock = threading.Lock()
+        self._signature = None
+        self._next_check = 0.0
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._bank = _CompiledBank([])
+        self.reload()
+
+    def _scan(self) -> Tuple[Tuple[str, int, int], ...]:
+        signature = []
+        if os.path.isdir(self.directory):
+            for name in sorted(os.listdir(self.directory)):
+                if name.endswith((".json", ".yaml", ".yml")):
+                    stat = os.stat(os.path.join(self.directory, name))
+                    signature.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load_entries(self, signature) -> List[Dict[str, Any]]:
+        entries = []
+        for name, _, _ in signature:
+            path = os.path.join(self.directory, name)
+            with open(path, "r", encoding="utf-8") as f:
+                if name.endswith(".json"):
+                    data = json.load(f)
+                else:
+                    try:
+                        data = _load_yaml(f)
+                    except ImportError:  # PyYAML is optional; JSON banks always work
+                        logger.warning("PyYAML is not installed; skipping question file %s", path)
+                        continue
+                    if data is None:
+                        continue
+            entries.extend(data if isinstance(data, list) else [data])
+        return entries
+
+    def reload(self) -> bool:
+        """Rebuild the bank if its files changed; returns True when reloaded"""
+        with self._reload_lock:
+            signature = self._scan()
+            self._next_check = time.monotonic() + self.reload_interval
+            if signature == self._signature:
+                return False
+            self._bank = _CompiledBank(self._load_entries(signature))
+            self._resolved = {}
+            self._signature = signature
+            return True
+
+    def _current(self) -> _CompiledBank:
+        if time.monotonic() >= self._next_check:
+            self.reload()
+        return self._bank
+
+    def canonical(self, tech: str) -> Optional[str]:
+        """Canonical technology name for ``tech``, or None if unknown"""
+        return self._canonical(self._current(), tech)
+
+    def _canonical(self, bank: _CompiledBank, tech: str) -> Optional[str]:
+        # Raw spellings are memoized, so repeat lookups are a single dict hit
+        cache = self._resolved
+        try:
+            return cache[tech]
+        except KeyError:
+            pass
+        key = normalize_key(tech)
+        # An exact alias needs neither the looser variants nor the fuzzy match
+        result = bank.aliases.get(key)
+        if result is None:
+            result = self._resolve(bank, key)
+        if len(cache) >= 4096:
+            cache.clear()
+        cache[tech] = result
+        return result
+
+    def _resolve(self, bank: _CompiledBank, key: str) -> Optional[str]:
+        for variant in _key_variants(key):
+            canonical = bank.aliases.get(variant)
+            if canonical is not None:
+                return canonical
+        if len(key) >= 3:
+            matches = difflib.get_close_matches(key, bank.alias_keys, n=1, cutoff=self.fuzzy_cutoff)
+            if matches:
+                return bank.aliases[matches[0]]
+        return None
+
+    def questions_for(self, tech: str) -> List[str]:
+        """Questions for ``tech``, falling back to the generic templates.
+
+        Lists are shared per spelling and bank load; treat them as read-only.
+        """
+        bank = self._current()
+        memo = bank.by_spelling
+        questions = memo.get(tech)
+        if questions is None:
+            canonical = self._canonical(bank, tech)
+            if canonical is not None:
+                questions = bank.questions[canonical]
+            else:
+                questions = [question.format(tech=tech) for question in bank.generic]
+            if len(memo) >= 4096:
+                memo.clear()
+            memo[tech] = questions
+        return questions
+
+    def rubric_for(self, question: str) -> Optional[List[str]]:
+        """Expected keywords for a bank question, or None if it has no rubric"""
+        return self._current().rubrics.get(question)
+
+    def rubrics(self) -> Dict[str, List[str]]:
+        """Every bank question with a rubric, mapped to its expected keywords"""
+        return dict(self._current().rubrics)
+
+    def technologies(self) -> List[str]:
+        """Canonical names of every technology in the bank"""
+        return sorted(self._current().questions)
+
+
+_default_bank = QuestionBank()
+
+
+def get_question_bank() -> QuestionBank:
+    """Bank loaded from ``questions/`` when this module is first imported"""
+    return _default_bank
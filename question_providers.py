@@ -0,0 +1,256 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Any, Optional, Tuple
+
+from question_bank import get_question_bank, normalize_key
+
+QUESTIONS_PER_TECHNOLOGY = 5
+
+DEFAULT_LLM_ENDPOINT = os.environ.get("TALENTSCOUT_LLM_ENDPOINT", "https://api.openai.com/v1")
+DEFAULT_LLM_MODEL = os.environ.get("TALENTSCOUT_LLM_MODEL", "gpt-4o-mini")
+DEFAULT_CACHE_DIR = ".question_cache"
+MAX_LLM_PROVIDERS = 32
+
+logger = logging.getLogger(__name__)
+
+
+def seniority_for(years_experience: Any) -> str:
+    """Bucket years of experience into the level questions are pitched at"""
+    try:
+        years = int(str(years_experience).strip())
+    except (TypeError, ValueError):
+        return "mid"
+    if years < 3:
+        return "junior"
+    if years <= 7:
+        return "mid"
+    return "senior"
+
+
+class QuestionProvider:
+    """Source of technical questions for a candidate's tech stack"""
+
+    def questions_for_stack(self, tech_stack: List[str], seniority: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def refresh(self, tech_questions: List[Dict[str, Any]], index: int, seniority: str) -> bool:
+        """Called when the candidate reaches technology ``index``.
+
+        Providers may swap in better questions for it, as long as they never
+        block; returns True when ``tech_questions[index]`` was replaced.
+        """
+        return False
+
+
+class TemplateQuestionProvider(QuestionProvider):
+    """Static templates from the question bank"""
+
+    def questions_for_stack(self, tech_stack: List[str], seniority: str) -> List[Dict[str, Any]]:
+        bank = get_question_bank()
+        return [{'technology': tech, 'questions': bank.questions_for(tech)} for tech in tech_stack]
+
+
+class LLMQuestionProvider(QuestionProvider):
+    """Questions generated by an OpenAI-compatible chat completions endpoint.
+
+    Candidate turns never wait on the network: questions come from an
+    in-memory LRU or the on-disk cache (keyed by canonical technology and
+    seniority) when present, and from the template provider otherwise. Any
+    technologies missing from the cache are requested in one batched call
+    in the background, and when the candidate moves on to a technology its
+    questions are swapped in if they have arrived, with the next one
+    prefetched. Failed or timed-out requests simply leave the templates.
+    """
+
+    def __init__(self, api_key: str,
+                 endpoint: str = DEFAULT_LLM_ENDPOINT,
+                 model: str = DEFAULT_LLM_MODEL,
+                 timeout: float = 10.0,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 lru_size: int = 512,
+                 fallback: Optional[QuestionProvider] = None):
+        self.api_key = api_key
+        self.endpoint = endpoint.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.lru_size = lru_size
+        self.fallback = fallback or TemplateQuestionProvider()
+        self._lru: "OrderedDict[Tuple[str, str], List[str]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="question-prefetch")
+        self.stats = {'requests': 0, 'failures': 0, 'cache_hits': 0, 'fallbacks': 0}
+
+    # -- caching -----------------------------------------------------------
+
+    @staticmethod
+    def cache_key(tech: str, seniority: str) -> Tuple[str, str]:
+        canonical = get_question_bank().canonical(tech) or normalize_key(tech)
+        return canonical, seniority
+
+    def _disk_path(self, key: Tuple[str, str]) -> str:
+        digest = hashlib.sha1("|".join(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def cached(self, key: Tuple[str, str]) -> Optional[List[str]]:
+        with self._lock:
+            questions = self._lru.get(key)
+            if questions is not None:
+                self._lru.move_to_end(key)
+                return questions
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    questions = json.load(f)['questions']
+            except (OSError, ValueError, KeyError):
+                return None
+            self._remember(key, questions, persist=False)
+            return questions
+        return None
+
+    def _remember(self, key: Tuple[str, str], questions: List[str], persist: bool = True):
+        with self._lock:
+            self._lru[key] = questions
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+        if persist and self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({'technology': key[0], 'seniority': key[1], 'questions': questions}, f)
+            os.replace(tmp_path, path)
+
+    # -- fetching ----------------------------------------------------------
+
+    def _prefetch(self, keys: List[Tuple[str, str]]):
+        """Request every key not cached or already in flight, in one batch"""
+        uncached = [key for key in dict.fromkeys(keys) if self.cached(key) is None]
+        with self._lock:
+            missing = [key for key in uncached if key not in self._in_flight]
+            if not missing:
+                return
+            future = self._executor.submit(self._fetch_batch, missing)
+            for key in missing:
+                self._in_flight[key] = future
+
+    def _fetch_batch(self, keys: List[Tuple[str, str]]):
+        try:
+            by_seniority: Dict[str, List[str]] = {}
+            for tech, seniority in keys:
+                by_seniority.setdefault(seniority, []).append(tech)
+            for seniority, techs in by_seniority.items():
+                self.stats['requests'] += 1
+                for tech, questions in self.request_questions(techs, seniority).items():
+                    self._remember((tech, seniority), questions)
+        except Exception:
+            # Whatever went wrong, the candidate keeps the templates
+            logger.warning("Question request for %s failed", keys, exc_info=True)
+            self.stats['failures'] += 1
+        finally:
+            with self._lock:
+                for key in keys:
+                    self._in_flight.pop(key, None)
+
+    def request_questions(self, techs: List[str], seniority: str) -> Dict[str, List[str]]:
+        """One chat completions call returning questions for every technology"""
+        import urllib.request  # only LLM-backed providers need the HTTP stack
+
+        prompt = (
+            f"Write {QUESTIONS_PER_TECHNOLOGY} technical screening questions for a {seniority} "
+            f"candidate for each of these technologies: {', '.join(techs)}. Make the last question "
+            "for each technology start with 'CODING TASK (Optional):'. Reply with a JSON object "
+            "mapping each technology name exactly as given to a list of question strings."
+        )
+        body = json.dumps({
+            'model': self.model,
+            'messages': [
+                {'role': 'system', 'content': "You are a technical interviewer. Reply with JSON only."},
+                {'role': 'user', 'content': prompt},
+            ],
+            'response_format': {'type': 'json_object'},
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.endpoint}/chat/completions", data=body, method="POST",
+            headers={'Content-Type': 'application/json', 'Authorization': f"Bearer {self.api_key}"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            payload = json.load(response)
+
+        content = json.loads(payload['choices'][0]['message']['content'])
+        result = {}
+        for tech in techs:
+            questions = content.get(tech)
+            if isinstance(questions, list) and questions and all(isinstance(q, str) for q in questions):
+                result[tech] = questions[:QUESTIONS_PER_TECHNOLOGY]
+        return result
+
+    # -- provider API ------------------------------------------------------
+
+    def questions_for_stack(self, tech_stack: List[str], seniority: str) -> List[Dict[str, Any]]:
+        keys = [self.cache_key(tech, seniority) for tech in tech_stack]
+        templates = None
+        missing = []
+        result = []
+        for i, (tech, key) in enumerate(zip(tech_stack, keys)):
+            questions = self.cached(key)
+            if questions is None:
+                if templates is None:
+                    templates = self.fallback.questions_for_stack(tech_stack, seniority)
+                questions = templates[i]['questions']
+                missing.append(key)
+                self.stats['fallbacks'] += 1
+            else:
+                self.stats['cache_hits'] += 1
+            result.append({'technology': tech, 'questions': questions})
+        if missing:
+            self._prefetch(missing)
+        return result
+
+    def refresh(self, tech_questions: List[Dict[str, Any]], index: int, seniority: str) -> bool:
+        if index + 1 < len(tech_questions):
+            self._prefetch([self.cache_key(tech_questions[index + 1]['technology'], seniority)])
+        if index >= len(tech_questions):
+            return False
+        tech_qa = tech_questions[index]
+        questions = self.cached(self.cache_key(tech_qa['technology'], seniority))
+        if questions is None or questions is tech_qa['questions']:
+            return False
+        tech_questions[index] = {'technology': tech_qa['technology'], 'questions': questions}
+        return True
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+_template_provider = TemplateQuestionProvider()
+_llm_providers: "OrderedDict[str, LLMQuestionProvider]" = OrderedDict()
+_llm_providers_lock = threading.Lock()
+
+
+def get_question_provider(api_key: Optional[str] = None) -> QuestionProvider:
+    """Shared provider for an API key; templates when no key is set.
+
+    The ``MAX_LLM_PROVIDERS`` most recently used keys keep their provider;
+    older ones are closed, shutting down their prefetch threads.
+    """
+    if not api_key:
+        return _template_provider
+    evicted = []
+    with _llm_providers_lock:
+        provider = _llm_providers.get(api_key)
+        if provider is None:
+            provider = LLMQuestionProvider(api_key)
+            _llm_providers[api_key] = provider
+        _llm_providers.move_to_end(api_key)
+        while len(_llm_providers) > MAX_LLM_PROVIDERS:
+            evicted.append(_llm_providers.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return provider
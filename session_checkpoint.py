@@ -0,0 +1,471 @@
+import json
+import logging
+import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+from conversation_engine import SessionState
+from metrics import get_default_registry
+from question_bank import get_question_bank
+from validators import mask_sensitive_data
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+DEFAULT_SESSION_DIR = ".sessions"
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+def _snapshot(session: SessionState) -> Dict[str, Any]:
+    # Contact details are stored masked; masking is idempotent, so the record
+    # saved after a resume is identical to one saved without it
+    return {
+        's': session.current_state,
+        'f': session.collected_fields,
+        't': session.current_tech_index,
+        'q': session.current_question_index,
+        'v': session.saved,
+        'd': mask_sensitive_data(session.candidate_data),
+        'tq': session.tech_questions,
+        'a': session.candidate_answers,
+    }
+
+
+def _shared_questions(tech_questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Point restored template questions back at the bank's shared lists"""
+    bank = get_question_bank()
+    for tech_qa in tech_questions:
+        questions = bank.questions_for(tech_qa['technology'])
+        if questions == tech_qa['questions']:
+            tech_qa['questions'] = questions
+    return tech_questions
+
+
+class _View:
+    """What the checkpoint on disk already holds for a session"""
+
+    __slots__ = ('scalars', 'data', 'answered', 'questions', 'seq', 'deltas')
+
+    def __init__(self, session: SessionState, seq: int):
+        self.scalars = (session.current_state, session.collected_fields,
+                        session.current_tech_index, session.current_question_index, session.saved)
+        self.data = dict(session.candidate_data)
+        self.answered = {(tech, key) for tech, answers in session.candidate_answers.items() for key in answers}
+        self.questions = tuple(map(id, session.tech_questions))
+        self.seq = seq
+        self.deltas = 0
+
+
+class SessionCheckpointer:
+    """Per-session snapshot plus an append-only delta log on disk.
+
+    ``checkpoint`` appends one small JSON line holding only what changed since
+    the last call (new fields, new answers, indices), so a turn costs one
+    short append however long the screening is. After ``compact_every``
+    deltas, or when asked, the snapshot is rewritten (temp file plus rename)
+    and the log emptied; every line carries a sequence number, so replaying
+    after a crash between the two steps skips lines the snapshot covers.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SESSION_DIR, compact_every: int = 16, fsync: bool = False):
+        self.directory = os.path.abspath(directory)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._views: Dict[str, _View] = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _paths(self, token: str) -> Tuple[str, str]:
+        if not TOKEN_PATTERN.match(token or ""):
+            raise ValueError("invalid session token")
+        base = os.path.join(self.directory, token)
+        return base + ".snap", base + ".log"
+
+    def checkpoint(self, token: str, session: SessionState):
+        """Persist the changes since the last checkpoint of ``token``"""
+        view = self._views.get(token)
+        delta = self._delta(view, session) if view is not None else None
+        if delta is None:
+            self.compact(token, session)
+            return
+        if not delta:
+            return
+        view.seq += 1
+        delta['n'] = view.seq
+        _, log_path = self._paths(token)
+        line = (json.dumps(delta, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line)
+            if self.fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        new_view = _View(session, view.seq)
+        new_view.deltas = view.deltas + 1
+        self._views[token] = new_view
+        if new_view.deltas >= self.compact_every:
+            self.compact(token, session)
+
+    @staticmethod
+    def _delta(view: _View, session: SessionState) -> Optional[Dict[str, Any]]:
+        """Changes since ``view``, or None when only a full snapshot can describe them"""
+        answered = sum(len(answers) for answers in session.candidate_answers.values())
+        if answered < len(view.answered) or not view.data.keys() <= session.candidate_data.keys():
+            return None  # restarted
+        delta: Dict[str, Any] = {}
+        scalars = (session.current_state, session.collected_fields,
+                   session.current_tech_index, session.current_question_index, session.saved)
+        if scalars != view.scalars:
+            delta['s'], delta['f'], delta['t'], delta['q'], delta['v'] = scalars
+        data = {key: value for key, value in session.candidate_data.items() if view.data.get(key) != value}
+        if data:
+            delta['d'] = mask_sensitive_data(data)
+        if answered > len(view.answered):
+            delta['a'] = [[tech, key, answer] for tech, answers in session.candidate_answers.items()
+                          for key, answer in answers.items() if (tech, key) not in view.answered]
+        if tuple(map(id, session.tech_questions)) != view.questions:
+            delta['tq'] = session.tech_questions
+        return delta
+
+    def compact(self, token: str, session: SessionState):
+        """Rewrite the snapshot from ``session`` and empty the delta log"""
+        snapshot_path, log_path = self._paths(token)
+        view = self._views.get(token)
+        seq = (view.seq if view is not None else self._last_seq(token)) + 1
+        snapshot = _snapshot(session)
+        snapshot['n'] = seq
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        try:
+            os.remove(log_path)
+        except FileNotFoundError:
+            pass
+        self._views[token] = _View(session, seq)
+
+    def _last_seq(self, token: str) -> int:
+        loaded = self._read(token)
+        return loaded[1] if loaded is not None else 0
+
+    def _read(self, token: str) -> Optional[Tuple[Dict[str, Any], int, int, bool]]:
+        """(state dict, last sequence number, deltas replayed, torn tail) from disk"""
+        snapshot_path, log_path = self._paths(token)
+        state: Optional[Dict[str, Any]] = None
+        try:
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            pass
+        seq = state['n'] if state is not None else 0
+        replayed = 0
+        torn = False
+        try:
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        torn = True  # a crash mid-append
+                        break
+                    if delta['n'] <= seq:
+                        continue
+                    if state is None:
+                        state = {'s': None, 'f': 0, 't': 0, 'q': 0, 'v': False, 'd': {}, 'tq': [], 'a': {}}
+                    for key in ('s', 'f', 't', 'q', 'v', 'tq'):
+                        if key in delta:
+                            state[key] = delta[key]
+                    state['d'].update(delta.get('d', {}))
+                    for tech, key, answer in delta.get('a', ()):
+                        state['a'].setdefault(tech, {})[key] = answer
+                    seq = delta['n']
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+        if state is None:
+            return None
+        return state, seq, replayed, torn
+
+    def load(self, token: str) -> Optional[SessionState]:
+        """Restore a session exactly where it was checkpointed, or None"""
+        loaded = self._read(token)
+        if loaded is None:
+            return None
+        state, seq, replayed, torn = loaded
+        session = SessionState()
+        session.current_state = state['s']
+        session.collected_fields = state['f']
+        session.current_tech_index = state['t']
+        session.current_question_index = state['q']
+        session.saved = state.get('v', False)
+        session.candidate_data = state['d']
+        session.tech_questions = _shared_questions(state['tq'])
+        session.candidate_answers = state['a']
+        view = _View(session, seq)
+        view.deltas = replayed
+        self._views[token] = view
+        if torn:
+            # Later appends would land after the torn line and be unreadable
+            self.compact(token, session)
+        return session
+
+    def forget(self, token: str):
+        """Drop the in-memory view of a session (its files stay on disk)"""
+        self._views.pop(token, None)
+
+    def discard(self, token: str):
+        """Delete a session's checkpoint"""
+        self._views.pop(token, None)
+        for path in self._paths(token):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def purge(self, max_age: float) -> int:
+        """Delete checkpoints not written for ``max_age`` seconds; returns how many"""
+        cutoff = time.time() - max_age
+        removed = 0
+        for name in os.listdir(self.directory):
+            token, _, extension = name.rpartition(".")
+            if extension not in ("snap", "log") or not TOKEN_PATTERN.match(token):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.stat(path).st_mtime < cutoff and token not in self._views:
+                    os.remove(path)
+                    removed += extension == "snap"
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+def session_size(session: SessionState) -> int:
+    """Approximate bytes held by a session, not counting shared bank questions"""
+    size = sys.getsizeof(session) + sys.getsizeof(session.candidate_data) + sys.getsizeof(session.candidate_answers)
+    for key, value in session.candidate_data.items():
+        size += sys.getsizeof(value)
+        if isinstance(value, list):
+            size += sum(sys.getsizeof(item) for item in value)
+    for answers in session.candidate_answers.values():
+        size += sys.getsizeof(answers)
+        for answer in answers.values():
+            size += sys.getsizeof(answer) + sys.getsizeof(answer['answer'])
+    bank = get_question_bank()
+    size += sys.getsizeof(session.tech_questions)
+    for tech_qa in session.tech_questions:
+        size += sys.getsizeof(tech_qa)
+        questions = tech_qa['questions']
+        if questions is not bank.questions_for(tech_qa['technology']):
+            size += sys.getsizeof(questions) + sum(sys.getsizeof(question) for question in questions)
+    return size
+
+
+class SessionManager:
+    """Live sessions by resume token, with idle ones evicted to disk.
+
+    Sessions are kept in LRU order with an estimated size each; when the
+    total passes ``memory_budget`` bytes the least recently used ones are
+    compacted to disk and dropped from memory. ``get`` brings an evicted
+    session back from its checkpoint, so a candidate returning with their
+    token (after a refresh, a restart or an eviction) continues at the same
+    technology and question. A saved screening's checkpoint is deleted,
+    since the store now holds the (masked) record.
+
+    The manager lock only guards the in-memory bookkeeping. Disk I/O runs
+    under one of ``lock_stripes`` per-token locks, so a turn writing its
+    checkpoint never waits on other sessions' writes.
+    """
+
+    def __init__(self, checkpointer: Optional[SessionCheckpointer] = None,
+                 memory_budget: int = 64 * 1024 * 1024, lock_stripes: int = 64):
+        self.checkpointer = checkpointer or SessionCheckpointer()
+        self.memory_budget = memory_budget
+        self._lock = threading.Lock()
+        self._token_locks = [threading.Lock() for _ in range(lock_stripes)]
+        self._sessions: "OrderedDict[str, Tuple[SessionState, int]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+        self.resumes = 0
+        self._purger: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _token_lock(self, token: str) -> threading.Lock:
+        return self._token_locks[hash(token) % len(self._token_locks)]
+
+    def create(self) -> Tuple[str, SessionState]:
+        token = secrets.token_urlsafe(16)
+        session = SessionState()
+        with self._lock:
+            evicted = self._put(token, session)
+        self._write_evicted(evicted)
+        return token, session
+
+    def get(self, token: str) -> Optional[SessionState]:
+        """The live session for ``token``, resumed from disk if evicted; None if unknown"""
+        if not token or not TOKEN_PATTERN.match(token):
+            return None
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is not None:
+                self._sessions.move_to_end(token)
+                return entry[0]
+        with self._token_lock(token):
+            session = self.checkpointer.load(token)
+        if session is None:
+            return None
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is not None:
+                # Resumed by a concurrent request meanwhile
+                self._sessions.move_to_end(token)
+                return entry[0]
+            self.resumes += 1
+            evicted = self._put(token, session)
+        self._write_evicted(evicted)
+        return session
+
+    def checkpoint(self, token: str, session: SessionState):
+        """Persist a session's latest turn and account for its new size"""
+        with self._token_lock(token):
+            if session.saved:
+                self.checkpointer.discard(token)
+            else:
+                self.checkpointer.checkpoint(token, session)
+        with self._lock:
+            evicted = self._put(token, session)
+        self._write_evicted(evicted)
+
+    def discard(self, token: str):
+        with self._lock:
+            entry = self._sessions.pop(token, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+        with self._token_lock(token):
+            self.checkpointer.discard(token)
+
+    def evict(self, token: str) -> bool:
+        """Move one session to disk"""
+        with self._lock:
+            entry = self._pop(token)
+        if entry is None:
+            return False
+        self._write_evicted([(token, entry)])
+        return True
+
+    def evict_idle(self, count: int) -> int:
+        """Move the ``count`` least recently used sessions to disk"""
+        with self._lock:
+            evicted = [(token, self._pop(token)) for token in list(self._sessions)[:count]]
+        self._write_evicted(evicted)
+        return len(evicted)
+
+    def _put(self, token: str, session: SessionState) -> List[Tuple[str, SessionState]]:
+        """Account for ``token`` (lock held); returns the sessions evicted to make room"""
+        size = session_size(session)
+        previous = self._sessions.pop(token, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._sessions[token] = (session, size)
+        self._bytes += size
+        evicted = []
+        while self._bytes > self.memory_budget and len(self._sessions) > 1:
+            oldest = next(iter(self._sessions))
+            evicted.append((oldest, self._pop(oldest)))
+        return evicted
+
+    def _pop(self, token: str) -> Optional[SessionState]:
+        """Drop a session from memory (lock held)"""
+        entry = self._sessions.pop(token, None)
+        if entry is None:
+            return None
+        self._bytes -= entry[1]
+        self.evictions += 1
+        return entry[0]
+
+    def _write_evicted(self, evicted: List[Tuple[str, SessionState]]):
+        """Leave evicted sessions on disk as a single snapshot, outside the manager lock"""
+        for token, session in evicted:
+            with self._token_lock(token):
+                if session.saved:
+                    self.checkpointer.discard(token)
+                else:
+                    # One file to read on resume
+                    self.checkpointer.compact(token, session)
+                    self.checkpointer.forget(token)
+
+    def purge(self, max_age: float) -> int:
+        """Delete checkpoints of sessions abandoned for ``max_age`` seconds; returns how many"""
+        return self.checkpointer.purge(max_age)
+
+    def purge_periodically(self, max_age: float, interval: float = 3600.0):
+        """Run ``purge(max_age)`` now and then every ``interval`` seconds"""
+        with self._lock:
+            if self._purger is not None:
+                return
+
+            def run():
+                while True:
+                    try:
+                        self.purge(max_age)
+                    except OSError:
+                        logger.exception("Purging session checkpoints in %s failed", self.checkpointer.directory)
+                    if self._stop.wait(interval):
+                        return
+
+            self._purger = threading.Thread(target=run, name="session-purger", daemon=True)
+            self._purger.start()
+
+    def states(self) -> Dict[str, int]:
+        """In-memory sessions by conversation state"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for session, _ in self._sessions.values():
+                counts[session.current_state] = counts.get(session.current_state, 0) + 1
+            return counts
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'in_memory': len(self._sessions), 'memory_bytes': self._bytes,
+                    'memory_budget': self.memory_budget, 'evictions': self.evictions,
+                    'resumes': self.resumes}
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Process-wide manager shared by every browser session.
+
+    Checkpoints untouched for ``TALENTSCOUT_SESSION_MAX_AGE`` seconds (a day
+    by default) are purged hourly.
+    """
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            manager = SessionManager(SessionCheckpointer(
+                os.environ.get("TALENTSCOUT_SESSION_DIR", DEFAULT_SESSION_DIR)))
+            max_age = float(os.environ.get("TALENTSCOUT_SESSION_MAX_AGE", DEFAULT_MAX_AGE))
+            manager.purge_periodically(max_age, min(max_age, 3600.0))
+            get_default_registry().gauge(
+                "talentscout_sessions", "Sessions held in memory by conversation state",
+                lambda: {(state,): count for state, count in manager.states().items()}, ("state",))
+            _default_manager = manager
+        return _default_manager
@@ -0,0 +1,35 @@
+import pytest
+
+from answer_scoring import AnswerScorer
+from question_bank import get_question_bank
+
+QUESTION = get_question_bank().questions_for("Python")[0]
+
+
+def record(*answers):
+    return {'technical_answers': {'Python': {
+        f"Q{n}": {'question': QUESTION, 'answer': answer} for n, answer in enumerate(answers, start=1)}}}
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return AnswerScorer()
+
+
+def test_answer_containing_separator_keeps_rows_aligned(scorer):
+    records = [
+        record("lists are mutable #0# #0# tuples are immutable", "no idea"),
+        record("tuples are immutable and hashable, lists are mutable", "#0#"),
+        record("lists are mutable, tuples immutable"),
+        record("mutable\x00 \x00immutable \x00", "\x00"),
+    ]
+    batch_scores = scorer.score_records(records)
+    alone = [scorer.score_records([r])[0] for r in records]
+    assert batch_scores == pytest.approx(alone)
+    assert min(batch_scores) > 0.0
+
+
+def test_answer_scores_follow_their_own_answer(scorer):
+    scores = scorer.score_answers(record("#0# #0# #0#", "lists are mutable, tuples are immutable"))
+    assert scores['Python']['Q1'] == 0.0
+    assert scores['Python']['Q2'] > 0.0
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+import bulk_io
+
+VALID = {
+    "full_name": "Asha Rao", "email": "asha.rao@example.com", "phone": "+1 555 123 4567",
+    "years_experience": "5", "desired_position": "Backend Engineer", "current_location": "Pune",
+    "tech_stack": ["Python", "SQL"],
+    "technical_answers": {"Python": {"Q1": {"question": "What is a tuple?", "answer": "An immutable sequence."}}},
+}
+
+
+@pytest.mark.parametrize("field, value", [
+    ("tech_stack", ["python", 5]),
+    ("tech_stack", {"python": 1}),
+    ("technical_answers", [1, 2]),
+    ("technical_answers", {"Python": [1]}),
+    ("technical_answers", {"Python": {"Q1": "an answer"}}),
+    ("technical_answers", {"Python": {"Q1": {"question": "q", "answer": 5}}}),
+])
+def test_malformed_nested_fields_are_rejected(field, value):
+    accepted, rejected = bulk_io.process_chunk([(1, dict(VALID, **{field: value})), (2, VALID)])
+    assert len(accepted) == 1
+    assert [reject['line'] for reject in rejected] == [1]
+    assert rejected[0]['reasons'][0].startswith("malformed row")
+
+
+def test_import_reports_bad_rows_and_keeps_going(tmp_path):
+    source = tmp_path / "rows.jsonl"
+    rows = [VALID, dict(VALID, tech_stack=["python", 5]), dict(VALID, technical_answers=[1, 2]), VALID]
+    source.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    rejects = tmp_path / "rejects.jsonl"
+    store_path = tmp_path / "candidates.jsonl"
+
+    assert bulk_io.main(["--store", "jsonl", "--store-path", str(store_path), "import", str(source),
+                         "--rejects", str(rejects), "--workers", "1", "--chunk-size", "2"]) == 0
+
+    assert [json.loads(line)['line'] for line in rejects.read_text().splitlines()] == [2, 3]
+    assert len(store_path.read_text().splitlines()) == 2
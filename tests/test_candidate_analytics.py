@@ -0,0 +1,30 @@
+from candidate_analytics import CandidateAggregates
+from question_bank import get_question_bank
+
+
+def _answers(count):
+    return {f"q{n}": {'question': f"Question {n}", 'answer': "An answer"} for n in range(1, count + 1)}
+
+
+def test_completion_counts_every_listed_technology_against_the_questions_stored():
+    aggregates = CandidateAggregates()
+    aggregates.add_records([
+        # Quit before reaching Docker, and was given only two Python questions
+        {'tech_stack': ["Python", "Docker"], 'technical_answers': {"Python": _answers(2)},
+         'technical_questions': {"Python": 2, "Docker": 3}},
+        {'tech_stack': ["Python"], 'technical_answers': {"Python": _answers(1)},
+         'technical_questions': {"Python": 2}},
+    ])
+    completion = aggregates.to_dict()['completion']
+    assert completion['python'] == {'asked': 2, 'completed': 1}
+    assert completion['docker'] == {'asked': 1, 'completed': 0}
+
+
+def test_completion_falls_back_to_the_templates_for_older_records():
+    templates = len(get_question_bank().questions_for("Python"))
+    aggregates = CandidateAggregates()
+    aggregates.add_records([
+        {'tech_stack': ["Python"], 'technical_answers': {"Python": _answers(templates)}},
+        {'tech_stack': ["Python"], 'technical_answers': {"Python": _answers(templates - 1)}},
+    ])
+    assert aggregates.to_dict()['completion']['python'] == {'asked': 2, 'completed': 1}
@@ -0,0 +1,27 @@
+from candidate_dedup import DuplicateIndex
+from candidate_store import JsonlCandidateStore
+
+CANDIDATE = {
+    "full_name": "Asha Rao", "email": "asha.rao@example.com", "phone": "+1 555 123 4567",
+    "years_experience": "5", "desired_position": "Backend Engineer", "current_location": "Pune",
+    "tech_stack": ["Python", "SQL"],
+    "technical_answers": {"Python": {"Q1": {"question": "q", "answer": "tuples are immutable sequences"}}},
+}
+
+
+def test_save_during_initial_load_is_still_checked(tmp_path):
+    store = JsonlCandidateStore(str(tmp_path / "candidates.jsonl"))
+    store.append_many([dict(CANDIDATE, full_name=f"Other Person {n}", tech_stack=["Go"]) for n in range(4)])
+    index = DuplicateIndex()
+    load = index.add_records
+
+    def slow_load(batch, check=True):
+        load(batch, check=check)
+        if not check and index._size == 2:
+            store.append(CANDIDATE)  # saved while the index is still loading
+
+    index.add_records = slow_load
+    index.follow(store, batch_size=2)
+    store.append(dict(CANDIDATE))
+    assert index._size == 6
+    assert index.matches
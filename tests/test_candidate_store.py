@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from candidate_store import JsonlCandidateStore, SqliteCandidateStore, follow, migrate_json_array
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "jsonl":
+        store = JsonlCandidateStore(str(tmp_path / "candidates.jsonl"))
+    else:
+        store = SqliteCandidateStore(str(tmp_path / "candidates.db"))
+    yield store
+    store.close()
+
+
+def test_follow_sees_saves_made_while_loading_exactly_once(store):
+    store.append_many([{'n': n} for n in range(5)])
+    seen = []
+
+    def load(batch):
+        seen.extend(record['n'] for record in batch)
+        if len(seen) == 2:
+            store.append({'n': 100})  # saved while the existing records are being read
+
+    assert follow(store, load, lambda batch: seen.extend(record['n'] for record in batch), batch_size=2) >= 5
+    store.append({'n': 101})
+    assert sorted(seen) == [0, 1, 2, 3, 4, 100, 101]
+
+
+def test_torn_tail_written_after_open_is_trimmed_before_next_append(tmp_path):
+    path = str(tmp_path / "candidates.jsonl")
+    store = JsonlCandidateStore(path, fsync="never")
+    store.append({'n': 1})
+    with open(path, "ab") as f:
+        f.write(b'{"n": 2, "trunc')  # another writer crashed mid-line
+    store.append({'n': 3})
+    store.close()
+    assert [record['n'] for record in JsonlCandidateStore(path)] == [1, 3]
+
+
+def test_migrate_rejects_corrupt_json_and_keeps_the_source(tmp_path):
+    source = tmp_path / "candidates.json"
+    source.write_text('[{"n": 1}, {"n"')
+    store = JsonlCandidateStore(str(tmp_path / "candidates.jsonl"))
+    with pytest.raises(ValueError):
+        migrate_json_array(str(source), store)
+    assert source.exists() and not (tmp_path / "candidates.json.migrated").exists()
+    assert store.count() == 0
+
+
+def test_migrate_resumes_an_interrupted_import_without_duplicates(store, tmp_path):
+    source = tmp_path / "candidates.json"
+    source.write_text(json.dumps([{'n': n} for n in range(5)]))
+    append_many = store.append_many
+    calls = []
+
+    def failing_append_many(records):
+        calls.append(records)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        append_many(records)
+
+    store.append_many = failing_append_many
+    with pytest.raises(OSError):
+        migrate_json_array(str(source), store, batch_size=2)
+    store.append_many = append_many
+    assert migrate_json_array(str(source), store, batch_size=2) == 3
+    assert migrate_json_array(str(source), store, batch_size=2) == 0
+    assert sorted(record['n'] for record in store) == [0, 1, 2, 3, 4]
+    assert not source.exists() and (tmp_path / "candidates.json.migrated").exists()
+    assert not (tmp_path / "candidates.json.progress").exists()
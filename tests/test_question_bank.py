@@ -0,0 +1,31 @@
+import json
+import logging
+import sys
+
+from question_bank import QuestionBank
+
+
+def _write_bank(directory):
+    (directory / "python.json").write_text(json.dumps(
+        {'technology': "python", 'aliases': ["py"], 'questions': ["What is a generator?"]}))
+    (directory / "_generic.json").write_text(json.dumps(
+        {'technology': "*", 'questions': ["Why {tech}?"]}))
+    (directory / "go.yaml").write_text("technology: go\nquestions:\n  - What is a goroutine?\n")
+
+
+def test_yaml_files_are_skipped_with_a_warning_without_pyyaml(tmp_path, monkeypatch, caplog):
+    _write_bank(tmp_path)
+    monkeypatch.setitem(sys.modules, "yaml", None)  # import yaml now raises ImportError
+    with caplog.at_level(logging.WARNING, logger="question_bank"):
+        bank = QuestionBank(str(tmp_path))
+    assert bank.technologies() == ["python"]
+    assert "go.yaml" in caplog.text
+
+
+def test_lookups_resolve_aliases_and_misspellings_and_are_memoized(tmp_path):
+    _write_bank(tmp_path)
+    bank = QuestionBank(str(tmp_path))
+    assert bank.questions_for("Py") is bank.questions_for("python")
+    assert bank.questions_for("Pyhton") == ["What is a generator?"]
+    assert bank.questions_for("Rust") == ["Why Rust?"]
+    assert bank.questions_for("Rust") is bank.questions_for("Rust")
@@ -0,0 +1,79 @@
+from concurrent.futures import wait
+
+import pytest
+
+import question_providers
+from llm_stub_server import start_stub_server
+from question_providers import LLMQuestionProvider, get_question_provider
+
+
+@pytest.fixture
+def stub(request):
+    server = start_stub_server(delay=getattr(request, "param", 0.0))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _provider(server, **options):
+    host, port = server.server_address
+    return LLMQuestionProvider("test-key", endpoint=f"http://{host}:{port}/v1", cache_dir=None, **options)
+
+
+def _wait_for_requests(provider):
+    with provider._lock:
+        futures = set(provider._in_flight.values())
+    wait(futures)
+
+
+def test_missing_technologies_are_fetched_in_one_batch_and_swapped_in_on_reaching_them(stub):
+    provider = _provider(stub)
+    tech_questions = provider.questions_for_stack(["Python", "Docker"], "senior")
+    templates = [tech_qa['questions'] for tech_qa in tech_questions]
+    assert provider.stats['fallbacks'] == 2
+    _wait_for_requests(provider)
+    provider.close()
+
+    assert stub.RequestHandlerClass.requests_served == 1
+    assert provider.stats == {'requests': 1, 'failures': 0, 'cache_hits': 0, 'fallbacks': 2}
+    # Questions already shown are kept; the next technology gets the generated ones
+    assert tech_questions[0]['questions'] is templates[0]
+    assert provider.refresh(tech_questions, 1, "senior")
+    assert tech_questions[1]['questions'][0] == "[stub senior] Question 1 about docker?"
+    assert tech_questions[1]['questions'] is not templates[1]
+
+
+@pytest.mark.parametrize("stub", [1.0], indirect=True)
+def test_a_timed_out_request_leaves_the_templates(stub):
+    provider = _provider(stub, timeout=0.1)
+    tech_questions = provider.questions_for_stack(["Python", "Docker"], "mid")
+    templates = tech_questions[1]['questions']
+    _wait_for_requests(provider)
+    provider.close()
+
+    assert provider.stats['failures'] == 1
+    assert not provider.refresh(tech_questions, 1, "mid")
+    assert tech_questions[1]['questions'] is templates
+
+
+def test_unexpected_errors_count_as_failures(monkeypatch):
+    provider = LLMQuestionProvider("test-key", cache_dir=None)
+    monkeypatch.setattr(provider, "request_questions", lambda techs, seniority: 1 / 0)
+    provider.questions_for_stack(["Python"], "mid")
+    _wait_for_requests(provider)
+    provider.close()
+    assert provider.stats['failures'] == 1
+    assert not provider._in_flight
+
+
+def test_least_recently_used_providers_are_closed(monkeypatch):
+    monkeypatch.setattr(question_providers, "_llm_providers", question_providers.OrderedDict())
+    monkeypatch.setattr(question_providers, "MAX_LLM_PROVIDERS", 2)
+    first = get_question_provider("key-1")
+    second = get_question_provider("key-2")
+    assert get_question_provider("key-1") is first
+    get_question_provider("key-3")
+    assert list(question_providers._llm_providers) == ["key-1", "key-3"]
+    assert second._executor._shutdown and not first._executor._shutdown
+    for provider in question_providers._llm_providers.values():
+        provider.close()
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from candidate_store import JsonlCandidateStore
+from write_behind import WriteBehindWriter, main, replay_dead_letters
+
+
+class FailingStore:
+    def append_many(self, records):
+        raise OSError("disk full")
+
+    def flush(self):
+        pass
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JsonlCandidateStore(str(tmp_path / "candidates.jsonl"), fsync="never")
+    yield store
+    store.close()
+
+
+def test_submits_racing_close_are_either_stored_or_refused(store):
+    writer = WriteBehindWriter(store, max_queue=8, max_delay=0.001)
+    accepted, refused = [], []
+
+    def submit(worker):
+        for n in range(2000):
+            try:
+                writer.submit({'n': worker * 10000 + n})
+            except RuntimeError:
+                refused.append(n)
+                return
+            accepted.append(n)
+
+    threads = [threading.Thread(target=submit, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    writer.close()
+    for thread in threads:
+        thread.join()
+    assert store.count() == len(accepted)
+    with pytest.raises(RuntimeError):
+        writer.submit({'n': -1})
+
+
+def test_dead_lettered_batches_can_be_replayed(store, tmp_path):
+    dead_letters = tmp_path / "failed_saves"
+    writer = WriteBehindWriter(FailingStore(), retries=0, dead_letter_dir=str(dead_letters))
+    writer.submit({'n': 1})
+    writer.submit({'n': 2})
+    writer.close()
+    assert writer.stats()['dead_lettered'] == 2
+
+    assert replay_dead_letters(store, str(dead_letters)) == 2
+    assert sorted(record['n'] for record in store) == [1, 2]
+    assert list(dead_letters.iterdir()) == []
+    assert replay_dead_letters(store, str(dead_letters)) == 0
+
+
+def test_replay_cli_exits_non_zero_while_files_remain(tmp_path, capsys):
+    dead_letters = tmp_path / "failed_saves"
+    dead_letters.mkdir()
+    (dead_letters / "failed-1.jsonl").write_text('{"n": 1}\n')
+    (dead_letters / "failed-2.jsonl").write_text('{"n": \n')
+    store_path = str(tmp_path / "candidates.jsonl")
+    assert main(["--store", "jsonl", "--store-path", store_path, "replay", "--dir", str(dead_letters)]) == 1
+    assert [path.name for path in dead_letters.iterdir()] == ["failed-2.jsonl"]
+    assert [record['n'] for record in JsonlCandidateStore(store_path)] == [1]
@@ -0,0 +1,47 @@
+import re
+from typing import Dict, Any
+
+# Compiled once at import; validators run on every collecting_info turn
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_SEPARATORS = re.compile(r'[\s\-\(\)\+]')
+
+
+def validate_email(email: str) -> bool:
+    """Validate email format"""
+    return EMAIL_PATTERN.match(email) is not None
+
+
+def validate_phone(phone: str) -> bool:
+    """Validate phone number format"""
+    # Remove common separators and check for digits
+    cleaned_phone = PHONE_SEPARATORS.sub('', phone)
+    return cleaned_phone.isdigit() and len(cleaned_phone) >= 10
+
+
+def validate_years_experience(years: str) -> bool:
+    """Validate years of experience (0-50)"""
+    return years.isdigit() and 0 <= int(years) <= 50
+
+
+def mask_sensitive_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Mask sensitive data before saving"""
+    masked_data = data.copy()
+
+    if 'email' in masked_data:
+        email_parts = masked_data['email'].split('@')
+        if len(email_parts) == 2:
+            username = email_parts[0]
+            if len(username) > 2:
+                masked_username = username[0] + '*' * (len(username)-2) + username[-1]
+            else:
+                masked_username = '*' * len(username)
+            masked_data['email'] = f"{masked_username}@{email_parts[1]}"
+
+    if 'phone' in masked_data:
+        phone = masked_data['phone']
+        if len(phone) > 4:
+            masked_data['phone'] = '*' * (len(phone)-4) + phone[-4:]
+        else:
+            masked_data['phone'] = '*' * len(phone)
+
+    return masked_data
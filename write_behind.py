@@ -0,0 +1,306 @@
+"""Background group commits of candidate saves, and replay of dead-lettered batches.
+
+Usage:
+    python write_behind.py replay                  # store every batch in failed_saves/
+    python write_behind.py replay --dir other_dir
+"""
+import argparse
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Any, Callable, Optional
+
+from metrics import get_default_registry
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+_metrics = get_default_registry()
+STORE_COMMIT_SECONDS = _metrics.histogram(
+    "talentscout_store_commit_seconds", "Time for one group commit to the candidate store")
+COMMITTED_RECORDS = _metrics.counter(
+    "talentscout_committed_records_total", "Candidate records committed to the store by the write-behind queue")
+
+
+def write_atomically(path: str, records: List[Dict[str, Any]]):
+    """Write records as JSONL to ``path`` via a synced temp file and rename"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehindWriter:
+    """Background thread that saves candidate records in group commits.
+
+    ``submit`` only enqueues, so the request that completes a conversation
+    never waits on the store. The worker takes up to ``batch_size`` queued
+    records, waiting at most ``max_delay`` seconds for a batch to fill, and
+    stores them with one ``append_many`` call: one write and sync for the
+    JSONL store, one transaction for SQLite, so a process killed mid-batch
+    leaves either the whole batch or none of it. Failed commits are retried
+    with exponential backoff; a batch that still fails is written to
+    ``dead_letter_dir`` instead of being dropped.
+
+    When the queue is full, ``submit`` commits the record itself rather than
+    blocking or losing it. ``close`` (also run at exit) drains the queue and
+    flushes the store; ``submit`` raises RuntimeError once it has started.
+    """
+
+    def __init__(self, store, max_queue: int = 1024, batch_size: int = 64, max_delay: float = 0.05,
+                 retries: int = 5, backoff: float = 0.05, max_backoff: float = 2.0,
+                 dead_letter_dir: str = "failed_saves",
+                 on_commit: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                 latency_samples: int = 4096):
+        self.store = store
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.dead_letter_dir = dead_letter_dir
+        self.on_commit = on_commit
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._commit_latencies: deque = deque(maxlen=latency_samples)
+        self._queue_waits: deque = deque(maxlen=latency_samples)
+        self._counters = {'submitted': 0, 'committed': 0, 'batches': 0, 'retries': 0,
+                          'dead_lettered': 0, 'overflow_commits': 0, 'max_queue_depth': 0}
+        self._closed = False
+        # Orders submits against close, so no record is queued behind _STOP
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -- producer side -----------------------------------------------------
+
+    def submit(self, record: Dict[str, Any]):
+        """Queue a record for saving; returns without waiting for the store"""
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("write-behind writer is closed")
+            try:
+                self._queue.put_nowait((time.perf_counter(), record))
+                full = False
+            except queue.Full:
+                full = True
+        if full:
+            # Backpressure: the caller pays for one commit instead of losing the record
+            with self._stats_lock:
+                self._counters['overflow_commits'] += 1
+            self._commit([record])
+            return
+        with self._stats_lock:
+            self._counters['submitted'] += 1
+            depth = self._queue.qsize()
+            if depth > self._counters['max_queue_depth']:
+                self._counters['max_queue_depth'] = depth
+
+    def close(self, timeout: Optional[float] = 30.0):
+        """Stop accepting records, commit everything queued and flush the store"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            # Bounded: a full queue whose worker has died must not hang exit
+            self._queue.put((time.perf_counter(), _STOP), timeout=timeout)
+        except queue.Full:
+            logger.error("Write-behind queue still full after %ss; the worker is not draining it", timeout)
+        self._thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if self._thread.is_alive():
+            logger.error("Write-behind worker did not drain within %ss; %d records still queued",
+                         timeout, self._queue.qsize())
+        self.store.flush()
+        try:
+            atexit.unregister(self.close)
+        except Exception:  # pragma: no cover - interpreter shutting down
+            pass
+
+    # -- worker side -------------------------------------------------------
+
+    def _run(self):
+        while True:
+            queued_at, record = self._queue.get()
+            if record is _STOP:
+                return
+            batch, waits = [record], [time.perf_counter() - queued_at]
+            deadline = time.monotonic() + self.max_delay
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    queued_at, record = self._queue.get(timeout=max(0.0, remaining)) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stop = True
+                    break
+                batch.append(record)
+                waits.append(time.perf_counter() - queued_at)
+            self._commit(batch)
+            with self._stats_lock:
+                self._queue_waits.extend(waits)
+            if stop:
+                return
+
+    def _commit(self, batch: List[Dict[str, Any]]):
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                self.store.append_many(batch)
+            except Exception:
+                if attempt == self.retries:
+                    logger.exception("Saving %d candidate records failed after %d attempts",
+                                     len(batch), attempt + 1)
+                    self._dead_letter(batch)
+                    return
+                with self._stats_lock:
+                    self._counters['retries'] += 1
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+                continue
+            latency = time.perf_counter() - start
+            STORE_COMMIT_SECONDS.labels().record(latency)
+            COMMITTED_RECORDS.labels().inc(len(batch))
+            with self._stats_lock:
+                self._counters['committed'] += len(batch)
+                self._counters['batches'] += 1
+                self._commit_latencies.append(latency)
+            if self.on_commit is not None:
+                try:
+                    self.on_commit(batch)
+                except Exception:
+                    # The batch is stored; a failing callback must not kill the worker
+                    logger.exception("Write-behind on_commit callback %r failed", self.on_commit)
+            return
+
+    def _dead_letter(self, batch: List[Dict[str, Any]]):
+        path = os.path.join(self.dead_letter_dir, f"failed-{time.time_ns()}.jsonl")
+        try:
+            write_atomically(path, batch)
+        except Exception:
+            logger.exception("Could not write %d unsaved candidate records to %s", len(batch), path)
+            return
+        with self._stats_lock:
+            self._counters['dead_lettered'] += len(batch)
+        logger.error("Wrote %d unsaved candidate records to %s", len(batch), path)
+
+    # -- stats -------------------------------------------------------------
+
+    @staticmethod
+    def _percentiles(samples: List[float]) -> Dict[str, float]:
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        pick = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]  # noqa: E731
+        return {'p50_ms': pick(50) * 1e3, 'p95_ms': pick(95) * 1e3,
+                'p99_ms': pick(99) * 1e3, 'max_ms': ordered[-1] * 1e3}
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and commit/queue-wait latency percentiles"""
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            commits = list(self._commit_latencies)
+            waits = list(self._queue_waits)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['mean_batch_size'] = stats['committed'] / stats['batches'] if stats['batches'] else 0.0
+        stats['commit_latency'] = self._percentiles(commits)
+        stats['queue_wait'] = self._percentiles(waits)
+        return stats
+
+
+def replay_dead_letters(store, directory: str = "failed_saves") -> int:
+    """Store the batches ``_dead_letter`` wrote to ``directory``, oldest first.
+
+    Each file is deleted once its records are appended and flushed; a file
+    that fails is kept for the next attempt. Returns the records stored.
+    """
+    try:
+        names = sorted(name for name in os.listdir(directory)
+                       if name.startswith("failed-") and name.endswith(".jsonl"))
+    except FileNotFoundError:
+        return 0
+    replayed = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+            store.append_many(records)
+            store.flush()
+        except Exception:
+            logger.exception("Could not replay %s; keeping it", path)
+            continue
+        os.remove(path)
+        replayed += len(records)
+        logger.info("Replayed %d candidate records from %s", len(records), path)
+    return replayed
+
+
+_default_writer = None
+_default_writer_lock = threading.Lock()
+
+
+def get_default_writer() -> WriteBehindWriter:
+    """Writer over the default store, shared by every session in the process"""
+    global _default_writer
+    with _default_writer_lock:
+        if _default_writer is None:
+            from candidate_store import get_default_store
+            writer = WriteBehindWriter(get_default_store())
+            get_default_registry().gauge(
+                "talentscout_write_queue_depth", "Candidate records waiting for a group commit",
+                lambda: {(): writer._queue.qsize()})
+            _default_writer = writer
+        return _default_writer
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", choices=["jsonl", "sqlite"], help="store backend (default: TALENTSCOUT_STORE)")
+    parser.add_argument("--store-path", help="store location (default: the backend's default file)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay_parser = commands.add_parser("replay", help="store the records of dead-lettered batches")
+    replay_parser.add_argument("--dir", default="failed_saves", help="dead-letter directory")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    from bulk_io import open_store  # the stores are only needed by the CLI
+    store = open_store(args.store, args.store_path)
+    try:
+        replayed = replay_dead_letters(store, args.dir)
+    finally:
+        store.close()
+    remaining = [name for name in os.listdir(args.dir) if name.startswith("failed-")] \
+        if os.path.isdir(args.dir) else []
+    print(f"replayed {replayed:,} records from {args.dir}, {len(remaining)} files left", file=sys.stderr)
+    return 1 if remaining else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())